@@ -0,0 +1,89 @@
+"""
+Count the embedding work of reindexing local stores with and without the disk embedding cache.
+
+A first index fills the cache; a restart (new cache instance on the same directory, new store)
+and a switch to another backend then reindex the same jobs. Embedding calls are simulated with
+a fixed per-document latency, as a hosted model would add.
+
+Usage: python -m benchmarks.embedding_cache_benchmark --docs 20000 --dimension 384
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable, List, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+from benchmarks.vector_store_benchmark import RandomEmbeddings, _jobs
+from src.vector_store.embeddings.disk_cached_embeddings import DiskCachedEmbeddings
+from src.vector_store.embeddings.embedding_cache import EmbeddingCache
+from src.vector_store.interface import VectorStore
+from src.vector_store.models import JobVectorStore
+from src.vector_store.stores.memory_store import MemoryStore
+from src.vector_store.stores.numpy_store import NumpyStore
+
+
+class SlowEmbeddings(RandomEmbeddings):
+    """RandomEmbeddings that count embedded documents and sleep per document like a remote model"""
+
+    def __init__(self, dimension: int, seconds_per_document: float):
+        super().__init__(dimension)
+        self.seconds_per_document = seconds_per_document
+        self.documents = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.documents += len(texts)
+        time.sleep(self.seconds_per_document * len(texts))
+        return super().embed_documents(texts)
+
+
+def _directory_bytes(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def index(
+    store: VectorStore, jobs: List[JobVectorStore], batch_size: int, embedding: SlowEmbeddings
+) -> Tuple[int, float]:
+    """Upsert jobs in batches, returning how many documents were embedded and how long it took"""
+    embedded = embedding.documents
+    start = time.perf_counter()
+    for batch_start in range(0, len(jobs), batch_size):
+        store.add_job_details(jobs[batch_start : batch_start + batch_size])
+    return embedding.documents - embedded, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=20_000)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--batch-size", type=int, default=96)
+    parser.add_argument("--ms-per-document", type=float, default=0.2)
+    args = parser.parse_args()
+
+    jobs = _jobs(args.docs)
+    print(f"{args.docs} documents, {args.dimension} dimensions, {args.ms_per_document}ms per embedded document")
+
+    runs: List[Tuple[str, Callable[[Embeddings], VectorStore], bool]] = [
+        ("uncached index", lambda embedding: NumpyStore(embedding=embedding), False),
+        ("first cached index", lambda embedding: NumpyStore(embedding=embedding), True),
+        ("restart reindex", lambda embedding: NumpyStore(embedding=embedding), True),
+        ("switch to memory", lambda embedding: MemoryStore(embedding=embedding), True),
+    ]
+    for dtype in ("float32", "float16"):
+        embedding = SlowEmbeddings(args.dimension, args.ms_per_document / 1000)
+        print(f"\n{dtype} cache")
+        with tempfile.TemporaryDirectory() as path:
+            for name, store_factory, cached in runs:
+                store_embedding: Embeddings = embedding
+                if cached:
+                    # a fresh cache instance each time, as after a process restart
+                    store_embedding = DiskCachedEmbeddings(embedding, EmbeddingCache(path, dtype=dtype), "random")
+                embedded, seconds = index(store_factory(store_embedding), jobs, args.batch_size, embedding)
+                print(f"{name:>20}: embedded {embedded:7d} documents in {seconds:7.2f}s")
+            print(f"{'cache size':>20}: {_directory_bytes(path) / 2**20:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Measure filtered search latency against filter selectivity for the NumPy store.
+
+Jobs are spread over countries whose shares range from 50% down to 0.1% of the corpus, so each
+country filter has a known selectivity.
+
+Usage: python -m benchmarks.filter_benchmark --docs 200000 --queries 20
+"""
+
+import argparse
+from typing import List
+
+from benchmarks.vector_store_benchmark import RandomEmbeddings, _jobs, _time
+from src.vector_store.models import JobVectorStore
+from src.vector_store.stores.numpy_store import NumpyStore
+
+# country -> share of the corpus; the remainder goes to "other"
+COUNTRY_SHARES = {"us": 0.5, "de": 0.1, "at": 0.01, "li": 0.001}
+
+
+def _with_countries(jobs: List[JobVectorStore]) -> List[JobVectorStore]:
+    boundaries = []
+    start = 0
+    for country, share in COUNTRY_SHARES.items():
+        boundaries.append((start + int(share * len(jobs)), country))
+        start = boundaries[-1][0]
+    countries = []
+    for position in range(len(jobs)):
+        countries.append(next((country for end, country in boundaries if position < end), "other"))
+    return [job.model_copy(update={"job_country": country}) for job, country in zip(jobs, countries)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    store = NumpyStore(embedding=RandomEmbeddings(args.dimension), initial_capacity=args.docs)
+    store.add_job_details(_with_countries(_jobs(args.docs)))
+    queries = [f"query {i}" for i in range(args.queries)]
+    print(f"{args.docs} documents, {args.dimension} dimensions, top_k={args.top_k}, {args.queries} queries")
+
+    def search_ms(filters: dict) -> float:
+        store.similarity_search(queries[0], top_k=args.top_k, filters=filters)  # warm up
+        seconds = sum(
+            _time(lambda q=query: store.similarity_search(q, top_k=args.top_k, filters=filters)) for query in queries
+        )
+        return seconds / len(queries) * 1000
+
+    print(f"{'no filter':>16}: {search_ms({}):8.2f}ms/query")
+    for country, share in COUNTRY_SHARES.items():
+        print(f"{f'country={country}':>16} ({share:6.1%}): {search_ms({'country': country}):8.2f}ms/query")
+
+
+if __name__ == "__main__":
+    main()
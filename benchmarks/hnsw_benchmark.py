@@ -0,0 +1,65 @@
+"""
+Measure HNSW recall@k and latency against exact search on a synthetic clustered corpus.
+
+Usage: python -m benchmarks.hnsw_benchmark --docs 20000 --m 16 --ef-construction 100
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.vector_store.indexes.hnsw import HNSWIndex
+
+
+def synthetic_corpus(docs: int, dimension: int, clusters: int, seed: int) -> np.ndarray:
+    """Gaussian clusters around random centres, normalised, as embeddings of related postings would be"""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dimension))
+    vectors = centres[rng.integers(clusters, size=docs)] + rng.standard_normal((docs, dimension))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dimension", type=int, default=128)
+    parser.add_argument("--clusters", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--m", type=int, default=16)
+    parser.add_argument("--ef-construction", type=int, default=100)
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[10, 20, 50, 100, 200])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.docs + args.queries, args.dimension, args.clusters, args.seed)
+    vectors, queries = corpus[: args.docs], corpus[args.docs :]
+    k = args.top_k
+
+    index = HNSWIndex(args.dimension, m=args.m, ef_construction=args.ef_construction, seed=args.seed)
+    start = time.perf_counter()
+    for vector in vectors:
+        index.add(vector)
+    build_seconds = time.perf_counter() - start
+    print(
+        f"{args.docs} documents, {args.dimension} dimensions, m={args.m}, "
+        f"ef_construction={args.ef_construction}: built in {build_seconds:.1f}s"
+    )
+
+    start = time.perf_counter()
+    exact = [set(np.argpartition(-(vectors @ query), k)[:k].tolist()) for query in queries]
+    exact_ms = (time.perf_counter() - start) / len(queries) * 1000
+    print(f"{'exact':>14}: recall@{k} 1.000  {exact_ms:7.3f}ms/query")
+
+    for ef_search in args.ef_search:
+        start = time.perf_counter()
+        found = [{node for node, _ in index.search(query, k, ef_search=ef_search)} for query in queries]
+        hnsw_ms = (time.perf_counter() - start) / len(queries) * 1000
+        recall = np.mean([len(hits & truth) / k for hits, truth in zip(found, exact)])
+        print(f"{f'ef_search={ef_search}':>14}: recall@{k} {recall:.3f}  {hnsw_ms:7.3f}ms/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Show that opening an MmapStore costs the same time and private memory whatever the index size.
+
+Usage: python -m benchmarks.mmap_store_benchmark --docs 10000 100000 --dimension 384
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.vector_store_benchmark import _jobs
+from src.vector_store.indexes.segments import publish_manifest, write_segment
+
+OPEN_SCRIPT = """
+import sys, time
+from benchmarks.vector_store_benchmark import RandomEmbeddings
+from src.vector_store.stores.mmap_store import MmapStore
+
+def private_kb():
+    # anonymous RSS excludes the file-backed pages shared with other processes
+    with open("/proc/self/status") as f:
+        fields = dict(line.split(":", 1) for line in f)
+    return int(fields["RssAnon"].split()[0])
+
+before = private_kb()
+start = time.perf_counter()
+store = MmapStore(RandomEmbeddings(int(sys.argv[2])), path=sys.argv[1], writer=False)
+size = len(store)
+opened = time.perf_counter() - start
+store.similarity_search("query", top_k=10)
+print(f"{size} {opened * 1000:.1f} {private_kb() - before}")
+"""
+
+
+def build(path: str, docs: int, dimension: int) -> None:
+    vectors = np.random.default_rng(0).standard_normal((docs, dimension)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    write_segment(path, "segment-00000000", _jobs(docs), vectors)
+    publish_manifest(
+        path,
+        {
+            "version": 1,
+            "dimension": dimension,
+            "next_segment": 1,
+            "segments": [{"name": "segment-00000000", "deleted": None}],
+        },
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--dimension", type=int, default=384)
+    args = parser.parse_args()
+
+    for docs in args.docs:
+        with tempfile.TemporaryDirectory() as path:
+            build(path, docs, args.dimension)
+            on_disk_mb = sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path)) / 2**20
+            start = time.perf_counter()
+            output = subprocess.run(
+                [sys.executable, "-c", OPEN_SCRIPT, path, str(args.dimension)],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout.split()
+            size, open_ms, private_kb = output
+            print(
+                f"{int(size):>9} docs ({on_disk_mb:7.1f} MB on disk): opened in {float(open_ms):6.1f}ms, "
+                f"private memory after open + one search {int(private_kb) / 1024:6.1f} MB"
+                f"  (process total {time.perf_counter() - start:.1f}s)"
+            )
+
+
+if __name__ == "__main__":
+    main()
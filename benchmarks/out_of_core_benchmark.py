@@ -0,0 +1,87 @@
+"""
+Measure time and peak memory of blocked exact search over an on-disk .npy file.
+
+Each configuration runs in a fresh process so its peak RSS (VmHWM, Linux only) is measured on its own.
+
+Usage: python -m benchmarks.out_of_core_benchmark --docs 1000000 --dimension 256 --block-size 16384 131072
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+SEARCH_SCRIPT = """
+import sys, time
+import numpy as np
+from src.vector_store.indexes.blocked_search import blocked_search
+
+path, (queries, top_k, block_size, threads) = sys.argv[1], map(int, sys.argv[2:6])
+dimension = np.load(path, mmap_mode="r").shape[1]
+query_vectors = np.random.default_rng(1).standard_normal((queries, dimension)).astype(np.float32)
+
+
+def peak_kb():
+    # VmHWM starts afresh at exec, unlike ru_maxrss which children inherit from the parent
+    with open("/proc/self/status") as f:
+        return int(next(line for line in f if line.startswith("VmHWM:")).split()[1])
+
+
+baseline_kb = peak_kb()
+start = time.perf_counter()
+blocked_search(path, query_vectors, top_k, block_size=block_size, threads=threads)
+seconds = time.perf_counter() - start
+print(seconds, peak_kb() - baseline_kb)
+"""
+
+
+def write_corpus(path: str, docs: int, dimension: int, chunk: int = 100_000) -> None:
+    corpus = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(docs, dimension))
+    rng = np.random.default_rng(0)
+    for start in range(0, docs, chunk):
+        corpus[start : start + chunk] = rng.standard_normal((min(chunk, docs - start), dimension))
+    corpus.flush()
+    del corpus
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=1_000_000)
+    parser.add_argument("--dimension", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=16)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--block-size", type=int, nargs="+", default=[16_384, 131_072])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "vectors.npy")
+        write_corpus(path, args.docs, args.dimension)
+        size_mb = os.path.getsize(path) / 2**20
+        print(f"{args.docs} x {args.dimension} float32 ({size_mb:.0f} MB), {args.queries} queries, top_k={args.top_k}")
+        for block_size in args.block_size:
+            block_mb = block_size * args.dimension * 4 / 2**20
+            for threads in args.threads:
+                seconds, peak_kb = subprocess.run(
+                    [
+                        sys.executable,
+                        "-c",
+                        SEARCH_SCRIPT,
+                        path,
+                        *map(str, (args.queries, args.top_k, block_size, threads)),
+                    ],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout.split()
+                print(
+                    f"block {block_size:>7} rows ({block_mb:6.1f} MB), {threads} threads: "
+                    f"{float(seconds):6.2f}s, peak memory growth {int(peak_kb) / 1024:7.1f} MB"
+                )
+
+
+if __name__ == "__main__":
+    main()
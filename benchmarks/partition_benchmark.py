@@ -0,0 +1,52 @@
+"""
+Compare search latency of one NumPy store against country partitions of NumPy stores.
+
+Jobs are spread over countries as in the filter benchmark. Searches filtered to one country
+only scan that country's partition; searches over several countries or without a filter fan
+out to the partitions and merge their results.
+
+Usage: python -m benchmarks.partition_benchmark --docs 200000 --queries 20
+"""
+
+import argparse
+
+from benchmarks.filter_benchmark import COUNTRY_SHARES, _with_countries
+from benchmarks.vector_store_benchmark import RandomEmbeddings, _jobs, _time
+from src.vector_store.interface import VectorStore
+from src.vector_store.stores.numpy_store import NumpyStore
+from src.vector_store.stores.partitioned_store import PartitionedStore
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    embedding = RandomEmbeddings(args.dimension)
+    jobs = _with_countries(_jobs(args.docs))
+    single = NumpyStore(embedding=embedding, initial_capacity=args.docs)
+    single.add_job_details(jobs)
+    partitioned = PartitionedStore(lambda namespace: NumpyStore(embedding=embedding), namespace="jobs")
+    partitioned.add_job_details(jobs)
+    queries = [f"query {i}" for i in range(args.queries)]
+    print(f"{args.docs} documents, {args.dimension} dimensions, top_k={args.top_k}, {args.queries} queries")
+
+    def search_ms(store: VectorStore, filters: dict) -> float:
+        store.similarity_search(queries[0], top_k=args.top_k, filters=filters)  # warm up
+        seconds = sum(
+            _time(lambda q=query: store.similarity_search(q, top_k=args.top_k, filters=filters)) for query in queries
+        )
+        return seconds / len(queries) * 1000
+
+    searches = {"no filter": {}, "country=de,at": {"country": ["de", "at"]}}
+    searches.update({f"country={country}": {"country": country} for country in COUNTRY_SHARES})
+    print(f"{'':>16}  {'single':>10}  {'partitioned':>12}")
+    for name, filters in searches.items():
+        print(f"{name:>16}: {search_ms(single, filters):8.2f}ms  {search_ms(partitioned, filters):10.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
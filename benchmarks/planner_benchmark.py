@@ -0,0 +1,109 @@
+"""
+Compare filtered-search strategies on an HNSW store against the plan the query planner picks.
+
+Jobs are spread over countries covering 50% down to 0.2% of the corpus. For each country
+filter every strategy is forced in turn and its latency and recall@k against exact filtered
+search are reported, next to the strategy the planner chooses and its estimated cost.
+
+Usage: python -m benchmarks.planner_benchmark --docs 20000 --queries 50
+"""
+
+import argparse
+import time
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from benchmarks.hnsw_benchmark import synthetic_corpus
+from src.vector_store.indexes.planner import QueryPlan, QueryPlanner
+from src.vector_store.models import JobVectorStore
+from src.vector_store.stores.hnsw_store import HNSWStore
+
+COUNTRY_SHARES = {"us": 0.5, "de": 0.1, "at": 0.02, "li": 0.002}
+
+
+class CorpusEmbeddings(Embeddings):
+    """Looks "#<n>" texts up in a precomputed corpus, so building the store embeds nothing"""
+
+    def __init__(self, corpus: np.ndarray):
+        self.corpus = corpus
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.corpus[int(text.split("#")[1].split()[0])].tolist()
+
+
+class ForcedPlanner(QueryPlanner):
+    """Planner that always returns the candidate plan of one strategy"""
+
+    def __init__(self, strategy: str):
+        super().__init__()
+        self.strategy = strategy
+
+    def plan(self, estimated_matches: float, total: int, top_k: int, ef_search: int, m: int) -> QueryPlan:
+        plans = self.plans(estimated_matches, total, top_k, ef_search, m)
+        return next(plan for plan in plans if plan.strategy.value == self.strategy)
+
+
+def _country(position: int, docs: int) -> str:
+    start = 0
+    for country, share in COUNTRY_SHARES.items():
+        start += int(share * docs)
+        if position < start:
+            return country
+    return "other"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--dimension", type=int, default=64)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.docs + args.queries, args.dimension, clusters=50, seed=args.seed)
+    # shuffle countries over rows so that no country lines up with a cluster
+    countries = np.random.default_rng(args.seed).permutation([_country(i, args.docs) for i in range(args.docs)])
+    store = HNSWStore(CorpusEmbeddings(corpus), m=16, ef_construction=100, ef_search=50)
+    start = time.perf_counter()
+    store.add_job_details(
+        [
+            JobVectorStore(
+                job_id=str(i), job_title=f"Job #{i}", job_description="", job_apply_link="", job_country=countries[i]
+            )
+            for i in range(args.docs)
+        ]
+    )
+    print(f"{args.docs} documents, {args.dimension} dimensions: built in {time.perf_counter() - start:.1f}s")
+    queries = [f"Query #{args.docs + i}" for i in range(args.queries)]
+    planner = store.planner
+
+    for country, share in COUNTRY_SHARES.items():
+        filters = {"country": country}
+        truth = []
+        for query in queries:
+            store.planner = ForcedPlanner("exact")
+            truth.append({job.job_id for job in store.similarity_search(query, top_k=args.top_k, filters=filters)})
+        store.planner = planner
+        chosen = planner.plan(share * args.docs, args.docs, args.top_k, store.ef_search, store.m)
+        print(f"country={country} ({share:.1%}): planner picks {chosen.describe()}")
+        for strategy in ("exact", "ann", "hybrid"):
+            store.planner = ForcedPlanner(strategy)
+            start = time.perf_counter()
+            found = [
+                {job.job_id for job in store.similarity_search(query, top_k=args.top_k, filters=filters)}
+                for query in queries
+            ]
+            ms = (time.perf_counter() - start) / len(queries) * 1000
+            recall = np.mean([len(hits & expected) / max(len(expected), 1) for hits, expected in zip(found, truth)])
+            print(f"{strategy:>10}: {ms:8.2f}ms/query  recall@{args.top_k} {recall:.3f}")
+        store.planner = planner
+
+
+if __name__ == "__main__":
+    main()
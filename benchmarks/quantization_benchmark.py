@@ -0,0 +1,81 @@
+"""
+Measure memory use, recall@k and latency of quantized search against exact search.
+
+Usage: python -m benchmarks.quantization_benchmark --docs 50000 --dimension 1024
+"""
+
+import argparse
+import time
+from typing import List, Set
+
+import numpy as np
+
+from benchmarks.hnsw_benchmark import synthetic_corpus
+from src.vector_store.indexes.quantization import ProductQuantizer, Quantizer, ScalarQuantizer
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    return np.argpartition(-scores, k - 1)[:k]
+
+
+def _recall(found: List[Set[int]], truth: List[Set[int]], k: int) -> float:
+    return float(np.mean([len(hits & exact) / k for hits, exact in zip(found, truth)]))
+
+
+def run(name: str, quantizer: Quantizer, vectors: np.ndarray, queries: np.ndarray, truth: List[Set[int]], args) -> None:
+    k = args.top_k
+    start = time.perf_counter()
+    quantizer.fit(vectors[: args.train_size])
+    codes = quantizer.encode(vectors)
+    build_seconds = time.perf_counter() - start
+
+    compressed, rescored = [], []
+    start = time.perf_counter()
+    for query in queries:
+        approximate = quantizer.scores(codes, query)
+        compressed.append(set(_top_k(approximate, k).tolist()))
+        shortlist = np.sort(_top_k(approximate, k * args.rescore_factor))
+        rescored.append(set(shortlist[_top_k(vectors[shortlist] @ query, k)].tolist()))
+    search_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+    compression = vectors.shape[1] * 4 / quantizer.bytes_per_vector
+    print(
+        f"{name:>8}: {quantizer.bytes_per_vector:5d} B/vector ({compression:4.0f}x)"
+        f"  recall@{k} codes {_recall(compressed, truth, k):.3f}"
+        f"  rescored x{args.rescore_factor} {_recall(rescored, truth, k):.3f}"
+        f"  {search_ms:7.2f}ms/query  trained+encoded in {build_seconds:.1f}s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--dimension", type=int, default=1024)
+    parser.add_argument("--clusters", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--rescore-factor", type=int, default=4)
+    parser.add_argument("--train-size", type=int, default=20_000)
+    parser.add_argument("--pq-subspaces", type=int, nargs="+", default=[64, 256])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.docs + args.queries, args.dimension, args.clusters, args.seed)
+    vectors, queries = corpus[: args.docs], corpus[args.docs :]
+    k = args.top_k
+
+    start = time.perf_counter()
+    truth = [set(_top_k(vectors @ query, k).tolist()) for query in queries]
+    exact_ms = (time.perf_counter() - start) / len(queries) * 1000
+    print(f"{args.docs} documents, {args.dimension} dimensions, top_k={k}")
+    print(f"{'float32':>8}: {args.dimension * 4:5d} B/vector (   1x)  recall@{k} 1.000  {exact_ms:7.2f}ms/query")
+
+    run("int8", ScalarQuantizer(args.dimension), vectors, queries, truth, args)
+    for subspaces in args.pq_subspaces:
+        run(
+            f"pq{subspaces}", ProductQuantizer(args.dimension, subspaces, seed=args.seed), vectors, queries, truth, args
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Compare search latency of the in-memory vector store backends.
+
+Usage: python -m benchmarks.vector_store_benchmark --docs 100000 --queries 50
+"""
+
+import argparse
+import hashlib
+import time
+from typing import Callable, List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.vector_store.interface import VectorStore
+from src.vector_store.models import JobVectorStore
+from src.vector_store.stores.memory_store import MemoryStore
+from src.vector_store.stores.numpy_store import NumpyStore
+
+
+class RandomEmbeddings(Embeddings):
+    """Deterministic pseudo-random embeddings, so the benchmark needs no embedding model"""
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "little")
+        return np.random.default_rng(seed).standard_normal(self.dimension).astype(np.float32).tolist()
+
+
+def _jobs(count: int) -> List[JobVectorStore]:
+    return [
+        JobVectorStore(
+            job_id=str(i),
+            job_title=f"Job {i}",
+            job_description=f"Description of job {i}",
+            job_apply_link=f"https://example.com/jobs/{i}",
+        )
+        for i in range(count)
+    ]
+
+
+def _time(fn: Callable[[], object], repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def run(store_name: str, store: VectorStore, jobs: List[JobVectorStore], queries: List[str], top_k: int) -> float:
+    add_seconds = _time(lambda: store.add_job_details(jobs))
+    store.similarity_search(queries[0], top_k=top_k)  # warm up
+    search_seconds = sum(_time(lambda q=query: store.similarity_search(q, top_k=top_k)) for query in queries)
+    search_ms = search_seconds / len(queries) * 1000
+    print(f"{store_name:>8}: add {add_seconds:8.2f}s  search {search_ms:10.2f}ms/query")
+    return search_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    embedding = RandomEmbeddings(args.dimension)
+    jobs = _jobs(args.docs)
+    queries = [f"query {i}" for i in range(args.queries)]
+    print(f"{args.docs} documents, {args.dimension} dimensions, top_k={args.top_k}, {args.queries} queries")
+
+    numpy_ms = run("numpy", NumpyStore(embedding=embedding, initial_capacity=args.docs), jobs, queries, args.top_k)
+    memory_ms = run("memory", MemoryStore(embedding=embedding), jobs, queries, args.top_k)
+    print(f"search speedup: {memory_ms / numpy_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -48,11 +48,81 @@ class Settings:
         self.PINECONE_API_KEY = os.getenv("PINECONE_API_KEY", "test_pinecone_key")
         self.PINECONE_INDEX = os.getenv("PINECONE_INDEX", "test_index")
         self.PINECONE_NAMESPACE = os.getenv("PINECONE_NAMESPACE", "test_namespace")
+        # Must match the model the index is integrated with; empty keeps embedding on Pinecone's side
+        self.PINECONE_EMBEDDING_MODEL = os.getenv("PINECONE_EMBEDDING_MODEL", "")
+        # Upserts are chunked to Pinecone's per-request limits (96 records for integrated inference, 2MB)
+        self.PINECONE_UPSERT_BATCH_SIZE = int(os.getenv("PINECONE_UPSERT_BATCH_SIZE", "96"))
+        self.PINECONE_UPSERT_MAX_BYTES = int(os.getenv("PINECONE_UPSERT_MAX_BYTES", "2000000"))
+        self.PINECONE_UPSERT_CONCURRENCY = int(os.getenv("PINECONE_UPSERT_CONCURRENCY", "4"))
+        self.PINECONE_UPSERT_RETRIES = int(os.getenv("PINECONE_UPSERT_RETRIES", "2"))
+        # Filters also match case variants of raw fields, for records written before the normalised copies;
+        # turn off once POST /debug/vector_store/backfill_normalized_fields has run
+        self.PINECONE_LEGACY_FILTER_FALLBACK = os.getenv("PINECONE_LEGACY_FILTER_FALLBACK", "true").lower() == "true"
+
+        # Hybrid Search Settings: fuse BM25 keyword results with vector results (reciprocal rank fusion)
+        self.HYBRID_SEARCH_ENABLED = os.getenv("HYBRID_SEARCH_ENABLED", "false").lower() == "true"
+        self.HYBRID_SEARCH_CANDIDATES = int(os.getenv("HYBRID_SEARCH_CANDIDATES", "50"))
+        self.HYBRID_SEARCH_RRF_K = int(os.getenv("HYBRID_SEARCH_RRF_K", "60"))
+
+        # Partition Settings: one namespace per value of PARTITION_FIELD (e.g. country); empty keeps a single namespace
+        self.PARTITION_FIELD = os.getenv("PARTITION_FIELD", "")
+        self.PARTITION_SEARCH_CONCURRENCY = int(os.getenv("PARTITION_SEARCH_CONCURRENCY", "4"))
+
+        # Rerank Settings: RERANKER is pinecone (hosted model), local (CPU lexical scorer) or none
+        self.RERANKER = os.getenv("RERANKER", "pinecone")
+        self.RERANK_MODEL = os.getenv("RERANK_MODEL", "bge-reranker-v2-m3")
+        self.RERANK_BATCH_SIZE = int(os.getenv("RERANK_BATCH_SIZE", "100"))
+        # Defaults for searches that do not set their own; 0 reranks exactly top_k candidates / whole documents
+        self.RERANK_CANDIDATES = int(os.getenv("RERANK_CANDIDATES", "0"))
+        self.RERANK_MAX_DOCUMENT_CHARS = int(os.getenv("RERANK_MAX_DOCUMENT_CHARS", "0"))
+        # Scores cached by (normalized query, document content hash); set to 0 to disable
+        self.RERANK_SCORE_CACHE_SIZE = int(os.getenv("RERANK_SCORE_CACHE_SIZE", "65536"))
+        self.RERANK_SCORE_CACHE_TTL_SECONDS = float(os.getenv("RERANK_SCORE_CACHE_TTL_SECONDS", "86400"))
+        # Adaptive rerank skipping: off, shadow (only log what skipping would change) or on
+        self.RERANK_SKIP_POLICY = os.getenv("RERANK_SKIP_POLICY", "off")
+        self.RERANK_SKIP_MIN_GAP = float(os.getenv("RERANK_SKIP_MIN_GAP", "0.15"))
+        self.RERANK_SKIP_MAX_ENTROPY = float(os.getenv("RERANK_SKIP_MAX_ENTROPY", "0.5"))
+        self.RERANK_SHRINK_MIN_GAP = float(os.getenv("RERANK_SHRINK_MIN_GAP", "0.05"))
+        self.RERANK_SHRINK_MAX_ENTROPY = float(os.getenv("RERANK_SHRINK_MAX_ENTROPY", "0.8"))
+        self.RERANK_SHRINK_RATIO = float(os.getenv("RERANK_SHRINK_RATIO", "0.5"))
+        self.RERANK_SKIP_TEMPERATURE = float(os.getenv("RERANK_SKIP_TEMPERATURE", "0.05"))
+
+        # Cache Settings
+        self.SIMILARITY_SEARCH_CACHE_SIZE = int(os.getenv("SIMILARITY_SEARCH_CACHE_SIZE", "1024"))
+        self.SIMILARITY_SEARCH_CACHE_TTL_SECONDS = float(os.getenv("SIMILARITY_SEARCH_CACHE_TTL_SECONDS", "300"))
+        self.QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "4096"))
+        self.QUERY_EMBEDDING_CACHE_TTL_SECONDS = float(os.getenv("QUERY_EMBEDDING_CACHE_TTL_SECONDS", "86400"))
+        # Query embedding cache misses of concurrent searches are sent to the embedding model together
+        self.QUERY_EMBEDDING_BATCH_SIZE = int(os.getenv("QUERY_EMBEDDING_BATCH_SIZE", "64"))
+        self.QUERY_EMBEDDING_BATCH_WAIT_SECONDS = float(os.getenv("QUERY_EMBEDDING_BATCH_WAIT_SECONDS", "0.005"))
+        # Set SEMANTIC_QUERY_CACHE_SIZE to 0 to disable near-duplicate query matching
+        self.SEMANTIC_QUERY_CACHE_SIZE = int(os.getenv("SEMANTIC_QUERY_CACHE_SIZE", "256"))
+        self.SEMANTIC_QUERY_CACHE_MAX_DISTANCE = float(os.getenv("SEMANTIC_QUERY_CACHE_MAX_DISTANCE", "0.05"))
+        self.SEMANTIC_QUERY_CACHE_TTL_SECONDS = float(os.getenv("SEMANTIC_QUERY_CACHE_TTL_SECONDS", "600"))
 
         # JSearch Settings
         self.JSEARCH_BASE_URL = os.getenv("JSEARCH_BASE_URL", "https://jsearch.p.rapidapi.com")
         self.JSEARCH_HEADER_HOST = os.getenv("JSEARCH_HEADER_HOST", "jsearch.p.rapidapi.com")
 
+        # Pagination Settings
+        self.SEARCH_PAGE_SIZE = int(os.getenv("SEARCH_PAGE_SIZE", "5"))
+        self.RESULT_SET_CACHE_SIZE = int(os.getenv("RESULT_SET_CACHE_SIZE", "1024"))
+        self.RESULT_SET_TTL_SECONDS = float(os.getenv("RESULT_SET_TTL_SECONDS", "300"))
+
+        # Job Detail Settings
+        self.JOB_DETAIL_CACHE_SIZE = int(os.getenv("JOB_DETAIL_CACHE_SIZE", "2048"))
+        self.JOB_DETAIL_CACHE_TTL_SECONDS = float(os.getenv("JOB_DETAIL_CACHE_TTL_SECONDS", "3600"))
+        # Set JOB_DETAIL_PREFETCH_TOP_N to 0 to disable prefetching details of /jobs results
+        self.JOB_DETAIL_PREFETCH_TOP_N = int(os.getenv("JOB_DETAIL_PREFETCH_TOP_N", "5"))
+        self.JOB_DETAIL_PREFETCH_CONCURRENCY = int(os.getenv("JOB_DETAIL_PREFETCH_CONCURRENCY", "4"))
+
+        # Ingestion Settings
+        self.INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "96"))
+
+        # Batch Search Settings
+        self.BATCH_SEARCH_MAX_QUERIES = int(os.getenv("BATCH_SEARCH_MAX_QUERIES", "20"))
+        self.BATCH_SEARCH_CONCURRENCY = int(os.getenv("BATCH_SEARCH_CONCURRENCY", "4"))
+
         # Debug settings
         self.DEBUG = os.getenv("DEBUG", "false").lower() == "true"
 
@@ -1,17 +1,172 @@
 from functools import lru_cache
+from typing import List, Optional
 
+from fastapi import Query
+from pinecone import Pinecone
+
+from config import settings
+from src.common.cache import LRUCache
 from src.job_searcher.service import JobSearcher
 from src.job_searcher.vendors.jsearch.vendor import JSearchVendor
+from src.services.job_detail_service import JobDetailService
 from src.services.job_search_service import JobSearchService
+from src.services.models import SearchResultSet
+from src.services.paginated_job_search_service import PaginatedJobSearchService
+from src.services.semantic_query_cache import SemanticQueryCache
+from src.vector_store.interface import VectorStore
+from src.vector_store.models import JobVectorStore
+from src.vector_store.rerankers.cached_reranker import CachedReranker
+from src.vector_store.rerankers.interface import AvailableRerankers, Reranker, RerankOptions
+from src.vector_store.rerankers.lexical_reranker import LexicalReranker
+from src.vector_store.rerankers.pinecone_reranker import PineconeReranker
+from src.vector_store.rerankers.skip_policy import RerankSkipMode, RerankSkipPolicy
+from src.vector_store.search_cache import SimilaritySearchCache
 from src.vector_store.service import VectorStoreService
+from src.vector_store.stores.hybrid_store import HybridStore
+from src.vector_store.stores.partitioned_store import PartitionedStore, partitions_in
 from src.vector_store.stores.pinecone_store import PineconeStore
 from src.vector_store.vector_transformer.service import VectorTransformerService
 
 
+@lru_cache()
+def get_similarity_search_cache() -> SimilaritySearchCache:
+    """Dependency to get SimilaritySearchCache instance"""
+    return SimilaritySearchCache(
+        max_size=settings.SIMILARITY_SEARCH_CACHE_SIZE,
+        ttl_seconds=settings.SIMILARITY_SEARCH_CACHE_TTL_SECONDS,
+    )
+
+
+@lru_cache()
+def get_query_embedding_cache() -> LRUCache[List[float]]:
+    """Dependency to get the query embedding cache shared by every vector store backend"""
+    return LRUCache[List[float]](
+        max_size=settings.QUERY_EMBEDDING_CACHE_SIZE,
+        ttl_seconds=settings.QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+    )
+
+
+@lru_cache()
+def get_rerank_score_cache() -> Optional[LRUCache[float]]:
+    """Dependency to get the rerank score cache, or None when disabled"""
+    if settings.RERANK_SCORE_CACHE_SIZE <= 0:
+        return None
+    return LRUCache[float](
+        max_size=settings.RERANK_SCORE_CACHE_SIZE,
+        ttl_seconds=settings.RERANK_SCORE_CACHE_TTL_SECONDS,
+    )
+
+
+@lru_cache()
+def get_reranker() -> Optional[Reranker]:
+    """Dependency to get the Reranker of the search pipeline, or None when reranking is disabled"""
+    reranker: Reranker
+    available_reranker = AvailableRerankers(settings.RERANKER)
+    # keeps cached scores of different models apart
+    cache_namespace = available_reranker.value
+    if available_reranker == AvailableRerankers.PINECONE:
+        cache_namespace = settings.RERANK_MODEL
+        reranker = PineconeReranker(
+            client=Pinecone(api_key=settings.PINECONE_API_KEY),
+            model=settings.RERANK_MODEL,
+            batch_size=settings.RERANK_BATCH_SIZE,
+        )
+    elif available_reranker == AvailableRerankers.LOCAL:
+        reranker = LexicalReranker(batch_size=settings.RERANK_BATCH_SIZE)
+    else:
+        return None
+    rerank_score_cache = get_rerank_score_cache()
+    if rerank_score_cache is not None:
+        reranker = CachedReranker(reranker, cache=rerank_score_cache, cache_namespace=cache_namespace)
+    return reranker
+
+
+@lru_cache()
+def get_rerank_skip_policy() -> Optional[RerankSkipPolicy]:
+    """Dependency to get the adaptive rerank skip policy, or None when disabled"""
+    mode = RerankSkipMode(settings.RERANK_SKIP_POLICY)
+    if mode == RerankSkipMode.OFF:
+        return None
+    return RerankSkipPolicy(
+        skip_min_gap=settings.RERANK_SKIP_MIN_GAP,
+        skip_max_entropy=settings.RERANK_SKIP_MAX_ENTROPY,
+        shrink_min_gap=settings.RERANK_SHRINK_MIN_GAP,
+        shrink_max_entropy=settings.RERANK_SHRINK_MAX_ENTROPY,
+        shrink_ratio=settings.RERANK_SHRINK_RATIO,
+        temperature=settings.RERANK_SKIP_TEMPERATURE,
+        shadow=mode == RerankSkipMode.SHADOW,
+    )
+
+
+@lru_cache()
+def get_default_rerank_options() -> RerankOptions:
+    """Dependency to get the rerank options of searches that do not set their own"""
+    return RerankOptions(
+        candidates=settings.RERANK_CANDIDATES or None,
+        max_document_chars=settings.RERANK_MAX_DOCUMENT_CHARS or None,
+    )
+
+
+def get_request_rerank_options(
+    rerank: bool = True,
+    rerank_candidates: Optional[int] = Query(default=None, ge=1, le=100),  # noqa: B008
+) -> RerankOptions:
+    """Dependency to get the rerank options of one request from its query parameters"""
+    default_rerank_options = get_default_rerank_options()
+    return default_rerank_options.model_copy(
+        update={"enabled": rerank, "candidates": rerank_candidates or default_rerank_options.candidates}
+    )
+
+
+@lru_cache()
+def get_pinecone_store() -> PineconeStore:
+    """Dependency to get the PineconeStore of the base namespace"""
+    return PineconeStore(
+        query_embedding_cache=get_query_embedding_cache(),
+        upsert_batch_size=settings.PINECONE_UPSERT_BATCH_SIZE,
+        upsert_max_bytes=settings.PINECONE_UPSERT_MAX_BYTES,
+        upsert_concurrency=settings.PINECONE_UPSERT_CONCURRENCY,
+        upsert_retries=settings.PINECONE_UPSERT_RETRIES,
+        legacy_filter_fallback=settings.PINECONE_LEGACY_FILTER_FALLBACK,
+    )
+
+
 @lru_cache()
 def get_vector_store_service() -> VectorStoreService:
     """Dependency to get VectorStoreService instance"""
-    return VectorStoreService(PineconeStore())
+    pinecone_store = get_pinecone_store()
+    vector_store: VectorStore = pinecone_store
+    if settings.PARTITION_FIELD:
+        namespaces = pinecone_store.list_namespaces()
+        vector_store = PartitionedStore(
+            pinecone_store.with_namespace,
+            namespace=pinecone_store.namespace,
+            partition_field=settings.PARTITION_FIELD,
+            partitions=partitions_in(pinecone_store.namespace, namespaces),
+            search_concurrency=settings.PARTITION_SEARCH_CONCURRENCY,
+            query_embedding=pinecone_store.query_embedding,
+            # jobs written before partitioning stay searchable until they are re-upserted and the namespace deleted
+            unpartitioned=pinecone_store if pinecone_store.namespace in namespaces else None,
+        )
+    if settings.HYBRID_SEARCH_ENABLED:
+        vector_store = HybridStore(
+            vector_store, candidates=settings.HYBRID_SEARCH_CANDIDATES, rrf_k=settings.HYBRID_SEARCH_RRF_K
+        )
+    return VectorStoreService(
+        vector_store,
+        search_cache=get_similarity_search_cache(),
+        reranker=get_reranker(),
+        rerank_options=get_default_rerank_options(),
+        rerank_policy=get_rerank_skip_policy(),
+    )
+
+
+def close_vector_stores() -> None:
+    """Release the threads of the vector stores created so far; called on app shutdown"""
+    if get_vector_store_service.cache_info().currsize:
+        get_vector_store_service().vector_store.close()
+    if get_pinecone_store.cache_info().currsize:
+        get_pinecone_store().close()
 
 
 # TODO: remove this dependency
@@ -33,11 +188,62 @@ def get_job_searcher() -> JobSearcher:
     return JobSearcher(vendor=get_jsearch_vendor())
 
 
+@lru_cache()
+def get_semantic_query_cache() -> Optional[SemanticQueryCache]:
+    """Dependency to get SemanticQueryCache instance, or None when disabled"""
+    if settings.SEMANTIC_QUERY_CACHE_SIZE <= 0:
+        return None
+    return SemanticQueryCache(
+        max_entries=settings.SEMANTIC_QUERY_CACHE_SIZE,
+        max_distance=settings.SEMANTIC_QUERY_CACHE_MAX_DISTANCE,
+        ttl_seconds=settings.SEMANTIC_QUERY_CACHE_TTL_SECONDS,
+    )
+
+
 @lru_cache()
 def get_job_search_service() -> JobSearchService:
     """Dependency to get JobSearchService instance"""
+    vector_store_service = get_vector_store_service()
     return JobSearchService(
+        job_searcher=get_job_searcher(),
+        vector_store_service=vector_store_service,
+        vector_transformer_service=get_vector_transformer_service(),
+        batch_concurrency=settings.BATCH_SEARCH_CONCURRENCY,
+        query_embedding=vector_store_service.vector_store.query_embedding,
+        semantic_query_cache=get_semantic_query_cache(),
+        ingest_batch_size=settings.INGEST_BATCH_SIZE,
+    )
+
+
+@lru_cache()
+def get_paginated_job_search_service() -> PaginatedJobSearchService:
+    """Dependency to get PaginatedJobSearchService instance"""
+    return PaginatedJobSearchService(
+        job_search_service=get_job_search_service(),
+        result_sets=LRUCache[SearchResultSet](
+            max_size=settings.RESULT_SET_CACHE_SIZE,
+            ttl_seconds=settings.RESULT_SET_TTL_SECONDS,
+        ),
+    )
+
+
+@lru_cache()
+def get_job_detail_cache() -> LRUCache[JobVectorStore]:
+    """Dependency to get the job detail cache"""
+    return LRUCache[JobVectorStore](
+        max_size=settings.JOB_DETAIL_CACHE_SIZE,
+        ttl_seconds=settings.JOB_DETAIL_CACHE_TTL_SECONDS,
+    )
+
+
+@lru_cache()
+def get_job_detail_service() -> JobDetailService:
+    """Dependency to get JobDetailService instance"""
+    return JobDetailService(
         job_searcher=get_job_searcher(),
         vector_store_service=get_vector_store_service(),
         vector_transformer_service=get_vector_transformer_service(),
+        cache=get_job_detail_cache(),
+        prefetch_top_n=settings.JOB_DETAIL_PREFETCH_TOP_N,
+        prefetch_concurrency=settings.JOB_DETAIL_PREFETCH_CONCURRENCY,
     )
@@ -0,0 +1,23 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from config import settings
+from src.vector_store.models import JobVectorStore
+
+
+class JobSearchRequest(BaseModel):
+    query: str
+    country: str
+
+
+class BatchJobSearchRequest(BaseModel):
+    searches: List[JobSearchRequest] = Field(..., min_length=1, max_length=settings.BATCH_SEARCH_MAX_QUERIES)
+
+
+class JobSearchResult(BaseModel):
+    query: str
+    country: str
+    results: List[JobVectorStore]
+    # set, with no results, when this search of a batch failed
+    error: Optional[str] = None
@@ -1,12 +1,25 @@
+import asyncio
 from typing import Any, Dict
 
 from fastapi import APIRouter, Depends
 
-from src.api.dependencies import get_job_search_service, get_jsearch_vendor, get_vector_store_service
+from src.api.dependencies import (
+    get_job_detail_cache,
+    get_job_search_service,
+    get_jsearch_vendor,
+    get_pinecone_store,
+    get_query_embedding_cache,
+    get_rerank_score_cache,
+    get_rerank_skip_policy,
+    get_semantic_query_cache,
+    get_similarity_search_cache,
+    get_vector_store_service,
+)
 from src.job_searcher.vendors.jsearch.vendor import JSearchVendor
 from src.services.job_search_service import JobSearchService
 from src.vector_store.models import JobVectorStore
 from src.vector_store.service import VectorStoreService
+from src.vector_store.stores.partitioned_store import PARTITION_SEPARATOR
 
 router = APIRouter()
 
@@ -16,23 +29,41 @@ async def debug_add_job_details(
     vector_store_service: VectorStoreService = Depends(get_vector_store_service),  # noqa: B008
 ) -> Dict[str, str]:
     vector_store_service.add_job_details(
-        job_details=JobVectorStore(
-            job_id="2",
-            job_title="Software Engineer",
-            job_description=(
-                "We are looking for a software engineer with 3 years of " "experience in Python and Django."
-            ),
-            job_apply_link="https://www.google.com",
-            employer_name="Google",
-            job_city="San Francisco",
-            job_state="CA",
-            job_country="USA",
-            location_string="San Francisco, CA, USA",
-        )
+        job_details=[
+            JobVectorStore(
+                job_id="2",
+                job_title="Software Engineer",
+                job_description=(
+                    "We are looking for a software engineer with 3 years of " "experience in Python and Django."
+                ),
+                job_apply_link="https://www.google.com",
+                employer_name="Google",
+                job_city="San Francisco",
+                job_state="CA",
+                job_country="USA",
+                location_string="San Francisco, CA, USA",
+            )
+        ]
     )
     return {"message": "Debug endpoint"}
 
 
+@router.post("/debug/vector_store/backfill_normalized_fields")
+async def debug_backfill_normalized_fields() -> Dict[str, int]:
+    pinecone_store = get_pinecone_store()
+    partition_prefix = f"{pinecone_store.namespace}{PARTITION_SEPARATOR}"
+    namespaces = [
+        namespace
+        for namespace in pinecone_store.list_namespaces()
+        if namespace == pinecone_store.namespace or namespace.startswith(partition_prefix)
+    ]
+    # records updated per namespace, the base one and its partitions
+    return {
+        namespace: await asyncio.to_thread(pinecone_store.with_namespace(namespace).backfill_normalized_fields)
+        for namespace in namespaces
+    }
+
+
 @router.get("/debug/vector_store/similarity_search")
 async def debug_similarity_search(
     vector_store_service: VectorStoreService = Depends(get_vector_store_service),  # noqa: B008
@@ -65,3 +96,22 @@ async def debug_search_relevant_jobs(
         filters={"country": country},
     )
     return results
+
+
+@router.get("/debug/cache/stats")
+async def debug_cache_stats() -> Dict[str, Any]:
+    semantic_query_cache = get_semantic_query_cache()
+    rerank_score_cache = get_rerank_score_cache()
+    return {
+        "similarity_search": get_similarity_search_cache().stats(),
+        "query_embedding": get_query_embedding_cache().stats(),
+        "semantic_query": semantic_query_cache.stats() if semantic_query_cache is not None else None,
+        "job_detail": get_job_detail_cache().stats(),
+        "rerank_score": rerank_score_cache.stats() if rerank_score_cache is not None else None,
+    }
+
+
+@router.get("/debug/rerank_policy/stats")
+async def debug_rerank_policy_stats() -> Dict[str, Any]:
+    rerank_skip_policy = get_rerank_skip_policy()
+    return rerank_skip_policy.stats() if rerank_skip_policy is not None else {"enabled": False}
@@ -1,9 +1,23 @@
-from typing import Any
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 
-from src.api.dependencies import get_job_search_service
+from config import settings
+from src.api.dependencies import (
+    get_job_detail_service,
+    get_job_search_service,
+    get_paginated_job_search_service,
+    get_request_rerank_options,
+)
+from src.api.models import BatchJobSearchRequest, JobSearchResult
+from src.services.job_detail_service import JobDetailService
 from src.services.job_search_service import JobSearchService
+from src.services.paginated_job_search_service import InvalidCursorError, PaginatedJobSearchService
+from src.vector_store.models import JobVectorStore
+from src.vector_store.rerankers.interface import RerankOptions
 
 router = APIRouter(
     prefix="/jobs",
@@ -11,15 +25,114 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode_event(event: Dict[str, Any], server_sent_events: bool) -> str:
+    payload = json.dumps(
+        {key: _to_jsonable(value) for key, value in event.items()},
+        separators=(",", ":"),
+    )
+    if server_sent_events:
+        return f"event: {event['event']}\ndata: {payload}\n\n"
+    return f"{payload}\n"
+
+
+def _to_jsonable(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_to_jsonable(item) for item in value]
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return value
+
 
 @router.get("")
 async def search_relevant_jobs(
+    response: Response,
+    background_tasks: BackgroundTasks,
+    query: Optional[str] = None,
+    country: Optional[str] = None,
+    page_size: int = Query(default=settings.SEARCH_PAGE_SIZE, ge=1, le=50),  # noqa: B008
+    cursor: Optional[str] = None,
+    rerank_options: RerankOptions = Depends(get_request_rerank_options),  # noqa: B008
+    paginated_job_search_service: PaginatedJobSearchService = Depends(get_paginated_job_search_service),  # noqa: B008
+    job_detail_service: JobDetailService = Depends(get_job_detail_service),  # noqa: B008
+) -> Any:
+    """Search jobs one page at a time; pass the X-Next-Cursor header back as `cursor` for the next page"""
+    if cursor is not None:
+        try:
+            results, next_cursor = await paginated_job_search_service.search_next_page(cursor)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+    elif query is None or country is None:
+        raise HTTPException(status_code=422, detail="query and country are required without a cursor")
+    else:
+        results, next_cursor = await paginated_job_search_service.search_first_page(
+            query=query,
+            filters={"country": country},
+            page_size=page_size,
+            rerank=rerank_options,
+        )
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    # warm the detail cache after the response is sent, so click-throughs are served from memory
+    background_tasks.add_task(job_detail_service.prefetch, results)
+    return results
+
+
+@router.get("/stream")
+async def stream_relevant_jobs(
+    request: Request,
     query: str,
     country: str,
+    num_pages: int = Query(default=1, ge=1, le=20),  # noqa: B008
+    rerank_options: RerankOptions = Depends(get_request_rerank_options),  # noqa: B008
     job_search_service: JobSearchService = Depends(get_job_search_service),  # noqa: B008
-) -> Any:
-    results = await job_search_service.search_relevant_jobs(
-        query=query,
-        filters={"country": country},
+) -> StreamingResponse:
+    """Stream search results as NDJSON, or as Server-Sent Events for text/event-stream clients"""
+    server_sent_events = "text/event-stream" in request.headers.get("accept", "")
+
+    async def events() -> AsyncIterator[str]:
+        async for event in job_search_service.stream_relevant_jobs(
+            query=query,
+            filters={"country": country},
+            num_pages=num_pages,
+            rerank=rerank_options,
+        ):
+            yield _encode_event(event, server_sent_events)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream" if server_sent_events else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache"},
     )
-    return results
+
+
+@router.get("/{job_id}")
+async def get_job_details(
+    job_id: str,
+    job_detail_service: JobDetailService = Depends(get_job_detail_service),  # noqa: B008
+) -> JobVectorStore:
+    job_details = await job_detail_service.get_job_details(job_id)
+    if job_details is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job_details
+
+
+@router.post("/batch")
+async def search_relevant_jobs_batch(
+    batch_request: BatchJobSearchRequest,
+    rerank_options: RerankOptions = Depends(get_request_rerank_options),  # noqa: B008
+    job_search_service: JobSearchService = Depends(get_job_search_service),  # noqa: B008
+) -> List[JobSearchResult]:
+    results = await job_search_service.search_relevant_jobs_batch(
+        [(search.query, {"country": search.country}) for search in batch_request.searches], rerank=rerank_options
+    )
+    return [
+        (
+            JobSearchResult(query=search.query, country=search.country, results=[], error="Search failed")
+            if isinstance(search_results, Exception)
+            else JobSearchResult(query=search.query, country=search.country, results=search_results)
+        )
+        for search, search_results in zip(batch_request.searches, results)
+    ]
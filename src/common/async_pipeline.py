@@ -0,0 +1,57 @@
+import asyncio
+from typing import AsyncIterable, AsyncIterator, Iterable, List, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+async def flatten(source: AsyncIterable[Iterable[T]]) -> AsyncIterator[T]:
+    """Yield the items of every iterable produced by source"""
+    async for items in source:
+        for item in items:
+            yield item
+
+
+async def batched(source: AsyncIterable[T], size: int) -> AsyncIterator[List[T]]:
+    """Group items from source into lists of at most size items"""
+    if size < 1:
+        raise ValueError("size must be at least 1")
+    batch: List[T] = []
+    async for item in source:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def prefetch(source: AsyncIterable[T], max_buffered: int = 1) -> AsyncIterator[T]:
+    """Run source ahead of its consumer in a background task, buffering at most max_buffered items"""
+    queue: "asyncio.Queue[object]" = asyncio.Queue(maxsize=max_buffered)
+
+    async def produce() -> None:
+        try:
+            async for item in source:
+                await queue.put(item)
+        except Exception as e:
+            await queue.put(e)
+            return
+        await queue.put(_DONE)
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item  # type: ignore[misc]
+    finally:
+        producer.cancel()
+        try:
+            await producer
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,6 @@
+import hashlib
+
+
+def content_hash(text: str) -> str:
+    """Stable 128-bit hex digest of text, for keying caches by document content"""
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
@@ -0,0 +1,22 @@
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+def normalize_query(query: str) -> str:
+    """Normalize query text so that case and whitespace differences map to the same key"""
+    return " ".join(query.casefold().split())
+
+
+def normalize_filters(filters: Optional[Dict[str, Any]] = None) -> Tuple[Tuple[str, Hashable], ...]:
+    """Normalize filters into a hashable, order-independent tuple of (key, value) pairs"""
+    if not filters:
+        return ()
+    normalized = []
+    for key, value in filters.items():
+        if value is None:
+            continue
+        if isinstance(value, str):
+            value = normalize_query(value)
+        elif isinstance(value, (list, tuple, set)):
+            value = tuple(sorted((normalize_query(v) if isinstance(v, str) else v for v in value), key=str))
+        normalized.append((key.casefold(), value))
+    return tuple(sorted(normalized, key=lambda item: item[0]))
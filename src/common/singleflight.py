@@ -0,0 +1,29 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Coalesces concurrent calls that share a key into a single shielded computation"""
+
+    def __init__(self) -> None:
+        self._in_flight: Dict[Hashable, "asyncio.Future[T]"] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._in_flight
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: "asyncio.Future[T]") -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # mark the exception as retrieved in case every caller went away
+        if not task.cancelled():
+            task.exception()
@@ -1,5 +1,5 @@
 import hashlib
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional, Set
 
 from src.job_searcher.interface import JobSearchVendor
 from src.job_searcher.models import JobDetails
@@ -34,16 +34,51 @@ class JobSearcher:
             logger.error(f"Error searching jobs for query '{query}': {str(e)}")
             raise
 
-    def deduplicate_jobs(self, jobs: Optional[List[JobDetails]] = None) -> List[JobDetails]:
+    async def get_job_details(self, job_id: str) -> JobDetails:
+        logger.debug(f"Fetching job details for job_id: '{job_id}'")
+        return await self.vendor.get_job_details(job_id)
+
+    async def iter_job_pages(
+        self, query: Optional[str], filters: Optional[Dict[str, Any]] = None, num_pages: int = 1
+    ) -> AsyncIterator[List[JobDetails]]:
+        """Yield vendor results one page at a time, stopping early at the first empty page"""
+        for page in range(1, num_pages + 1):
+            jobs = await self.search_jobs(query, {**(filters or {}), "page": page})
+            if not jobs:
+                return
+            yield jobs
+
+    def deduplicate_jobs(
+        self, jobs: Optional[List[JobDetails]] = None, job_hashes: Optional[Set[str]] = None
+    ) -> List[JobDetails]:
+        """Drop jobs sharing an apply URL; pass the same job_hashes set to deduplicate across calls"""
         if jobs is None:
             return []
-        job_hashes = set()
+        if job_hashes is None:
+            job_hashes = set()
         deduplicated_jobs = []
         for job in jobs:
-            job_hash = hashlib.sha256(job.job_url.encode()).hexdigest()
+            job_hash = self._job_hash(job)
             if job_hash in job_hashes:
                 continue
             job_hashes.add(job_hash)
             deduplicated_jobs.append(job)
         logger.info(f"Deduplicated {len(jobs)} jobs to {len(deduplicated_jobs)} jobs")
         return deduplicated_jobs
+
+    async def deduplicate_stream(
+        self, jobs: AsyncIterable[JobDetails], job_hashes: Optional[Set[str]] = None
+    ) -> AsyncIterator[JobDetails]:
+        """Streaming counterpart of deduplicate_jobs that only keeps the hashes of seen jobs"""
+        if job_hashes is None:
+            job_hashes = set()
+        async for job in jobs:
+            job_hash = self._job_hash(job)
+            if job_hash in job_hashes:
+                continue
+            job_hashes.add(job_hash)
+            yield job
+
+    @staticmethod
+    def _job_hash(job: JobDetails) -> str:
+        return hashlib.sha256(job.job_url.encode()).hexdigest()
@@ -58,6 +58,7 @@ class JSearchVendor(JobSearchVendor):
             search_params = SearchParams(query=query)
             if filters is not None:
                 search_params.country = filters.get("country")
+                search_params.page = filters.get("page", search_params.page)
 
             # Prepare query parameters
             query_params = search_params.to_jsearch_params()
@@ -7,7 +7,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from config import settings
+from src.api.dependencies import close_vector_stores
 from src.api.routers.debug_router import router as debug_router
+from src.api.routers.job_search_router import NEXT_CURSOR_HEADER
 from src.api.routers.job_search_router import router as job_search_router
 from src.logger import get_logger, setup_logging_from_env
 
@@ -23,6 +25,7 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     logger.info("👋 Shutting down...")
+    close_vector_stores()
 
 
 app = FastAPI(
@@ -39,6 +42,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Include routers
@@ -0,0 +1,72 @@
+import asyncio
+from typing import List, Optional
+
+from src.common.cache import LRUCache
+from src.job_searcher.service import JobSearcher
+from src.logger import get_logger
+from src.vector_store.models import JobVectorStore
+from src.vector_store.service import VectorStoreService
+from src.vector_store.vector_transformer.service import VectorTransformerService
+
+logger = get_logger(__name__)
+
+
+class JobDetailService:
+    """Read-through lookup of a single job: detail cache, then the vector store, then the vendor"""
+
+    def __init__(
+        self,
+        job_searcher: JobSearcher,
+        vector_store_service: VectorStoreService,
+        vector_transformer_service: VectorTransformerService,
+        cache: LRUCache[JobVectorStore],
+        prefetch_top_n: int = 5,
+        prefetch_concurrency: int = 4,
+    ):
+        self.job_searcher = job_searcher
+        self.vector_store_service = vector_store_service
+        self.vector_transformer_service = vector_transformer_service
+        self.cache = cache
+        self.prefetch_top_n = prefetch_top_n
+        self.prefetch_concurrency = prefetch_concurrency
+
+    async def get_job_details(self, job_id: str) -> Optional[JobVectorStore]:
+        job_details = self.cache.get(job_id)
+        if job_details is not None:
+            return job_details
+        job_details = await self._fetch(job_id)
+        if job_details is not None:
+            self.cache.set(job_id, job_details)
+        return job_details
+
+    async def prefetch(self, results: List[JobVectorStore]) -> None:
+        """Warm the cache with full details of the top results, so click-throughs skip the store and vendor"""
+        missing = []
+        for result in results[: self.prefetch_top_n]:
+            if result.job_description:
+                # search results from the store already carry the full description
+                self.cache.set(result.job_id, result.model_copy(update={"score": None}))
+            elif self.cache.get(result.job_id) is None:
+                missing.append(result.job_id)
+        if not missing:
+            return
+
+        semaphore = asyncio.Semaphore(self.prefetch_concurrency)
+
+        async def prefetch_one(job_id: str) -> None:
+            async with semaphore:
+                await self.get_job_details(job_id)
+
+        logger.info(f"Prefetching details for {len(missing)} jobs")
+        await asyncio.gather(*(prefetch_one(job_id) for job_id in missing))
+
+    async def _fetch(self, job_id: str) -> Optional[JobVectorStore]:
+        job_details = await asyncio.to_thread(self.vector_store_service.get_job_details, job_id)
+        if job_details is not None:
+            return job_details
+        try:
+            vendor_job_details = await self.job_searcher.get_job_details(job_id)
+        except Exception as e:
+            logger.warning(f"Vendor lookup failed for job_id: '{job_id}': {e}")
+            return None
+        return self.vector_transformer_service.transform_one(vendor_job_details)
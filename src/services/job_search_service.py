@@ -1,8 +1,18 @@
-from typing import Any, Dict, Optional
+import asyncio
+from typing import Any, AsyncIterator, Dict, Hashable, List, Optional, Set, Tuple, Union
 
+from langchain_core.embeddings import Embeddings
+
+from src.common.async_pipeline import flatten, prefetch
+from src.common.normalization import normalize_filters, normalize_query
+from src.common.singleflight import SingleFlight
 from src.job_searcher.models import JobDetails
 from src.job_searcher.service import JobSearcher
 from src.logger import get_logger
+from src.services.semantic_query_cache import SemanticQueryCache
+from src.vector_store.interface import PartialUpsertError
+from src.vector_store.models import JobVectorStore
+from src.vector_store.rerankers.interface import RerankOptions
 from src.vector_store.service import VectorStoreService
 from src.vector_store.vector_transformer.service import VectorTransformerService
 
@@ -15,28 +25,205 @@ class JobSearchService:
         job_searcher: JobSearcher,
         vector_store_service: VectorStoreService,
         vector_transformer_service: VectorTransformerService,
+        batch_concurrency: int = 4,
+        query_embedding: Optional[Embeddings] = None,
+        semantic_query_cache: Optional[SemanticQueryCache] = None,
+        ingest_batch_size: int = 96,
     ):
         self.job_searcher = job_searcher
         self.vector_store_service = vector_store_service
         self.vector_transformer_service = vector_transformer_service
+        self.in_flight_searches: SingleFlight[list[JobVectorStore]] = SingleFlight()
+        self.batch_concurrency = batch_concurrency
+        self.query_embedding = query_embedding
+        self.semantic_query_cache = semantic_query_cache
+        self.ingest_batch_size = ingest_batch_size
 
-    def get_semantic_search_query(self, query: str, filters: Optional[Dict[str, Any]] = None) -> str:
-        query = f"{query}"
-        if filters:
-            for key, value in filters.items():
-                query += f" {key}: {value}"
-        return query
+    def get_semantic_search_query(self, query: str) -> str:
+        # normalized so that equivalent searches share cached results and query embeddings;
+        # filters are applied by the vector store rather than folded into the query text
+        return normalize_query(query)
 
-    async def search_relevant_jobs(self, query: str, filters: Optional[Dict[str, Any]] = None) -> list[JobDetails]:
-        jobs = await self.job_searcher.search_jobs(query, filters)
-        deduplicated_jobs = self.job_searcher.deduplicate_jobs(jobs)
-        # transform jobs to job vector store
+    def get_search_key(self, query: str, filters: Optional[Dict[str, Any]] = None) -> Hashable:
+        return (normalize_query(query), normalize_filters(filters))
+
+    async def search_relevant_jobs(
+        self,
+        query: str,
+        filters: Optional[Dict[str, Any]] = None,
+        top_k: Optional[int] = None,
+        rerank: Optional[RerankOptions] = None,
+    ) -> list[JobVectorStore]:
+        # identical concurrent searches share one vendor call, upsert and rerank
+        search_key = (self.get_search_key(query, filters), top_k, rerank)
+        if self.in_flight_searches.in_flight(search_key):
+            logger.info(f"Joining in-flight search for query: '{query}', filters: {filters}")
+        return await self.in_flight_searches.do(
+            search_key, lambda: self._search_relevant_jobs(query, filters, top_k, rerank)
+        )
+
+    async def _search_relevant_jobs(
+        self,
+        query: str,
+        filters: Optional[Dict[str, Any]] = None,
+        top_k: Optional[int] = None,
+        rerank: Optional[RerankOptions] = None,
+    ) -> list[JobVectorStore]:
+        query_vector = None
+        filters_key = (normalize_filters(filters), top_k, rerank)
+        if self.semantic_query_cache is not None and self.query_embedding is not None:
+            # near-duplicate queries skip both the vendor call and the rerank
+            query_vector = await self.query_embedding.aembed_query(normalize_query(query))
+            cached_results = self.semantic_query_cache.get(query_vector, filters_key)
+            if cached_results is not None:
+                logger.info(f"Serving query '{query}' from the semantic query cache")
+                return cached_results
+
+        # jobs the vendor had nothing new for may still be indexed from earlier searches
+        await self.ingest_job_pages(query, filters)
+        # the store search, query embedding and rerank block, so they run off the event loop
+        results = await asyncio.to_thread(self.semantic_search, query, filters, top_k, rerank)
+        if self.semantic_query_cache is not None and query_vector is not None:
+            self.semantic_query_cache.set(query_vector, filters_key, results)
+        return results
+
+    async def ingest_job_pages(self, query: str, filters: Optional[Dict[str, Any]] = None, num_pages: int = 1) -> int:
+        """Stream vendor pages through dedupe, transform and chunked upsert, returning how many were upserted"""
+        pages = prefetch(self.job_searcher.iter_job_pages(query, filters, num_pages), max_buffered=1)
+        jobs = self.job_searcher.deduplicate_stream(flatten(pages))
+        job_vector_stores = self.vector_transformer_service.transform_stream(jobs)
+        upserted = await self.vector_store_service.add_job_details_stream(job_vector_stores, self.ingest_batch_size)
+        logger.info(f"Ingested {upserted} jobs from {num_pages} vendor page(s) for query: '{query}'")
+        return upserted
+
+    def ingest_jobs(self, jobs: Optional[List[JobDetails]], job_hashes: Optional[Set[str]] = None) -> int:
+        """Deduplicate, transform and upsert vendor jobs, returning how many were upserted"""
+        deduplicated_jobs = self.job_searcher.deduplicate_jobs(jobs, job_hashes)
         if not deduplicated_jobs:
-            return []
+            return 0
+        # transform jobs to job vector store
         job_vector_stores = self.vector_transformer_service.transform(deduplicated_jobs)
-        self.vector_store_service.add_job_details(job_vector_stores)
-        semantic_search_query = self.get_semantic_search_query(query, filters)
-        logger.info(f"Semantic search query: {semantic_search_query}")
-        semantic_search_results = self.vector_store_service.similarity_search(semantic_search_query)
+        return self.upsert_jobs(job_vector_stores)
+
+    def upsert_jobs(self, job_vector_stores: List[JobVectorStore]) -> int:
+        """Upsert transformed jobs, returning how many were written; a partial failure does not fail the search"""
+        try:
+            self.vector_store_service.add_job_details(job_vector_stores)
+        except PartialUpsertError as e:
+            logger.error(f"Upserting {len(job_vector_stores)} jobs partially failed: {str(e)}")
+            return e.upserted
+        return len(job_vector_stores)
+
+    async def ingest_vendor_page(self, query: str, filters: Optional[Dict[str, Any]], page: int) -> int:
+        """Fetch and upsert one vendor results page, returning how many jobs the vendor returned"""
+        jobs = await self.job_searcher.search_jobs(query, {**(filters or {}), "page": page})
+        # transform and upsert block, so they run off the event loop
+        await asyncio.to_thread(self.ingest_jobs, jobs)
+        return len(jobs)
+
+    def semantic_search(
+        self,
+        query: str,
+        filters: Optional[Dict[str, Any]] = None,
+        top_k: Optional[int] = None,
+        rerank: Optional[RerankOptions] = None,
+    ) -> list[JobVectorStore]:
+        semantic_search_query = self.get_semantic_search_query(query)
+        logger.info(f"Semantic search query: {semantic_search_query}, filters: {filters}")
+        semantic_search_results = self.vector_store_service.similarity_search(
+            semantic_search_query, top_k=top_k, filters=filters, rerank=rerank
+        )
         logger.info(f"Semantic search results: {semantic_search_results}")
         return semantic_search_results
+
+    async def stream_relevant_jobs(
+        self,
+        query: str,
+        filters: Optional[Dict[str, Any]] = None,
+        num_pages: int = 1,
+        rerank: Optional[RerankOptions] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield index matches, then every vendor page once upserted, then the final search"""
+        semantic_search_query = self.get_semantic_search_query(query)
+        index_results = await asyncio.to_thread(
+            self.vector_store_service.similarity_search, semantic_search_query, filters=filters, rerank=rerank
+        )
+        if index_results:
+            yield {"event": "index_matches", "jobs": index_results}
+
+        job_hashes: Set[str] = set()
+        page = 0
+        ingested = False
+        async for jobs in self.job_searcher.iter_job_pages(query, filters, num_pages):
+            page += 1
+            deduplicated_jobs = self.job_searcher.deduplicate_jobs(jobs, job_hashes)
+            if not deduplicated_jobs:
+                continue
+            job_vector_stores = self.vector_transformer_service.transform(deduplicated_jobs)
+            await asyncio.to_thread(self.upsert_jobs, job_vector_stores)
+            ingested = True
+            yield {"event": "vendor_jobs", "page": page, "jobs": job_vector_stores}
+
+        if ingested:
+            semantic_search_results = await asyncio.to_thread(
+                self.vector_store_service.similarity_search, semantic_search_query, filters=filters, rerank=rerank
+            )
+        else:
+            semantic_search_results = index_results
+        yield {"event": "final", "jobs": semantic_search_results}
+
+    async def search_relevant_jobs_batch(
+        self, searches: List[Tuple[str, Optional[Dict[str, Any]]]], rerank: Optional[RerankOptions] = None
+    ) -> List[Union[list[JobVectorStore], Exception]]:
+        """Run several searches with one shared pipeline and return the results, or the error, in input order"""
+        unique_searches: Dict[Hashable, Tuple[str, Optional[Dict[str, Any]]]] = {}
+        for query, filters in searches:
+            unique_searches.setdefault(self.get_search_key(query, filters), (query, filters))
+        logger.info(f"Batch search: {len(searches)} searches, {len(unique_searches)} unique")
+
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+
+        async def fetch_jobs(query: str, filters: Optional[Dict[str, Any]]) -> List[JobDetails]:
+            async with semaphore:
+                try:
+                    return await self.job_searcher.search_jobs(query, filters)
+                except Exception as e:
+                    # one failing vendor call should not fail the whole batch
+                    logger.error(f"Batch search vendor call failed for query '{query}': {str(e)}")
+                    return []
+
+        vendor_results = await asyncio.gather(
+            *(fetch_jobs(query, filters) for query, filters in unique_searches.values())
+        )
+
+        job_hashes: Set[str] = set()
+        deduplicated_jobs: List[JobDetails] = []
+        for jobs in vendor_results:
+            deduplicated_jobs.extend(self.job_searcher.deduplicate_jobs(jobs, job_hashes))
+        if deduplicated_jobs:
+            job_vector_stores = self.vector_transformer_service.transform(deduplicated_jobs)
+            await asyncio.to_thread(self.upsert_jobs, job_vector_stores)
+
+        async def semantic_search(query: str, filters: Optional[Dict[str, Any]]) -> list[JobVectorStore]:
+            async with semaphore:
+                semantic_search_query = self.get_semantic_search_query(query)
+                return await asyncio.to_thread(
+                    self.vector_store_service.similarity_search, semantic_search_query, filters=filters, rerank=rerank
+                )
+
+        # one failing search should not fail the whole batch; its error is returned in its place
+        search_results = await asyncio.gather(
+            *(semantic_search(query, filters) for query, filters in unique_searches.values()),
+            return_exceptions=True,
+        )
+        results_by_key: Dict[Hashable, Union[list[JobVectorStore], Exception]] = {}
+        for (key, (query, _)), result in zip(unique_searches.items(), search_results):
+            if isinstance(result, Exception):
+                logger.error(f"Batch semantic search failed for query '{query}': {str(result)}")
+            elif isinstance(result, BaseException):
+                raise result
+            results_by_key[key] = result
+        return [
+            result if isinstance(result, Exception) else list(result)
+            for result in (results_by_key[self.get_search_key(query, filters)] for query, filters in searches)
+        ]
@@ -0,0 +1,21 @@
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from src.vector_store.models import JobVectorStore
+from src.vector_store.rerankers.interface import RerankOptions
+
+
+class SearchResultSet(BaseModel):
+    """Server-side state behind a pagination cursor"""
+
+    query: str
+    filters: Optional[Dict[str, Any]] = None
+    page_size: int
+    # deeper pages rerank the same way as the first one
+    rerank: Optional[RerankOptions] = None
+    vendor_page: int = 1
+    vendor_exhausted: bool = False
+    returned_job_ids: List[str] = []
+    # ranked results found but not served yet; later searches only append, so pages never shift
+    pending_results: List[JobVectorStore] = []
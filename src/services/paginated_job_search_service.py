@@ -0,0 +1,96 @@
+import asyncio
+import secrets
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.common.cache import LRUCache
+from src.logger import get_logger
+from src.services.job_search_service import JobSearchService
+from src.services.models import SearchResultSet
+from src.vector_store.models import JobVectorStore
+from src.vector_store.rerankers.interface import RerankOptions
+
+logger = get_logger(__name__)
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+class PaginatedJobSearchService:
+    """Cursor-based pagination on top of JobSearchService"""
+
+    def __init__(self, job_search_service: JobSearchService, result_sets: LRUCache[SearchResultSet]):
+        self.job_search_service = job_search_service
+        self.result_sets = result_sets
+
+    async def search_first_page(
+        self, query: str, filters: Optional[Dict[str, Any]], page_size: int, rerank: Optional[RerankOptions] = None
+    ) -> Tuple[List[JobVectorStore], Optional[str]]:
+        results = await self.job_search_service.search_relevant_jobs(query, filters, top_k=page_size, rerank=rerank)
+        result_set = SearchResultSet(
+            query=query,
+            filters=filters,
+            page_size=page_size,
+            rerank=rerank,
+            returned_job_ids=[result.job_id for result in results],
+        )
+        return results, self._next_cursor(result_set, results)
+
+    async def search_next_page(self, cursor: str) -> Tuple[List[JobVectorStore], Optional[str]]:
+        result_set = self.result_sets.get(cursor)
+        if result_set is None:
+            raise InvalidCursorError("Cursor is invalid or has expired")
+
+        if len(result_set.pending_results) < result_set.page_size:
+            result_set = await self._refill(result_set)
+        results = result_set.pending_results[: result_set.page_size]
+
+        next_result_set = result_set.model_copy(
+            update={
+                "returned_job_ids": result_set.returned_job_ids + [result.job_id for result in results],
+                "pending_results": result_set.pending_results[result_set.page_size :],
+            }
+        )
+        return results, self._next_cursor(next_result_set, results)
+
+    async def _refill(self, result_set: SearchResultSet) -> SearchResultSet:
+        """Ingest the next vendor page and append newly ranked jobs after the ones already found"""
+        vendor_page = result_set.vendor_page
+        vendor_exhausted = result_set.vendor_exhausted
+        if not vendor_exhausted:
+            try:
+                fetched = await self.job_search_service.ingest_vendor_page(
+                    result_set.query, result_set.filters, vendor_page + 1
+                )
+                vendor_page += 1
+                vendor_exhausted = fetched == 0
+                logger.info(f"Fetched vendor page {vendor_page} for cursor with {fetched} jobs")
+            except Exception as e:
+                # the page is served from what is already indexed; the same vendor page is retried next time
+                logger.error(f"Fetching vendor page {vendor_page + 1} for cursor failed: {str(e)}")
+
+        seen_job_ids = set(result_set.returned_job_ids)
+        seen_job_ids.update(result.job_id for result in result_set.pending_results)
+        candidates = await asyncio.to_thread(
+            self.job_search_service.semantic_search,
+            result_set.query,
+            result_set.filters,
+            len(seen_job_ids) + result_set.page_size,
+            result_set.rerank,
+        )
+        new_results = [candidate for candidate in candidates if candidate.job_id not in seen_job_ids]
+        return result_set.model_copy(
+            update={
+                "vendor_page": vendor_page,
+                "vendor_exhausted": vendor_exhausted,
+                "pending_results": result_set.pending_results + new_results,
+            }
+        )
+
+    def _next_cursor(self, result_set: SearchResultSet, results: List[JobVectorStore]) -> Optional[str]:
+        # a short page means neither the index nor the vendor had anything new to offer
+        if len(results) < result_set.page_size:
+            return None
+        cursor = secrets.token_urlsafe(16)
+        self.result_sets.set(cursor, result_set)
+        return cursor
@@ -0,0 +1,79 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.logger import get_logger
+from src.vector_store.models import JobVectorStore
+
+logger = get_logger(__name__)
+
+
+class SemanticQueryCache:
+    """Small vector index of recent query embeddings and their result sets"""
+
+    def __init__(self, max_entries: int = 256, max_distance: float = 0.05, ttl_seconds: Optional[float] = 600):
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, Tuple[Hashable, np.ndarray, List[JobVectorStore], float]]" = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _unit(vector: Sequence[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(array))
+        return array / norm if norm > 0 else array
+
+    def get(self, vector: Sequence[float], filters_key: Hashable) -> Optional[List[JobVectorStore]]:
+        query = self._unit(vector)
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                entry_id
+                for entry_id, (_, _, _, stored_at) in self._entries.items()
+                if self.ttl_seconds is not None and now - stored_at > self.ttl_seconds
+            ]
+            for entry_id in expired:
+                del self._entries[entry_id]
+
+            candidates = [
+                (entry_id, entry_vector)
+                for entry_id, (entry_filters, entry_vector, _, _) in self._entries.items()
+                if entry_filters == filters_key and entry_vector.shape == query.shape
+            ]
+            if candidates:
+                similarities = np.stack([entry_vector for _, entry_vector in candidates]) @ query
+                best = int(np.argmax(similarities))
+                distance = 1.0 - float(similarities[best])
+                if distance <= self.max_distance:
+                    entry_id = candidates[best][0]
+                    self._entries.move_to_end(entry_id)
+                    self.hits += 1
+                    logger.debug(f"Semantic query cache hit at cosine distance {distance:.4f}")
+                    return list(self._entries[entry_id][2])
+            self.misses += 1
+            return None
+
+    def set(self, vector: Sequence[float], filters_key: Hashable, results: List[JobVectorStore]) -> None:
+        with self._lock:
+            self._entries[self._next_id] = (filters_key, self._unit(vector), list(results), time.monotonic())
+            self._next_id += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "max_distance": self.max_distance,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,42 @@
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+from src.common.cache import LRUCache
+from src.common.normalization import normalize_query
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CachedQueryEmbeddings(Embeddings):
+    """Embeddings wrapper that caches query vectors by normalized query text"""
+
+    def __init__(self, embedding: Embeddings, cache: LRUCache[List[float]], cache_namespace: str = "default"):
+        self.embedding = embedding
+        self.cache = cache
+        self.cache_namespace = cache_namespace
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embedding.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        normalized_text = normalize_query(text)
+        cache_key = (self.cache_namespace, normalized_text)
+        vector = self.cache.get(cache_key)
+        if vector is not None:
+            return vector
+        vector = self.embedding.embed_query(normalized_text)
+        self.cache.set(cache_key, vector)
+        logger.debug(f"Query embedding cache: {self.cache.stats()}")
+        return vector
+
+    async def aembed_query(self, text: str) -> List[float]:
+        normalized_text = normalize_query(text)
+        cache_key = (self.cache_namespace, normalized_text)
+        vector = self.cache.get(cache_key)
+        if vector is not None:
+            return vector
+        vector = await self.embedding.aembed_query(normalized_text)
+        self.cache.set(cache_key, vector)
+        return vector
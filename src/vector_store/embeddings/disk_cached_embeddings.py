@@ -0,0 +1,43 @@
+from typing import Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+from src.common.hashing import content_hash
+from src.logger import get_logger
+from src.vector_store.embeddings.embedding_cache import EmbeddingCache
+
+logger = get_logger(__name__)
+
+
+class DiskCachedEmbeddings(Embeddings):
+    """Embeddings wrapper that looks document vectors up in an EmbeddingCache before computing them"""
+
+    def __init__(self, embedding: Embeddings, cache: EmbeddingCache, model: str):
+        self.embedding = embedding
+        self.cache = cache
+        self.model = model
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes = [content_hash(text) for text in texts]
+        vectors: List[Optional[List[float]]] = [
+            None if vector is None else vector.tolist() for vector in self.cache.get_many(self.model, hashes)
+        ]
+
+        # identical texts are embedded once
+        missing: Dict[str, int] = {}
+        for position, vector in enumerate(vectors):
+            if vector is None:
+                missing.setdefault(hashes[position], position)
+        if missing:
+            embedded = self.embedding.embed_documents([texts[position] for position in missing.values()])
+            self.cache.put_many(self.model, list(missing), embedded)
+            fresh = dict(zip(missing, embedded))
+            vectors = [fresh[hashes[position]] if vector is None else vector for position, vector in enumerate(vectors)]
+        logger.debug(f"Embedding cache: {len(texts) - len(missing)}/{len(texts)} documents cached")
+        return vectors  # type: ignore[return-value]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embedding.embed_query(text)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await self.embedding.aembed_query(text)
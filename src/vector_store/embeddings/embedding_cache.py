@@ -0,0 +1,157 @@
+import fcntl
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.common.hashing import content_hash
+
+KEY_BYTES = 16
+KEYS_FILE = "keys.bin"
+VECTORS_FILE = "vectors.bin"
+META_FILE = "meta.json"
+LOCK_FILE = "append.lock"
+
+
+class EmbeddingCache:
+    """Disk-backed, content-addressed cache of document embeddings"""
+
+    def __init__(self, path: str, dtype: str = "float32"):
+        if np.dtype(dtype) not in (np.dtype(np.float32), np.dtype(np.float16)):
+            raise ValueError("dtype must be float32 or float16")
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        os.makedirs(path, exist_ok=True)
+        self._partitions: Dict[str, _Partition] = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, namespace: str, hashes: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """The cached float32 vector of every content hash, None where there is none"""
+        return self._partition(namespace).get_many(hashes)
+
+    def put_many(self, namespace: str, hashes: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        self._partition(namespace).put_many(hashes, vectors)
+
+    def count(self, namespace: str) -> int:
+        return len(self._partition(namespace))
+
+    def _partition(self, namespace: str) -> "_Partition":
+        with self._lock:
+            partition = self._partitions.get(namespace)
+            if partition is None:
+                # model names may contain characters that are not safe in paths
+                path = os.path.join(self.path, content_hash(namespace))
+                partition = self._partitions[namespace] = _Partition(path, namespace, self.dtype)
+            return partition
+
+
+class _Partition:
+    """The files of one namespace of an EmbeddingCache"""
+
+    def __init__(self, path: str, namespace: str, dtype: np.dtype):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.namespace = namespace
+        self.dtype = dtype
+        self.dimension: Optional[int] = None
+        self._rows: Dict[bytes, int] = {}
+        self._keys_read = 0
+        self._vectors: Optional[np.memmap] = None
+        self._lock = threading.RLock()
+        self._read_meta()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._rows)
+
+    def get_many(self, hashes: Sequence[str]) -> List[Optional[np.ndarray]]:
+        with self._lock:
+            self._refresh()
+            rows = [self._rows.get(bytes.fromhex(content)) for content in hashes]
+            if all(row is None for row in rows):
+                return [None] * len(rows)
+            vectors = self._mapped_vectors()
+            return [None if row is None else np.array(vectors[row], dtype=np.float32) for row in rows]
+
+    def put_many(self, hashes: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        if not hashes:
+            return
+        array = np.asarray(vectors, dtype=np.float32)
+        with self._lock, open(os.path.join(self.path, LOCK_FILE), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            self._refresh()
+            if self.dimension is None:
+                self._write_meta(array.shape[1])
+            elif array.shape[1] != self.dimension:
+                raise ValueError(
+                    f"Embedding dimension {array.shape[1]} does not match cache dimension {self.dimension}"
+                )
+            new_rows: Dict[bytes, int] = {}
+            for position, content in enumerate(hashes):
+                key = bytes.fromhex(content)
+                if key not in self._rows:
+                    new_rows.setdefault(key, position)
+            if not new_rows:
+                return
+
+            first_row = self._keys_read // KEY_BYTES
+            row_bytes = self.dimension * self.dtype.itemsize  # type: ignore[operator]
+            with open(self._file(VECTORS_FILE), "ab") as vectors_file:
+                vectors_file.truncate(first_row * row_bytes)
+                vectors_file.write(array[list(new_rows.values())].astype(self.dtype).tobytes())
+            with open(self._file(KEYS_FILE), "ab") as keys_file:
+                # drops a torn record left by a crashed writer
+                keys_file.truncate(self._keys_read)
+                keys_file.write(b"".join(new_rows))
+            self._refresh()
+
+    def _refresh(self) -> None:
+        """Index the keys appended since the last refresh, by this or any other process"""
+        try:
+            size = os.path.getsize(self._file(KEYS_FILE))
+        except FileNotFoundError:
+            return
+        size -= size % KEY_BYTES
+        if size <= self._keys_read:
+            return
+        if self.dimension is None:
+            self._read_meta()
+        with open(self._file(KEYS_FILE), "rb") as keys_file:
+            keys_file.seek(self._keys_read)
+            data = keys_file.read(size - self._keys_read)
+        first_row = self._keys_read // KEY_BYTES
+        for offset in range(0, len(data), KEY_BYTES):
+            self._rows.setdefault(data[offset : offset + KEY_BYTES], first_row + offset // KEY_BYTES)
+        self._keys_read = size
+
+    def _mapped_vectors(self) -> np.memmap:
+        rows = self._keys_read // KEY_BYTES
+        if self._vectors is None or len(self._vectors) < rows:
+            self._vectors = np.memmap(
+                self._file(VECTORS_FILE), dtype=self.dtype, mode="r", shape=(rows, self.dimension)  # type: ignore
+            )
+        assert self._vectors is not None
+        return self._vectors
+
+    def _read_meta(self) -> None:
+        try:
+            with open(self._file(META_FILE)) as meta_file:
+                meta = json.load(meta_file)
+        except FileNotFoundError:
+            return
+        # the files decide the format, whatever the cache was opened with
+        self.dimension = meta["dimension"]
+        self.dtype = np.dtype(meta["dtype"])
+
+    def _write_meta(self, dimension: int) -> None:
+        temporary_path = self._file(f"{META_FILE}.tmp")
+        with open(temporary_path, "w") as meta_file:
+            json.dump({"namespace": self.namespace, "dimension": dimension, "dtype": self.dtype.name}, meta_file)
+        os.replace(temporary_path, self._file(META_FILE))
+        self.dimension = dimension
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
@@ -0,0 +1,179 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from langchain_core.embeddings import Embeddings
+
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+_STOP = object()
+
+
+class _EmbeddingRequest(NamedTuple):
+    texts: List[str]
+    is_query: bool
+    future: "Future[List[List[float]]]"
+
+
+class MicroBatchingEmbeddings(Embeddings):
+    """Embeddings wrapper that merges calls from concurrent callers into batched calls"""
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        max_batch_size: int = 64,
+        max_wait_seconds: float = 0.005,
+        queries_as_documents: bool = False,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.embedding = embedding
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        # only for models that embed queries and documents the same way (e.g. Ollama)
+        self.queries_as_documents = queries_as_documents
+        self._requests: "queue.Queue[Any]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self._last_flush_callers = 0
+        self.batches = 0
+        self.texts = 0
+        self.embedded_texts = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._submit(texts, is_query=False).result()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._submit([text], is_query=True).result()[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await asyncio.wrap_future(self._submit(texts, is_query=False))
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await asyncio.wrap_future(self._submit([text], is_query=True)))[0]
+
+    def close(self) -> None:
+        """Stop the worker once the pending requests are flushed"""
+        with self._worker_lock:
+            if self._worker is None:
+                return
+            self._requests.put(_STOP)
+            self._worker.join()
+            self._worker = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "texts": self.texts,
+            "embedded_texts": self.embedded_texts,
+            "texts_per_batch": self.texts / self.batches if self.batches else 0.0,
+        }
+
+    def _submit(self, texts: List[str], is_query: bool) -> "Future[List[List[float]]]":
+        future: "Future[List[List[float]]]" = Future()
+        if not texts:
+            future.set_result([])
+            return future
+        self._ensure_worker()
+        self._requests.put(_EmbeddingRequest(list(texts), is_query, future))
+        return future
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="embedding-micro-batcher", daemon=True)
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            request = self._requests.get()
+            if request is _STOP:
+                return
+            batch = [request]
+            stop = self._collect(batch)
+            try:
+                self._flush(batch)
+            except Exception as e:
+                # the worker must outlive any failure, or every later caller would wait forever
+                logger.error(f"Embedding micro-batch failed: {str(e)}")
+                for request in batch:
+                    self._resolve(request.future, exception=e)
+            if stop:
+                return
+
+    def _collect(self, batch: List[_EmbeddingRequest]) -> bool:
+        """Add pending requests to batch; returns True when a stop was requested"""
+        pending_texts = len(batch[0].texts)
+        linger = self._last_flush_callers > 1 and self.max_wait_seconds > 0
+        deadline = time.monotonic() + self.max_wait_seconds
+        while pending_texts < self.max_batch_size:
+            try:
+                if linger:
+                    request = self._requests.get(timeout=max(deadline - time.monotonic(), 0))
+                else:
+                    request = self._requests.get_nowait()
+            except queue.Empty:
+                break
+            if request is _STOP:
+                return True
+            batch.append(request)
+            pending_texts += len(request.texts)
+        return False
+
+    def _flush(self, batch: List[_EmbeddingRequest]) -> None:
+        self._last_flush_callers = len(batch)
+        for is_query in (False, True):
+            requests = [request for request in batch if request.is_query is is_query]
+            if requests:
+                self._embed(requests, is_query)
+
+    def _embed(self, requests: List[_EmbeddingRequest], is_query: bool) -> None:
+        unique_texts = list(dict.fromkeys(text for request in requests for text in request.texts))
+        try:
+            vectors = self._embed_texts(unique_texts, is_query)
+            if len(vectors) != len(unique_texts):
+                raise ValueError(f"Expected {len(unique_texts)} embeddings, got {len(vectors)}")
+            vectors_by_text = dict(zip(unique_texts, vectors))
+            results = [[vectors_by_text[text] for text in request.texts] for request in requests]
+        except Exception as e:
+            for request in requests:
+                self._resolve(request.future, exception=e)
+            return
+        self.batches += 1
+        self.texts += sum(len(request.texts) for request in requests)
+        self.embedded_texts += len(unique_texts)
+        logger.debug(f"Embedded {len(unique_texts)} unique texts for {len(requests)} callers")
+
+        for request, result in zip(requests, results):
+            self._resolve(request.future, result=result)
+
+    def _embed_texts(self, texts: List[str], is_query: bool) -> List[List[float]]:
+        if not is_query or self.queries_as_documents:
+            return self.embedding.embed_documents(texts)
+        # asymmetric models that can embed several queries at once, e.g. PineconeInferenceEmbeddings
+        embed_queries = getattr(self.embedding, "embed_queries", None)
+        if embed_queries is not None:
+            return list(embed_queries(texts))
+        return [self.embedding.embed_query(text) for text in texts]
+
+    @staticmethod
+    def _resolve(
+        future: "Future[List[List[float]]]",
+        result: Optional[List[List[float]]] = None,
+        exception: Optional[BaseException] = None,
+    ) -> None:
+        # a caller may have cancelled its future, e.g. an async caller that timed out
+        try:
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)  # type: ignore[arg-type]
+        except InvalidStateError:
+            pass
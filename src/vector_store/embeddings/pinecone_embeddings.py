@@ -0,0 +1,30 @@
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+from pinecone import Pinecone
+
+
+class PineconeInferenceEmbeddings(Embeddings):
+    """Embeddings backed by Pinecone's hosted inference API"""
+
+    def __init__(self, client: Pinecone, model: str):
+        self.client = client
+        self.model = model
+
+    def _embed(self, texts: List[str], input_type: str) -> List[List[float]]:
+        embeddings = self.client.inference.embed(
+            model=self.model,
+            inputs=texts,
+            parameters={"input_type": input_type, "truncate": "END"},
+        )
+        return [list(embedding["values"]) for embedding in embeddings]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._embed(texts, input_type="passage")
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed([text], input_type="query")[0]
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Several queries in one request, as MicroBatchingEmbeddings batches them"""
+        return self._embed(texts, input_type="query")
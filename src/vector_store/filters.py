@@ -0,0 +1,55 @@
+from typing import Any, Dict, FrozenSet, Mapping, Optional, Tuple
+
+from src.common.normalization import normalize_query
+
+# search filter keys and the job fields they restrict; job field names are accepted as keys too
+FILTER_FIELDS: Dict[str, str] = {
+    "country": "job_country",
+    "state": "job_state",
+    "city": "job_city",
+    "employer": "employer_name",
+}
+FILTERABLE_FIELDS: Tuple[str, ...] = tuple(FILTER_FIELDS.values())
+
+# job field -> accepted normalised values; a job matches when every field holds one of its values
+MetadataFilter = Dict[str, FrozenSet[str]]
+
+
+def filter_value(value: Any) -> Optional[str]:
+    """Normalised form of a field value, so that filters match regardless of case and spacing"""
+    if value is None:
+        return None
+    value = normalize_query(str(value))
+    return value or None
+
+
+def to_metadata_filter(filters: Optional[Dict[str, Any]] = None) -> MetadataFilter:
+    """
+    Structured filter for the filterable keys in filters. Values may be a string or a list of
+    alternatives. Other keys, such as the vendor's page, do not restrict stored jobs and are ignored.
+    """
+    metadata_filter: MetadataFilter = {}
+    for key, value in (filters or {}).items():
+        field = FILTER_FIELDS.get(key.casefold(), key.casefold())
+        if field not in FILTERABLE_FIELDS or value is None:
+            continue
+        values = value if isinstance(value, (list, tuple, set, frozenset)) else [value]
+        normalized = frozenset(v for v in (filter_value(v) for v in values) if v is not None)
+        if normalized:
+            metadata_filter[field] = metadata_filter.get(field, normalized) & normalized
+    return metadata_filter
+
+
+def filter_key(metadata_filter: MetadataFilter) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    """Hashable, order-independent form of a metadata filter, for cache keys"""
+    return tuple(sorted((field, tuple(sorted(values))) for field, values in metadata_filter.items()))
+
+
+def matches(fields: Mapping[str, Any], metadata_filter: MetadataFilter) -> bool:
+    """Whether a job, given as a mapping of its fields, passes the filter"""
+    return all(filter_value(fields.get(field)) in values for field, values in metadata_filter.items())
+
+
+def describe(metadata_filter: MetadataFilter) -> str:
+    """Short text form of a filter for logs"""
+    return ", ".join(f"{field} in {sorted(values)}" for field, values in sorted(metadata_filter.items()))
@@ -0,0 +1,12 @@
+from typing import Dict, Hashable, List, Sequence, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[K]], k: int = 60) -> List[Tuple[K, float]]:
+    """Fuse rankings of ids, scoring each id sum(1 / (k + rank)) over the rankings it appears in"""
+    scores: Dict[K, float] = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, start=1):
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: -item[1])
@@ -0,0 +1,96 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Optional, Tuple, Union
+
+import numpy as np
+
+VectorSource = Union[np.ndarray, str]
+
+
+def _npy_reader(path: str) -> Tuple[int, int, Callable[[int, int], np.ndarray]]:
+    """Rows, dimension and a block reader for a 2-d .npy file, reading blocks with plain file reads"""
+    with open(path, "rb") as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        header_size = f.tell()
+    if len(shape) != 2 or fortran_order:
+        raise ValueError(f"{path} must hold a C-ordered 2-d array")
+    rows, dimension = shape
+    row_bytes = dimension * dtype.itemsize
+
+    def read(start: int, end: int) -> np.ndarray:
+        block = np.fromfile(path, dtype=dtype, count=(end - start) * dimension, offset=header_size + start * row_bytes)
+        return block.reshape(end - start, dimension)
+
+    return rows, dimension, read
+
+
+def _merge_top_k(
+    best_scores: np.ndarray, best_rows: np.ndarray, scores: np.ndarray, rows: np.ndarray, top_k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    scores = np.concatenate([best_scores, scores], axis=1)
+    rows = np.concatenate([best_rows, rows], axis=1)
+    if scores.shape[1] <= top_k:
+        return scores, rows
+    keep = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+    return np.take_along_axis(scores, keep, axis=1), np.take_along_axis(rows, keep, axis=1)
+
+
+def blocked_search(
+    source: VectorSource,
+    queries: np.ndarray,
+    top_k: int,
+    block_size: int = 65536,
+    threads: int = 1,
+    deleted: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Exact inner-product (scores, rows) top_k per query, scanning source in blocks of block_size rows"""
+    if block_size < 1 or threads < 1:
+        raise ValueError("block_size and threads must be at least 1")
+    queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+    if isinstance(source, str):
+        total_rows, _, read_block = _npy_reader(source)
+    else:
+        total_rows = len(source)
+
+        def read_block(start: int, end: int) -> np.ndarray:
+            return np.asarray(source[start:end])
+
+    best_scores = np.empty((len(queries), 0), dtype=np.float32)
+    best_rows = np.empty((len(queries), 0), dtype=np.int64)
+    if top_k < 1 or total_rows == 0:
+        return best_scores, best_rows
+
+    def score_block(start: int) -> Tuple[np.ndarray, np.ndarray]:
+        end = min(start + block_size, total_rows)
+        scores = (read_block(start, end) @ queries.T).T.astype(np.float32, copy=False)
+        if deleted is not None:
+            scores[:, np.asarray(deleted[start:end], dtype=bool)] = -np.inf
+        if top_k < end - start:
+            local = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+        else:
+            local = np.broadcast_to(np.arange(end - start), scores.shape)
+        return np.take_along_axis(scores, local, axis=1), local + start
+
+    starts = range(0, total_rows, block_size)
+    if threads == 1:
+        for start in starts:
+            block_scores, block_rows = score_block(start)
+            best_scores, best_rows = _merge_top_k(best_scores, best_rows, block_scores, block_rows, top_k)
+    else:
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="blocked-search") as executor:
+            pending: "Deque[Future[Tuple[np.ndarray, np.ndarray]]]" = deque()
+            for start in starts:
+                pending.append(executor.submit(score_block, start))
+                # the oldest block is merged before more are read, bounding memory to threads blocks
+                while len(pending) > threads or (start + block_size >= total_rows and pending):
+                    block_scores, block_rows = pending.popleft().result()
+                    best_scores, best_rows = _merge_top_k(best_scores, best_rows, block_scores, block_rows, top_k)
+
+    order = np.argsort(-best_scores, axis=1, kind="stable")
+    best_scores = np.take_along_axis(best_scores, order, axis=1)
+    best_rows = np.take_along_axis(best_rows, order, axis=1)
+    return best_scores, best_rows
@@ -0,0 +1,83 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[\w+#]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens; + and # are kept so that terms like C++ and C# survive"""
+    return TOKEN_PATTERN.findall(text.casefold())
+
+
+class BM25Index:
+    """Okapi BM25 over documents identified by integer rows, maintained incrementally"""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._lengths: Dict[int, int] = {}
+        self._terms: Dict[int, List[str]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, row: int, text: str) -> None:
+        self.remove(row)
+        tokens = tokenize(text)
+        counts = Counter(tokens)
+        for term, count in counts.items():
+            self._postings.setdefault(term, {})[row] = count
+        self._terms[row] = list(counts)
+        self._lengths[row] = len(tokens)
+        self._total_length += len(tokens)
+
+    def remove(self, row: int) -> None:
+        terms = self._terms.pop(row, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings[term]
+            del postings[row]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(row)
+
+    def search(self, query: str, top_k: int, allowed: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """
+        Up to top_k (row, score) pairs with a positive score, best first. allowed is an optional
+        boolean mask over rows; rows outside it are never returned.
+        """
+        terms = [term for term in dict.fromkeys(tokenize(query)) if term in self._postings]
+        if top_k < 1 or not terms:
+            return []
+        document_count = len(self._lengths)
+        average_length = self._total_length / document_count
+        rows_by_term = []
+        for term in terms:
+            postings = self._postings[term]
+            rows = np.fromiter(postings.keys(), dtype=np.int64, count=len(postings))
+            frequencies = np.fromiter(postings.values(), dtype=np.float64, count=len(postings))
+            lengths = np.fromiter((self._lengths[row] for row in postings), dtype=np.float64, count=len(postings))
+            idf = math.log(1 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * lengths / average_length)
+            rows_by_term.append((rows, idf * frequencies * (self.k1 + 1) / (frequencies + norm)))
+
+        rows = np.concatenate([rows for rows, _ in rows_by_term])
+        unique_rows, positions = np.unique(rows, return_inverse=True)
+        scores = np.bincount(positions, weights=np.concatenate([scores for _, scores in rows_by_term]))
+        if allowed is not None:
+            keep = unique_rows < len(allowed)
+            keep[keep] = allowed[unique_rows[keep]]
+            unique_rows, scores = unique_rows[keep], scores[keep]
+        if len(scores) == 0:
+            return []
+        top_k = min(top_k, len(scores))
+        top = np.argpartition(-scores, top_k - 1)[:top_k] if top_k < len(scores) else np.arange(len(scores))
+        top = top[np.lexsort((unique_rows[top], -scores[top]))]
+        return [(int(unique_rows[position]), float(scores[position])) for position in top]
@@ -0,0 +1,233 @@
+import heapq
+import json
+import math
+import os
+import random
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class HNSWIndex:
+    """Hierarchical Navigable Small World graph for approximate cosine-similarity search"""
+
+    def __init__(
+        self,
+        dimension: int,
+        m: int = 16,
+        ef_construction: int = 200,
+        ef_search: int = 50,
+        seed: Optional[int] = None,
+    ):
+        if m < 2:
+            raise ValueError("m must be at least 2")
+        if ef_construction < 1 or ef_search < 1:
+            raise ValueError("ef_construction and ef_search must be at least 1")
+        self.dimension = dimension
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self._level_multiplier = 1 / math.log(m)
+        self._random = random.Random(seed)
+        self._vectors = np.empty((1024, dimension), dtype=np.float32)
+        self._size = 0
+        # _neighbors[node][level] is the adjacency list of node on that level
+        self._neighbors: List[List[List[int]]] = []
+        self._deleted: List[bool] = []
+        self._deleted_count = 0
+        self._entry_point: Optional[int] = None
+        self._max_level = -1
+
+    def __len__(self) -> int:
+        """Number of live (not deleted) nodes"""
+        return self._size - self._deleted_count
+
+    def add(self, vector: np.ndarray) -> int:
+        node = self._append(vector)
+        level = int(-math.log(1.0 - self._random.random()) * self._level_multiplier)
+        self._neighbors.append([[] for _ in range(level + 1)])
+        self._deleted.append(False)
+
+        if self._entry_point is None:
+            self._entry_point, self._max_level = node, level
+            return node
+
+        query = self._vectors[node]
+        entry_point = self._entry_point
+        for layer in range(self._max_level, level, -1):
+            entry_point = self._search_layer(query, [entry_point], 1, layer)[0][1]
+
+        entry_points = [entry_point]
+        for layer in range(min(level, self._max_level), -1, -1):
+            candidates = self._search_layer(query, entry_points, self.ef_construction, layer)
+            neighbors = self._select_neighbors(candidates, self.m)
+            self._neighbors[node][layer] = neighbors
+            for neighbor in neighbors:
+                self._link(neighbor, node, layer)
+            entry_points = [candidate for _, candidate in candidates]
+
+        if level > self._max_level:
+            self._entry_point, self._max_level = node, level
+        return node
+
+    def mark_deleted(self, node: int) -> None:
+        if not self._deleted[node]:
+            self._deleted[node] = True
+            self._deleted_count += 1
+
+    def is_deleted(self, node: int) -> bool:
+        return self._deleted[node]
+
+    def search(
+        self, query: np.ndarray, k: int, ef_search: Optional[int] = None, allowed: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float]]:
+        """Up to k (node, cosine similarity) pairs, best first, among the nodes allowed by the mask"""
+        if self._entry_point is None or k < 1 or len(self) == 0:
+            return []
+        query = self._normalize(np.asarray(query, dtype=np.float32))
+        entry_point = self._entry_point
+        for layer in range(self._max_level, 0, -1):
+            entry_point = self._search_layer(query, [entry_point], 1, layer)[0][1]
+
+        ef = max(ef_search or self.ef_search, k)
+        while True:
+            candidates = self._search_layer(query, [entry_point], ef, 0, allowed)
+            results = [(node, 1.0 - distance) for distance, node in candidates if not self._deleted[node]]
+            # deleted nodes can crowd live ones out of the beam; widen it until k live nodes are found
+            if len(results) >= k or ef >= self._size:
+                return results[:k]
+            ef = min(ef * 2, self._size)
+
+    def exact_search(self, query: np.ndarray, nodes: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        """Return up to k (node, cosine similarity) pairs among nodes, most similar first, scoring every one"""
+        if k < 1 or len(nodes) == 0:
+            return []
+        query = self._normalize(np.asarray(query, dtype=np.float32))
+        similarities = self._vectors[nodes] @ query
+        top = np.argpartition(-similarities, k - 1)[:k] if k < len(nodes) else np.arange(len(nodes))
+        top = top[np.argsort(-similarities[top], kind="stable")]
+        return [(int(nodes[position]), float(similarities[position])) for position in top]
+
+    def save(self, path: str) -> None:
+        """Write the index into directory path"""
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "vectors.npy"), self._vectors[: self._size])
+        state = {
+            "dimension": self.dimension,
+            "m": self.m,
+            "ef_construction": self.ef_construction,
+            "ef_search": self.ef_search,
+            "entry_point": self._entry_point,
+            "max_level": self._max_level,
+            "deleted": [node for node, deleted in enumerate(self._deleted) if deleted],
+            "neighbors": self._neighbors,
+        }
+        with open(os.path.join(path, "graph.json"), "w") as f:
+            json.dump(state, f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: str) -> "HNSWIndex":
+        with open(os.path.join(path, "graph.json")) as f:
+            state: Dict[str, Any] = json.load(f)
+        index = cls(
+            dimension=state["dimension"],
+            m=state["m"],
+            ef_construction=state["ef_construction"],
+            ef_search=state["ef_search"],
+        )
+        vectors = np.load(os.path.join(path, "vectors.npy"))
+        index._vectors = np.empty((max(len(vectors), 1024), index.dimension), dtype=np.float32)
+        index._vectors[: len(vectors)] = vectors
+        index._size = len(vectors)
+        index._neighbors = state["neighbors"]
+        index._deleted = [False] * index._size
+        for node in state["deleted"]:
+            index.mark_deleted(node)
+        index._entry_point = state["entry_point"]
+        index._max_level = state["max_level"]
+        return index
+
+    def _append(self, vector: np.ndarray) -> int:
+        vector = np.asarray(vector, dtype=np.float32)
+        if vector.shape != (self.dimension,):
+            raise ValueError(f"Expected a vector of dimension {self.dimension}, got shape {vector.shape}")
+        if self._size == len(self._vectors):
+            vectors = np.empty((len(self._vectors) * 2, self.dimension), dtype=np.float32)
+            vectors[: self._size] = self._vectors[: self._size]
+            self._vectors = vectors
+        self._vectors[self._size] = self._normalize(vector)
+        self._size += 1
+        return self._size - 1
+
+    def _search_layer(
+        self,
+        query: np.ndarray,
+        entry_points: List[int],
+        ef: int,
+        layer: int,
+        allowed: Optional[np.ndarray] = None,
+    ) -> List[Tuple[float, int]]:
+        """Beam search on one layer; returns up to ef allowed (distance, node) pairs, closest first"""
+        distances = 1.0 - self._vectors[entry_points] @ query
+        visited = set(entry_points)
+        candidates = [(float(distance), node) for distance, node in zip(distances, entry_points)]
+        heapq.heapify(candidates)
+        # max-heap of the best ef nodes so far, stored with negated distances
+        best = [(-distance, node) for distance, node in candidates if allowed is None or allowed[node]]
+        heapq.heapify(best)
+        while len(best) > ef:
+            heapq.heappop(best)
+
+        while candidates:
+            distance, node = heapq.heappop(candidates)
+            if len(best) >= ef and distance > -best[0][0]:
+                break
+            unvisited = [neighbor for neighbor in self._neighbors[node][layer] if neighbor not in visited]
+            if not unvisited:
+                continue
+            visited.update(unvisited)
+            neighbor_distances = 1.0 - self._vectors[unvisited] @ query
+            for neighbor, neighbor_distance in zip(unvisited, neighbor_distances.tolist()):
+                if len(best) < ef or neighbor_distance < -best[0][0]:
+                    heapq.heappush(candidates, (neighbor_distance, neighbor))
+                    if allowed is None or allowed[neighbor]:
+                        heapq.heappush(best, (-neighbor_distance, neighbor))
+                        if len(best) > ef:
+                            heapq.heappop(best)
+
+        return sorted((-negated_distance, node) for negated_distance, node in best)
+
+    def _select_neighbors(self, candidates: List[Tuple[float, int]], max_neighbors: int) -> List[int]:
+        """Pick neighbours with the HNSW heuristic, so edges spread out in different directions"""
+        if len(candidates) <= max_neighbors:
+            return [candidate for _, candidate in candidates]
+        nodes = [candidate for _, candidate in candidates]
+        vectors = self._vectors[nodes]
+        similarities = vectors @ vectors.T
+        # closest[j] is the highest similarity between candidate j and any selected neighbour
+        closest = np.full(len(nodes), -np.inf, dtype=np.float32)
+        selected: List[int] = []
+        skipped: List[int] = []
+        for position, (distance, candidate) in enumerate(candidates):
+            if len(selected) >= max_neighbors:
+                break
+            if closest[position] > 1.0 - distance:
+                skipped.append(candidate)
+            else:
+                selected.append(candidate)
+                np.maximum(closest, similarities[position], out=closest)
+        return selected + skipped[: max_neighbors - len(selected)]
+
+    def _link(self, node: int, new_neighbor: int, layer: int) -> None:
+        neighbors = self._neighbors[node][layer]
+        neighbors.append(new_neighbor)
+        max_neighbors = self.m * 2 if layer == 0 else self.m
+        if len(neighbors) > max_neighbors:
+            distances = 1.0 - self._vectors[neighbors] @ self._vectors[node]
+            candidates = sorted(zip(distances.tolist(), neighbors))
+            self._neighbors[node][layer] = self._select_neighbors(candidates, max_neighbors)
+
+    @staticmethod
+    def _normalize(vector: np.ndarray) -> np.ndarray:
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
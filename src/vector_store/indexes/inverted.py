@@ -0,0 +1,75 @@
+from typing import Any, Dict, Iterable, Mapping, Set, Tuple
+
+import numpy as np
+
+from src.vector_store.filters import FILTERABLE_FIELDS, MetadataFilter, filter_value
+
+
+class InvertedIndex:
+    """Postings of row ids for every (field, normalised value) pair of the filterable job fields"""
+
+    def __init__(self, fields: Iterable[str] = FILTERABLE_FIELDS):
+        self.fields: Tuple[str, ...] = tuple(fields)
+        self._postings: Dict[str, Dict[str, Set[int]]] = {field: {} for field in self.fields}
+
+    def add(self, row: int, fields: Mapping[str, Any]) -> None:
+        for field in self.fields:
+            value = filter_value(fields.get(field))
+            if value is not None:
+                self._postings[field].setdefault(value, set()).add(row)
+
+    def remove(self, row: int, fields: Mapping[str, Any]) -> None:
+        for field in self.fields:
+            value = filter_value(fields.get(field))
+            if value is None:
+                continue
+            postings = self._postings[field].get(value)
+            if postings is not None:
+                postings.discard(row)
+                if not postings:
+                    del self._postings[field][value]
+
+    def count(self, field: str, value: str) -> int:
+        return len(self._postings.get(field, {}).get(value, ()))
+
+    def estimate(self, metadata_filter: MetadataFilter, total: int) -> float:
+        """
+        Estimated number of rows out of total passing the filter, from posting sizes alone.
+        Exact for a single field; several fields are assumed independent.
+        """
+        if total <= 0:
+            return 0.0
+        estimate = float(total)
+        for field, values in metadata_filter.items():
+            postings = self._postings.get(field, {})
+            estimate *= min(sum(len(postings.get(value, ())) for value in values), total) / total
+        return estimate
+
+    def rows(self, metadata_filter: MetadataFilter) -> np.ndarray:
+        """Sorted rows passing the filter; fields this index does not cover match nothing"""
+        unions = []
+        for field, values in metadata_filter.items():
+            postings = self._postings.get(field, {})
+            matching = [postings[value] for value in values if value in postings]
+            if not matching:
+                return np.empty(0, dtype=np.int64)
+            unions.append(matching[0] if len(matching) == 1 else set().union(*matching))
+        if not unions:
+            raise ValueError("rows needs a non-empty filter")
+        unions.sort(key=len)
+        rows = unions[0].intersection(*unions[1:]) if len(unions) > 1 else unions[0]
+        return np.sort(np.fromiter(rows, dtype=np.int64, count=len(rows)))
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            field: {value: sorted(rows) for value, rows in postings.items()}
+            for field, postings in self._postings.items()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Dict[str, Any]]) -> "InvertedIndex":
+        index = cls(data.keys())
+        index._postings = {
+            field: {value: set(rows) for value, rows in postings.items()} for field, postings in data.items()
+        }
+        return index
@@ -0,0 +1,71 @@
+import math
+from enum import Enum
+from typing import List, NamedTuple
+
+
+class SearchStrategy(Enum):
+    # score every row passing the filter, found through the inverted index
+    EXACT = "exact"
+    # walk the graph without the filter, over-fetching so enough hits survive post-filtering
+    ANN = "ann"
+    # walk the graph with the filter as an allow-list, so only matching nodes fill the beam
+    HYBRID = "hybrid"
+
+
+class QueryPlan(NamedTuple):
+    strategy: SearchStrategy
+    estimated_matches: float
+    cost: float
+    # beam width for graph strategies, or results requested from the graph before post-filtering
+    ef: int
+
+    def describe(self) -> str:
+        return (
+            f"{self.strategy.value} (estimated matches {self.estimated_matches:.0f}, "
+            f"cost {self.cost:.0f}, ef {self.ef})"
+        )
+
+
+class QueryPlanner:
+    """Picks the cheapest way to run a filtered search over a graph index, per query"""
+
+    def __init__(
+        self,
+        exact_row_cost: float = 1.0,
+        mask_cost: float = 0.5,
+        visit_cost: float = 1.0,
+        over_fetch: float = 2.0,
+    ):
+        if over_fetch < 1:
+            raise ValueError("over_fetch must be at least 1")
+        self.exact_row_cost = exact_row_cost
+        self.mask_cost = mask_cost
+        self.visit_cost = visit_cost
+        self.over_fetch = over_fetch
+
+    def plan(self, estimated_matches: float, total: int, top_k: int, ef_search: int, m: int) -> QueryPlan:
+        return min(self.plans(estimated_matches, total, top_k, ef_search, m), key=lambda plan: plan.cost)
+
+    def plans(self, estimated_matches: float, total: int, top_k: int, ef_search: int, m: int) -> List[QueryPlan]:
+        """Every candidate plan with its estimated cost"""
+        if total <= 0 or estimated_matches <= 0:
+            return [QueryPlan(SearchStrategy.EXACT, max(estimated_matches, 0.0), 0.0, 0)]
+        matches = min(estimated_matches, float(total))
+        selectivity = matches / total
+        ef = max(ef_search, top_k)
+
+        # costs are in units of scoring one row exactly; the default unit costs were fitted with
+        # benchmarks/planner_benchmark.py. An unfiltered walk widens its beam by 1 / selectivity,
+        # an allow-list walk keeps the beam but walks about 1 / selectivity times further.
+        ann_ef = min(total, math.ceil(ef * self.over_fetch / selectivity))
+        hybrid_visits = min(float(total), ef / selectivity * m)
+        return [
+            QueryPlan(SearchStrategy.EXACT, matches, matches * self.exact_row_cost, 0),
+            QueryPlan(SearchStrategy.ANN, matches, self._walk_cost(min(float(total), ann_ef * m), ann_ef), ann_ef),
+            QueryPlan(
+                SearchStrategy.HYBRID, matches, matches * self.mask_cost + self._walk_cost(hybrid_visits, ef), ef
+            ),
+        ]
+
+    def _walk_cost(self, visits: float, beam: int) -> float:
+        return visits * self.visit_cost * math.log2(beam + 1)
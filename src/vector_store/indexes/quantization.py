@@ -0,0 +1,142 @@
+from abc import ABC, abstractmethod
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+# rows decoded at a time while scoring, so temporaries stay small however large the store is
+SCORE_BLOCK_SIZE = 8192
+
+
+def _blocks(size: int, block_size: int = SCORE_BLOCK_SIZE) -> Iterator[Tuple[int, int]]:
+    for start in range(0, size, block_size):
+        yield start, min(start + block_size, size)
+
+
+class Quantizer(ABC):
+    """Compresses float32 vectors into uint8 codes and scores queries against the codes"""
+
+    dimension: int
+
+    @abstractmethod
+    def fit(self, vectors: np.ndarray) -> None:
+        pass
+
+    @abstractmethod
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        pass
+
+    @abstractmethod
+    def scores(self, codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """Approximate inner products between query and every encoded vector"""
+        pass
+
+    @property
+    @abstractmethod
+    def bytes_per_vector(self) -> int:
+        pass
+
+
+class ScalarQuantizer(Quantizer):
+    """8-bit scalar quantization of each dimension over its [min, max] range"""
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+        self.minimum = np.zeros(dimension, dtype=np.float32)
+        self.scale = np.ones(dimension, dtype=np.float32)
+
+    def fit(self, vectors: np.ndarray) -> None:
+        self.minimum = vectors.min(axis=0).astype(np.float32)
+        scale = (vectors.max(axis=0) - self.minimum) / 255
+        self.scale = np.where(scale > 0, scale, 1).astype(np.float32)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        codes = np.empty((len(vectors), self.dimension), dtype=np.uint8)
+        for start, end in _blocks(len(vectors)):
+            # values outside the fitted range are clipped until the next fit
+            codes[start:end] = np.clip(np.rint((vectors[start:end] - self.minimum) / self.scale), 0, 255)
+        return codes
+
+    def scores(self, codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+        scaled_query = query * self.scale
+        offset = float(query @ self.minimum)
+        scores = np.empty(len(codes), dtype=np.float32)
+        decoded = np.empty((min(len(codes), SCORE_BLOCK_SIZE), self.dimension), dtype=np.float32)
+        for start, end in _blocks(len(codes)):
+            block = decoded[: end - start]
+            np.copyto(block, codes[start:end], casting="unsafe")
+            scores[start:end] = block @ scaled_query + offset
+        return scores
+
+    @property
+    def bytes_per_vector(self) -> int:
+        return self.dimension
+
+
+class ProductQuantizer(Quantizer):
+    """Product quantization: one byte per subspace, the id of its nearest k-means centroid"""
+
+    def __init__(self, dimension: int, subspaces: int = 64, iterations: int = 20, seed: Optional[int] = None):
+        if dimension % subspaces:
+            raise ValueError(f"dimension {dimension} is not divisible by subspaces {subspaces}")
+        self.dimension = dimension
+        self.subspaces = subspaces
+        self.subspace_dimension = dimension // subspaces
+        self.iterations = iterations
+        self._rng = np.random.default_rng(seed)
+        # centroids[s] holds the centroids of subspace s, shape (centroids, subspace_dimension)
+        self.centroids = np.zeros((subspaces, 1, self.subspace_dimension), dtype=np.float32)
+
+    def fit(self, vectors: np.ndarray) -> None:
+        sub_vectors = self._split(vectors)
+        centroids = min(256, len(vectors))
+        self.centroids = np.stack([self._kmeans(sub_vectors[:, s], centroids) for s in range(self.subspaces)])
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        codes = np.empty((len(vectors), self.subspaces), dtype=np.uint8)
+        for start, end in _blocks(len(vectors)):
+            sub_vectors = self._split(vectors[start:end])
+            for s in range(self.subspaces):
+                codes[start:end, s] = self._nearest(np.ascontiguousarray(sub_vectors[:, s]), self.centroids[s])
+        return codes
+
+    def scores(self, codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+        # lookup[s, c] is the inner product of the query's subspace s with centroid c
+        lookup = np.einsum("sd,scd->sc", self._split(query[np.newaxis])[0], self.centroids)
+        subspaces = np.arange(self.subspaces)
+        scores = np.empty(len(codes), dtype=np.float32)
+        for start, end in _blocks(len(codes)):
+            scores[start:end] = lookup[subspaces, codes[start:end]].sum(axis=1)
+        return scores
+
+    @property
+    def bytes_per_vector(self) -> int:
+        return self.subspaces
+
+    def _split(self, vectors: np.ndarray) -> np.ndarray:
+        return vectors.reshape(len(vectors), self.subspaces, self.subspace_dimension)
+
+    def _kmeans(self, points: np.ndarray, centroids: int) -> np.ndarray:
+        points = np.ascontiguousarray(points, dtype=np.float32)
+        means = points[self._rng.choice(len(points), centroids, replace=False)].astype(np.float32)
+        for _ in range(self.iterations):
+            assignments = self._nearest(points, means)
+            counts = np.bincount(assignments, minlength=centroids)
+            sums = np.stack(
+                [np.bincount(assignments, weights=points[:, d], minlength=centroids) for d in range(points.shape[1])],
+                axis=1,
+            )
+            empty = counts == 0
+            means = np.where(empty[:, np.newaxis], means, sums / np.maximum(counts, 1)[:, np.newaxis]).astype(
+                np.float32
+            )
+            if empty.any():
+                # restart empty clusters from random points
+                means[empty] = points[self._rng.choice(len(points), int(empty.sum()))]
+        return means.astype(np.float32)
+
+    @staticmethod
+    def _nearest(points: np.ndarray, means: np.ndarray) -> np.ndarray:
+        # argmin of squared distance; the |point|^2 term is the same for every centroid
+        distances = (means**2).sum(axis=1) - 2 * points @ means.T
+        nearest: np.ndarray = np.argmin(distances, axis=1)
+        return nearest
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.vector_store.filters import MetadataFilter
+from src.vector_store.indexes.blocked_search import blocked_search
+from src.vector_store.indexes.inverted import InvertedIndex
+from src.vector_store.models import JobVectorStore
+
+MANIFEST = "manifest.json"
+# every file a store writes besides the manifest: segment files, tombstones and a torn manifest update
+STORE_FILE = re.compile(
+    r"segment-\d+\.(vectors\.npy|offsets\.npy|jobs|id_hashes\.npy|id_rows\.npy|postings\.json|deleted\.\d+\.npy)"
+    r"|\.manifest\.json\.tmp"
+)
+
+
+def id_hash(job_id: str) -> int:
+    return int.from_bytes(hashlib.blake2b(job_id.encode(), digest_size=8).digest(), "little")
+
+
+def read_manifest(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(os.path.join(path, MANIFEST)) as f:
+            manifest: Dict[str, Any] = json.load(f)
+            return manifest
+    except FileNotFoundError:
+        return None
+
+
+def publish_manifest(path: str, manifest: Dict[str, Any]) -> None:
+    """Replace the manifest atomically: readers see either the old or the new one, never a partial file"""
+    temporary_path = os.path.join(path, f".{MANIFEST}.tmp")
+    with open(temporary_path, "w") as f:
+        json.dump(manifest, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary_path, os.path.join(path, MANIFEST))
+    directory = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(directory)
+    finally:
+        os.close(directory)
+
+
+def segment_files(name: str) -> List[str]:
+    return [
+        f"{name}.vectors.npy",
+        f"{name}.offsets.npy",
+        f"{name}.jobs",
+        f"{name}.id_hashes.npy",
+        f"{name}.id_rows.npy",
+        f"{name}.postings.json",
+    ]
+
+
+def _save(path: str, array: np.ndarray) -> None:
+    with open(path, "wb") as f:
+        np.save(f, array)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def write_segment(path: str, name: str, jobs: Sequence[JobVectorStore], vectors: np.ndarray) -> None:
+    """Write an immutable segment, fsynced before any manifest can refer to it"""
+    encoded_jobs = [job.model_dump_json(exclude={"score"}).encode() for job in jobs]
+    offsets = np.zeros(len(jobs) + 1, dtype=np.int64)
+    np.cumsum([len(encoded) for encoded in encoded_jobs], out=offsets[1:])
+    hashes = np.array([id_hash(job.job_id) for job in jobs], dtype=np.uint64)
+    order = np.argsort(hashes, kind="stable")
+
+    _save(os.path.join(path, f"{name}.vectors.npy"), vectors.astype(np.float32))
+    _save(os.path.join(path, f"{name}.offsets.npy"), offsets)
+    _save(os.path.join(path, f"{name}.id_hashes.npy"), hashes[order])
+    _save(os.path.join(path, f"{name}.id_rows.npy"), order.astype(np.int64))
+    with open(os.path.join(path, f"{name}.jobs"), "wb") as f:
+        f.write(b"".join(encoded_jobs))
+        f.flush()
+        os.fsync(f.fileno())
+    inverted_index = InvertedIndex()
+    for row, job in enumerate(jobs):
+        inverted_index.add(row, job.get_metadata())
+    with open(os.path.join(path, f"{name}.postings.json"), "w") as f:
+        json.dump(inverted_index.to_dict(), f)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def write_deleted(path: str, name: str, version: int, deleted: np.ndarray) -> str:
+    filename = f"{name}.deleted.{version}.npy"
+    _save(os.path.join(path, filename), deleted)
+    return filename
+
+
+class Segment:
+    """
+    Read-only view of one segment. Every file is memory-mapped, so opening a segment costs the
+    same whatever its size, and processes mapping the same segment share its pages.
+    """
+
+    def __init__(self, path: str, name: str, deleted_file: Optional[str] = None):
+        self.path = path
+        self.name = name
+        self.deleted_file = deleted_file
+        self.vectors: np.ndarray = np.load(os.path.join(path, f"{name}.vectors.npy"), mmap_mode="r")
+        self.offsets: np.ndarray = np.load(os.path.join(path, f"{name}.offsets.npy"), mmap_mode="r")
+        self.id_hashes: np.ndarray = np.load(os.path.join(path, f"{name}.id_hashes.npy"), mmap_mode="r")
+        self.id_rows: np.ndarray = np.load(os.path.join(path, f"{name}.id_rows.npy"), mmap_mode="r")
+        jobs_path = os.path.join(path, f"{name}.jobs")
+        self.jobs: np.ndarray = (
+            np.memmap(jobs_path, dtype=np.uint8, mode="r") if os.path.getsize(jobs_path) else np.empty(0, np.uint8)
+        )
+        self.deleted: Optional[np.ndarray] = (
+            np.load(os.path.join(path, deleted_file), mmap_mode="r") if deleted_file else None
+        )
+        self._inverted_index: Optional[InvertedIndex] = None
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    @property
+    def live_rows(self) -> int:
+        return len(self) - (int(np.count_nonzero(self.deleted)) if self.deleted is not None else 0)
+
+    def job(self, row: int) -> JobVectorStore:
+        start, end = int(self.offsets[row]), int(self.offsets[row + 1])
+        return JobVectorStore.model_validate_json(self.jobs[start:end].tobytes())
+
+    def find(self, job_id: str) -> Optional[int]:
+        """Row of the live job with this id, if the segment holds one"""
+        target = np.uint64(id_hash(job_id))
+        start = int(np.searchsorted(self.id_hashes, target, side="left"))
+        end = int(np.searchsorted(self.id_hashes, target, side="right"))
+        for position in range(start, end):
+            row = int(self.id_rows[position])
+            if not self.is_deleted(row) and self.job(row).job_id == job_id:
+                return row
+        return None
+
+    def is_deleted(self, row: int) -> bool:
+        return self.deleted is not None and bool(self.deleted[row])
+
+    def deleted_mask(self) -> np.ndarray:
+        return np.asarray(self.deleted) if self.deleted is not None else np.zeros(len(self), dtype=bool)
+
+    def filter_rows(self, metadata_filter: MetadataFilter) -> np.ndarray:
+        """Sorted rows, deleted ones included, whose job passes the filter"""
+        if self._inverted_index is None:
+            # postings are only read by filtered searches, so opening a segment stays cheap
+            with open(os.path.join(self.path, f"{self.name}.postings.json")) as f:
+                self._inverted_index = InvertedIndex.from_dict(json.load(f))
+        return self._inverted_index.rows(metadata_filter)
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        block_size: int = 65536,
+        threads: int = 1,
+        rows: Optional[np.ndarray] = None,
+    ) -> List[Tuple[float, int]]:
+        """
+        Up to top_k (score, row) pairs of live rows, best first, scanning block_size rows at a time.
+        When rows is given, only those rows are read and scored.
+        """
+        if len(self) == 0 or top_k < 1 or (rows is not None and len(rows) == 0):
+            return []
+        vectors, deleted = self.vectors, self.deleted
+        if rows is not None:
+            vectors = self.vectors[rows]
+            deleted = self.deleted[rows] if self.deleted is not None else None
+        scores, positions = blocked_search(
+            vectors, query, top_k, block_size=block_size, threads=threads, deleted=deleted
+        )
+        positions = rows[positions[0]] if rows is not None else positions[0]
+        return [(float(score), int(row)) for score, row in zip(scores[0], positions) if np.isfinite(score)]
@@ -1,19 +1,79 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 from langchain_core.embeddings import Embeddings
 
+from src.common.cache import LRUCache
+from src.vector_store.embeddings.cached_query_embeddings import CachedQueryEmbeddings
 from src.vector_store.models import JobVectorStore
 
 
+class PartialUpsertError(RuntimeError):
+    """Some upsert chunks still failed after their retries; every other chunk was upserted"""
+
+    def __init__(self, failed_ids: List[str], upserted: int, errors: List[Exception]):
+        super().__init__(
+            f"Failed to upsert {len(failed_ids)} records in {len(errors)} chunk(s), upserted {upserted}: {errors[0]}"
+        )
+        self.failed_ids = failed_ids
+        self.upserted = upserted
+        self.errors = errors
+
+
 class VectorStore(ABC):
+    namespace: str = "default"
+    # embeds query text the same way the store does, for callers that compare queries themselves
+    query_embedding: Optional[Embeddings] = None
+
     def __init__(self, embedding: Optional[Embeddings] = None):
         self.embedding = embedding
 
+    @staticmethod
+    def cached_query_embedding(
+        embedding: Embeddings,
+        query_embedding_cache: Optional[LRUCache[List[float]]] = None,
+        embedding_model: Optional[str] = None,
+    ) -> Embeddings:
+        """embedding, caching its query vectors under embedding_model when a cache is given"""
+        if query_embedding_cache is None:
+            return embedding
+        if not embedding_model:
+            # the model name keeps vectors of different models, even of one Embeddings class, apart
+            raise ValueError("embedding_model is required to cache query embeddings")
+        return CachedQueryEmbeddings(embedding, cache=query_embedding_cache, cache_namespace=embedding_model)
+
+    def search_namespaces(self, filters: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Namespaces whose upserts can change the results of a search with these filters"""
+        return [self.namespace]
+
+    def upsert_namespaces(self, job_details: List[JobVectorStore]) -> List[str]:
+        """Namespaces an upsert of these jobs writes to"""
+        return [self.namespace]
+
     @abstractmethod
     def add_job_details(self, job_details: List[JobVectorStore]) -> None:
         pass
 
     @abstractmethod
-    def similarity_search(self, query: str, top_k: int = 5) -> list[JobVectorStore]:
+    def similarity_search(
+        self, query: str, top_k: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> list[JobVectorStore]:
+        """Up to top_k jobs most similar to query, restricted to jobs matching filters (see vector_store.filters)"""
+        pass
+
+    @abstractmethod
+    def get_job_details(self, job_id: str) -> Optional[JobVectorStore]:
+        pass
+
+    def get_job_details_many(self, job_ids: Sequence[str]) -> Dict[str, JobVectorStore]:
+        """The stored jobs among job_ids, by id; stores with a batch lookup override this"""
+        jobs = {}
+        for job_id in job_ids:
+            job = self.get_job_details(job_id)
+            if job is not None:
+                jobs[job_id] = job
+        return jobs
+
+    def close(self) -> None:
+        """Release the threads and files the store holds; stores holding none need not override this"""
         pass
@@ -40,3 +40,7 @@ class JobVectorStore(BaseModel):
 class AvailableVectorStores(Enum):
     MEMORY = "memory"
     PINECONE = "pinecone"
+    NUMPY = "numpy"
+    HNSW = "hnsw"
+    QUANTIZED = "quantized"
+    MMAP = "mmap"
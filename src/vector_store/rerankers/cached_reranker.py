@@ -0,0 +1,45 @@
+from typing import Dict, List, Optional, Sequence
+
+from src.common.cache import LRUCache
+from src.common.hashing import content_hash
+from src.common.normalization import normalize_query
+from src.logger import get_logger
+from src.vector_store.rerankers.interface import Reranker
+
+logger = get_logger(__name__)
+
+
+class CachedReranker(Reranker):
+    """Reranker wrapper that caches scores by (normalized query, document content hash)"""
+
+    def __init__(self, reranker: Reranker, cache: LRUCache[float], cache_namespace: str = "default"):
+        super().__init__(batch_size=reranker.batch_size)
+        self.reranker = reranker
+        self.cache = cache
+        self.cache_namespace = cache_namespace
+
+    def score(self, query: str, documents: Sequence[str]) -> List[float]:
+        return self.score_batched(query, documents)
+
+    def score_batched(self, query: str, documents: Sequence[str]) -> List[float]:
+        normalized_query = normalize_query(query)
+        keys = [(self.cache_namespace, normalized_query, content_hash(document)) for document in documents]
+        scores: List[Optional[float]] = [self.cache.get(key) for key in keys]
+        cached = sum(score is not None for score in scores)
+
+        # the same document may appear more than once; it is scored once
+        missing: Dict[str, List[int]] = {}
+        for position, score in enumerate(scores):
+            if score is None:
+                missing.setdefault(keys[position][2], []).append(position)
+        if missing:
+            positions = [positions[0] for positions in missing.values()]
+            fresh_scores = self.reranker.score_batched(
+                normalized_query, [documents[position] for position in positions]
+            )
+            for position, score in zip(positions, fresh_scores):
+                self.cache.set(keys[position], score)
+                for duplicate in missing[keys[position][2]]:
+                    scores[duplicate] = score
+        logger.debug(f"Rerank score cache: {cached}/{len(documents)} documents cached")
+        return scores  # type: ignore[return-value]
@@ -0,0 +1,52 @@
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel, Field
+
+
+class AvailableRerankers(Enum):
+    PINECONE = "pinecone"
+    LOCAL = "local"
+    NONE = "none"
+
+
+class RerankOptions(BaseModel, frozen=True):
+    """Per-request knobs of the rerank stage; hashable so they can be part of cache keys"""
+
+    enabled: bool = True
+    # first-stage results handed to the reranker; None reranks exactly the top_k results
+    candidates: Optional[int] = Field(default=None, ge=1)
+    # documents are cut to this many characters before reranking; None sends them whole
+    max_document_chars: Optional[int] = Field(default=None, ge=1)
+
+
+class Reranker(ABC):
+    """Second-stage scorer for first-stage search results, scoring batches of batch_size documents"""
+
+    def __init__(self, batch_size: int = 100):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.batch_size = batch_size
+
+    @abstractmethod
+    def score(self, query: str, documents: Sequence[str]) -> List[float]:
+        """Relevance of every document to query, in input order"""
+        pass
+
+    def score_batched(self, query: str, documents: Sequence[str]) -> List[float]:
+        """Relevance of every document to query, scored batch_size documents at a time"""
+        scores: List[float] = []
+        for start in range(0, len(documents), self.batch_size):
+            scores.extend(self.score(query, documents[start : start + self.batch_size]))
+        return scores
+
+    def rerank(
+        self, query: str, documents: Sequence[str], top_n: int, max_document_chars: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """Up to top_n (document position, score) pairs, best first; ties keep the input order"""
+        if max_document_chars is not None:
+            documents = [document[:max_document_chars] for document in documents]
+        scores = self.score_batched(query, documents)
+        ranked = sorted(range(len(documents)), key=lambda position: -scores[position])
+        return [(position, scores[position]) for position in ranked[:top_n]]
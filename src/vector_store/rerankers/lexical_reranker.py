@@ -0,0 +1,28 @@
+from collections import Counter
+from typing import List, Sequence
+
+from src.vector_store.indexes.bm25 import tokenize
+from src.vector_store.rerankers.interface import Reranker
+
+
+class LexicalReranker(Reranker):
+    """CPU-only reranker scoring how well each document covers the query terms"""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, reference_length: int = 256, batch_size: int = 100):
+        super().__init__(batch_size=batch_size)
+        self.k1 = k1
+        self.b = b
+        self.reference_length = reference_length
+
+    def score(self, query: str, documents: Sequence[str]) -> List[float]:
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return [0.0] * len(documents)
+        scores = []
+        for document in documents:
+            tokens = tokenize(document)
+            counts = Counter(tokens)
+            norm = self.k1 * (1 - self.b + self.b * len(tokens) / self.reference_length)
+            total = sum(counts[term] * (self.k1 + 1) / (counts[term] + norm) for term in terms if term in counts)
+            scores.append(total / (len(terms) * (self.k1 + 1)))
+        return scores
@@ -0,0 +1,31 @@
+from typing import List, Sequence
+
+from pinecone import Pinecone
+
+from src.vector_store.rerankers.interface import Reranker
+
+
+class PineconeReranker(Reranker):
+    """Reranker backed by Pinecone's hosted inference API"""
+
+    def __init__(self, client: Pinecone, model: str = "bge-reranker-v2-m3", batch_size: int = 100):
+        super().__init__(batch_size=batch_size)
+        self.client = client
+        self.model = model
+
+    def score(self, query: str, documents: Sequence[str]) -> List[float]:
+        if not documents:
+            return []
+        reranked = self.client.inference.rerank(
+            model=self.model,
+            query=query,
+            documents=list(documents),
+            top_n=len(documents),
+            return_documents=False,
+            parameters={"truncate": "END"},
+        )
+        # results come back best first; index is the position in the documents sent
+        scores = [0.0] * len(documents)
+        for ranked_document in reranked.data:
+            scores[ranked_document.index] = ranked_document.score
+        return scores
@@ -0,0 +1,118 @@
+import math
+import threading
+from enum import Enum
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class RerankSkipMode(Enum):
+    OFF = "off"
+    SHADOW = "shadow"
+    ON = "on"
+
+
+class RerankAction(Enum):
+    # rerank every first-stage candidate
+    RERANK = "rerank"
+    # rerank only the best first-stage candidates
+    SHRINK = "shrink"
+    # keep the first-stage order and scores
+    SKIP = "skip"
+
+
+class RerankDecision(NamedTuple):
+    action: RerankAction
+    # first-stage candidates handed to the reranker, 0 when skipped
+    candidates: int
+    gap: float
+    entropy: float
+
+    def describe(self) -> str:
+        return f"{self.action.value} (candidates {self.candidates}, gap {self.gap:.3f}, entropy {self.entropy:.3f})"
+
+
+class RerankSkipPolicy:
+    """Decides from the first-stage score distribution whether a search needs its rerank"""
+
+    def __init__(
+        self,
+        skip_min_gap: float = 0.15,
+        skip_max_entropy: float = 0.5,
+        shrink_min_gap: float = 0.05,
+        shrink_max_entropy: float = 0.8,
+        shrink_ratio: float = 0.5,
+        temperature: float = 0.05,
+        shadow: bool = False,
+    ):
+        if not 0 < shrink_ratio <= 1:
+            raise ValueError("shrink_ratio must be in (0, 1]")
+        if temperature <= 0:
+            raise ValueError("temperature must be positive")
+        self.skip_min_gap = skip_min_gap
+        self.skip_max_entropy = skip_max_entropy
+        self.shrink_min_gap = shrink_min_gap
+        self.shrink_max_entropy = shrink_max_entropy
+        self.shrink_ratio = shrink_ratio
+        self.temperature = temperature
+        self.shadow = shadow
+        self._decisions = {action: 0 for action in RerankAction}
+        self._shadow_searches = 0
+        self._shadow_changes = 0
+        self._lock = threading.Lock()
+
+    def decide(self, scores: Sequence[Optional[float]], top_n: int) -> RerankDecision:
+        """The decision for first-stage candidates with the given scores, best first"""
+        decision = self._decide(scores, top_n)
+        with self._lock:
+            self._decisions[decision.action] += 1
+        return decision
+
+    def _decide(self, scores: Sequence[Optional[float]], top_n: int) -> RerankDecision:
+        if len(scores) <= 1:
+            return RerankDecision(RerankAction.SKIP, 0, 0.0, 0.0)
+        if any(score is None for score in scores):
+            return RerankDecision(RerankAction.RERANK, len(scores), 0.0, 1.0)
+        values: List[float] = [float(score) for score in scores]  # type: ignore[arg-type]
+        gap = values[0] - values[min(max(top_n, 2), len(values)) - 1]
+        entropy = self.normalized_entropy(values)
+
+        if gap >= self.skip_min_gap and entropy <= self.skip_max_entropy:
+            return RerankDecision(RerankAction.SKIP, 0, gap, entropy)
+        if gap >= self.shrink_min_gap or entropy <= self.shrink_max_entropy:
+            candidates = max(top_n, math.ceil(len(values) * self.shrink_ratio))
+            if candidates < len(values):
+                return RerankDecision(RerankAction.SHRINK, candidates, gap, entropy)
+        return RerankDecision(RerankAction.RERANK, len(values), gap, entropy)
+
+    def normalized_entropy(self, scores: Sequence[float]) -> float:
+        if len(scores) <= 1:
+            return 0.0
+        top = max(scores)
+        weights = [math.exp((score - top) / self.temperature) for score in scores]
+        total = sum(weights)
+        entropy = -sum(weight / total * math.log(weight / total) for weight in weights if weight > 0)
+        return entropy / math.log(len(scores))
+
+    def observe_shadow(self, decision: RerankDecision, predicted: Sequence[str], actual: Sequence[str]) -> bool:
+        """Record a shadow-mode decision, returning whether it would have changed the results"""
+        changed = list(predicted) != list(actual)
+        with self._lock:
+            self._shadow_searches += 1
+            self._shadow_changes += changed
+        if changed:
+            logger.info(f"Rerank policy would have changed the results: {decision.describe()}")
+        return changed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            decisions = {action.value: count for action, count in self._decisions.items()}
+            return {
+                "shadow": self.shadow,
+                "decisions": decisions,
+                "shadow_searches": self._shadow_searches,
+                "shadow_changes": self._shadow_changes,
+                "shadow_change_rate": self._shadow_changes / self._shadow_searches if self._shadow_searches else 0.0,
+            }
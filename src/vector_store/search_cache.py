@@ -0,0 +1,51 @@
+import threading
+from typing import Dict, Hashable, List, Optional, Sequence, Union
+
+from src.common.cache import LRUCache
+from src.vector_store.models import JobVectorStore
+
+
+class SimilaritySearchCache:
+    """
+    LRU cache of search results, keyed by the generations of the namespaces each search reads.
+    Generations only count upserts made in this process, so entries also expire after ttl_seconds
+    to pick up upserts of other processes.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: Optional[float] = 300):
+        self._results: LRUCache[List[JobVectorStore]] = LRUCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    def bump(self, namespace: str) -> int:
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            return self._generations[namespace]
+
+    def key(
+        self,
+        namespace: Union[str, Sequence[str]],
+        query: str,
+        top_k: Optional[int] = None,
+        filters: Hashable = (),
+        rerank: Hashable = None,
+    ) -> Hashable:
+        """Build the key before searching, so an upsert racing with the search invalidates its results"""
+        if isinstance(namespace, str):
+            return (namespace, self.generation(namespace), query, top_k, filters, rerank)
+        namespaces = tuple(namespace)
+        generations = tuple(self.generation(name) for name in namespaces)
+        return (namespaces, generations, query, top_k, filters, rerank)
+
+    def get(self, key: Hashable) -> Optional[List[JobVectorStore]]:
+        results = self._results.get(key)
+        return list(results) if results is not None else None
+
+    def set(self, key: Hashable, results: List[JobVectorStore]) -> None:
+        self._results.set(key, list(results))
+
+    def stats(self) -> Dict[str, object]:
+        return {**self._results.stats(), "generations": dict(self._generations)}
@@ -1,13 +1,173 @@
-from src.vector_store.interface import VectorStore
+import asyncio
+from typing import Any, AsyncIterable, Dict, List, Optional
+
+from src.common.async_pipeline import batched
+from src.common.cache import LRUCache
+from src.common.hashing import content_hash
+from src.logger import get_logger
+from src.vector_store.filters import filter_key, to_metadata_filter
+from src.vector_store.interface import PartialUpsertError, VectorStore
 from src.vector_store.models import JobVectorStore
+from src.vector_store.rerankers.interface import Reranker, RerankOptions
+from src.vector_store.rerankers.skip_policy import RerankAction, RerankSkipPolicy
+from src.vector_store.search_cache import SimilaritySearchCache
+
+logger = get_logger(__name__)
+
+# results returned when a rerank runs without an explicit top_k, matching VectorStore.similarity_search
+DEFAULT_TOP_K = 5
 
 
 class VectorStoreService:
-    def __init__(self, vector_store: VectorStore) -> None:
+    def __init__(
+        self,
+        vector_store: VectorStore,
+        search_cache: Optional[SimilaritySearchCache] = None,
+        reranker: Optional[Reranker] = None,
+        rerank_options: Optional[RerankOptions] = None,
+        rerank_policy: Optional[RerankSkipPolicy] = None,
+        upserted_hashes_size: int = 100_000,
+    ) -> None:
         self.vector_store = vector_store
+        self.search_cache = search_cache
+        self.reranker = reranker
+        # used by searches that do not pass their own options
+        self.rerank_options = rerank_options or RerankOptions()
+        # skips or shrinks the rerank of searches whose first-stage results are already confident
+        self.rerank_policy = rerank_policy
+        # job id -> content hash of its last successful upsert; re-upserting unchanged jobs keeps cached searches
+        self._upserted_hashes: LRUCache[str] = LRUCache(max_size=upserted_hashes_size)
+
+    def add_job_details(self, job_details: List[JobVectorStore]) -> None:
+        if self.search_cache is None:
+            self.vector_store.add_job_details(job_details)
+            return
+        hashes = {job.job_id: self._content_hash(job) for job in job_details}
+        changed = [job for job in job_details if self._upserted_hashes.get(job.job_id) != hashes[job.job_id]]
+        try:
+            self.vector_store.add_job_details(job_details)
+        finally:
+            # a failed upsert may still have written some of the changed jobs
+            if changed:
+                for namespace in self.vector_store.upsert_namespaces(changed):
+                    self.search_cache.bump(namespace)
+        for job_id, job_hash in hashes.items():
+            self._upserted_hashes.set(job_id, job_hash)
+
+    @staticmethod
+    def _content_hash(job: JobVectorStore) -> str:
+        return content_hash(job.model_dump_json(exclude={"score"}))
+
+    async def add_job_details_stream(self, job_details: AsyncIterable[JobVectorStore], batch_size: int = 96) -> int:
+        """Upsert a stream of jobs in chunks of batch_size, returning how many were upserted"""
+        upserted = 0
+        async for batch in batched(job_details, batch_size):
+            try:
+                await asyncio.to_thread(self.add_job_details, batch)
+                upserted += len(batch)
+            except PartialUpsertError as e:
+                # the jobs that were written are searchable, so ingestion goes on with the next batch
+                logger.error(f"Upserting a batch of {len(batch)} jobs partially failed: {str(e)}")
+                upserted += e.upserted
+        return upserted
+
+    def similarity_search(
+        self,
+        query: str,
+        top_k: Optional[int] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        rerank: Optional[RerankOptions] = None,
+    ) -> list[JobVectorStore]:
+        """Up to top_k jobs for query, picked by the reranker from the first-stage candidates if one is set"""
+        rerank_options = self._rerank_options(rerank)
+        if self.search_cache is None:
+            return self._search(query, top_k, filters, rerank_options)
+
+        cache_key = self.search_cache.key(
+            self.vector_store.search_namespaces(filters),
+            query,
+            top_k,
+            filter_key(to_metadata_filter(filters)),
+            rerank_options,
+        )
+        cached_results = self.search_cache.get(cache_key)
+        if cached_results is not None:
+            logger.debug(f"Similarity search cache hit for query: '{query}'")
+            return cached_results
+
+        results = self._search(query, top_k, filters, rerank_options)
+        self.search_cache.set(cache_key, results)
+        return results
+
+    def get_job_details(self, job_id: str) -> Optional[JobVectorStore]:
+        return self.vector_store.get_job_details(job_id)
+
+    def _rerank_options(self, rerank: Optional[RerankOptions]) -> Optional[RerankOptions]:
+        """The options the rerank stage runs with, or None when the search skips it"""
+        rerank_options = rerank or self.rerank_options
+        if self.reranker is None or not rerank_options.enabled:
+            return None
+        return rerank_options
+
+    def _search(
+        self,
+        query: str,
+        top_k: Optional[int],
+        filters: Optional[Dict[str, Any]],
+        rerank_options: Optional[RerankOptions],
+    ) -> list[JobVectorStore]:
+        if self.reranker is None or rerank_options is None:
+            return self._first_stage(query, top_k, filters)
+
+        top_n = top_k if top_k is not None else DEFAULT_TOP_K
+        candidates = self._first_stage(query, max(top_n, rerank_options.candidates or top_n), filters)
+        if not candidates:
+            return []
+        if self.rerank_policy is None:
+            return self._rerank(query, candidates, top_n, rerank_options)
+
+        decision = self.rerank_policy.decide([candidate.score for candidate in candidates], top_n)
+        logger.debug(f"Rerank decision for query '{query}': {decision.describe()}")
+        if self.rerank_policy.shadow:
+            results = self._rerank(query, candidates, len(candidates), rerank_options)
+            if decision.action == RerankAction.SKIP:
+                self.rerank_policy.observe_shadow(
+                    decision, self._job_ids(candidates[:top_n]), self._job_ids(results[:top_n])
+                )
+            elif decision.action == RerankAction.SHRINK:
+                # rerank scores do not depend on the other documents, so reranking the shrunk
+                # candidates gives the full rerank restricted to them
+                shrunk = set(self._job_ids(candidates[: decision.candidates]))
+                predicted = [job for job in results if job.job_id in shrunk]
+                self.rerank_policy.observe_shadow(
+                    decision, self._job_ids(predicted[:top_n]), self._job_ids(results[:top_n])
+                )
+            return results[:top_n]
+        if decision.action == RerankAction.SKIP:
+            return candidates[:top_n]
+        return self._rerank(query, candidates[: decision.candidates], top_n, rerank_options)
+
+    def _rerank(
+        self, query: str, candidates: List[JobVectorStore], top_n: int, rerank_options: RerankOptions
+    ) -> list[JobVectorStore]:
+        ranked = self.reranker.rerank(  # type: ignore[union-attr]
+            query,
+            [candidate.get_combined_text_document() for candidate in candidates],
+            top_n,
+            max_document_chars=rerank_options.max_document_chars,
+        )
+        logger.debug(f"Reranked {len(candidates)} candidates down to {len(ranked)} for query '{query}'")
+        return [candidates[position].model_copy(update={"score": score}) for position, score in ranked]
 
-    def add_job_details(self, job_details: JobVectorStore) -> None:
-        self.vector_store.add_job_details(job_details)
+    @staticmethod
+    def _job_ids(jobs: List[JobVectorStore]) -> List[str]:
+        return [job.job_id for job in jobs]
 
-    def similarity_search(self, query: str) -> list[JobVectorStore]:
-        return self.vector_store.similarity_search(query)
+    def _first_stage(self, query: str, top_k: Optional[int], filters: Optional[Dict[str, Any]]) -> list[JobVectorStore]:
+        # stores keep their own default top_k
+        search_kwargs: Dict[str, Any] = {}
+        if top_k is not None:
+            search_kwargs["top_k"] = top_k
+        if filters:
+            search_kwargs["filters"] = filters
+        return self.vector_store.similarity_search(query, **search_kwargs)
@@ -0,0 +1,171 @@
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.common.cache import LRUCache
+from src.logger import get_logger
+from src.vector_store.filters import MetadataFilter, describe, matches, to_metadata_filter
+from src.vector_store.indexes.hnsw import HNSWIndex
+from src.vector_store.indexes.inverted import InvertedIndex
+from src.vector_store.indexes.planner import QueryPlanner, SearchStrategy
+from src.vector_store.interface import VectorStore
+from src.vector_store.models import JobVectorStore
+
+logger = get_logger(__name__)
+
+
+class HNSWStore(VectorStore):
+    """Local store searched through an HNSW graph, with filtered searches planned per query"""
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        query_embedding_cache: Optional[LRUCache[List[float]]] = None,
+        embedding_model: Optional[str] = None,
+        m: int = 16,
+        ef_construction: int = 200,
+        ef_search: int = 50,
+        planner: Optional[QueryPlanner] = None,
+    ):
+        self.embedding: Embeddings = embedding
+        self.query_embedding: Embeddings = self.cached_query_embedding(
+            embedding, query_embedding_cache, embedding_model
+        )
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.planner = planner or QueryPlanner()
+        self.index: Optional[HNSWIndex] = None
+        # _jobs[node] is the job stored at that graph node; _nodes maps live job ids to nodes
+        self._jobs: List[JobVectorStore] = []
+        self._nodes: Dict[str, int] = {}
+        self._inverted_index = InvertedIndex()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def add_job_details(self, job_details: List[JobVectorStore]) -> None:
+        unique_jobs = list({job_detail.job_id: job_detail for job_detail in job_details}.values())
+        if not unique_jobs:
+            return
+        vectors = np.asarray(
+            self.embedding.embed_documents([job.get_combined_text_document() for job in unique_jobs]),
+            dtype=np.float32,
+        )
+
+        with self._lock:
+            if self.index is None:
+                self.index = HNSWIndex(
+                    dimension=vectors.shape[1],
+                    m=self.m,
+                    ef_construction=self.ef_construction,
+                    ef_search=self.ef_search,
+                )
+            for job, vector in zip(unique_jobs, vectors):
+                previous_node = self._nodes.get(job.job_id)
+                if previous_node is not None:
+                    self.index.mark_deleted(previous_node)
+                    self._inverted_index.remove(previous_node, self._jobs[previous_node].get_metadata())
+                node = self.index.add(vector)
+                self._jobs.append(job.model_copy(update={"score": None}))
+                self._nodes[job.job_id] = node
+                self._inverted_index.add(node, job.get_metadata())
+
+    def delete_job_details(self, job_ids: List[str]) -> None:
+        with self._lock:
+            for job_id in job_ids:
+                node = self._nodes.pop(job_id, None)
+                if node is not None and self.index is not None:
+                    self.index.mark_deleted(node)
+                    self._inverted_index.remove(node, self._jobs[node].get_metadata())
+
+    def similarity_search(
+        self,
+        query: str,
+        top_k: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        ef_search: Optional[int] = None,
+    ) -> list[JobVectorStore]:
+        query_vector = np.asarray(self.query_embedding.embed_query(query), dtype=np.float32)
+        metadata_filter = to_metadata_filter(filters)
+        with self._lock:
+            if self.index is None:
+                return []
+            if metadata_filter:
+                hits = self._filtered_search(query_vector, top_k, metadata_filter, ef_search or self.ef_search)
+            else:
+                hits = self.index.search(query_vector, top_k, ef_search=ef_search)
+            return [self._jobs[node].model_copy(update={"score": score}) for node, score in hits]
+
+    def _filtered_search(
+        self, query_vector: np.ndarray, top_k: int, metadata_filter: MetadataFilter, ef_search: int
+    ) -> List[Tuple[int, float]]:
+        assert self.index is not None
+        total = len(self._nodes)
+        plan = self.planner.plan(
+            self._inverted_index.estimate(metadata_filter, total), total, top_k, ef_search, self.index.m
+        )
+        logger.info(f"Filtered search plan: {plan.describe()} for {describe(metadata_filter)} over {total} jobs")
+
+        if plan.strategy is SearchStrategy.EXACT:
+            return self.index.exact_search(query_vector, self._inverted_index.rows(metadata_filter), top_k)
+        if plan.strategy is SearchStrategy.HYBRID:
+            allowed = np.zeros(len(self._jobs), dtype=bool)
+            allowed[self._inverted_index.rows(metadata_filter)] = True
+            return self.index.search(query_vector, top_k, ef_search=plan.ef, allowed=allowed)
+
+        fetch = plan.ef
+        while True:
+            hits = self.index.search(query_vector, fetch, ef_search=fetch)
+            matching = [
+                (node, score) for node, score in hits if matches(self._jobs[node].get_metadata(), metadata_filter)
+            ]
+            if len(matching) >= top_k or fetch >= total:
+                return matching[:top_k]
+            # the filter kept fewer hits than estimated; over-fetch further
+            fetch = min(fetch * 2, total)
+            logger.info(f"Post-filtering kept {len(matching)} of {len(hits)} hits; over-fetching {fetch}")
+
+    def get_job_details(self, job_id: str) -> Optional[JobVectorStore]:
+        with self._lock:
+            node = self._nodes.get(job_id)
+            return self._jobs[node] if node is not None else None
+
+    def save(self, path: str) -> None:
+        """Write the graph and jobs into directory path"""
+        with self._lock:
+            if self.index is None:
+                raise ValueError("Cannot save an empty store")
+            self.index.save(path)
+            with open(os.path.join(path, "jobs.json"), "w") as f:
+                json.dump([job.model_dump(mode="json") for job in self._jobs], f)
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        embedding: Embeddings,
+        query_embedding_cache: Optional[LRUCache[List[float]]] = None,
+        embedding_model: Optional[str] = None,
+    ) -> "HNSWStore":
+        index = HNSWIndex.load(path)
+        store = cls(
+            embedding,
+            query_embedding_cache=query_embedding_cache,
+            embedding_model=embedding_model,
+            m=index.m,
+            ef_construction=index.ef_construction,
+            ef_search=index.ef_search,
+        )
+        with open(os.path.join(path, "jobs.json")) as f:
+            store._jobs = [JobVectorStore(**job) for job in json.load(f)]
+        store.index = index
+        store._nodes = {job.job_id: node for node, job in enumerate(store._jobs) if not index.is_deleted(node)}
+        for node in store._nodes.values():
+            store._inverted_index.add(node, store._jobs[node].get_metadata())
+        return store
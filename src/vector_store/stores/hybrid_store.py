@@ -0,0 +1,118 @@
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.logger import get_logger
+from src.vector_store.filters import to_metadata_filter
+from src.vector_store.fusion import reciprocal_rank_fusion
+from src.vector_store.indexes.bm25 import BM25Index
+from src.vector_store.indexes.inverted import InvertedIndex
+from src.vector_store.interface import VectorStore
+from src.vector_store.models import JobVectorStore
+
+logger = get_logger(__name__)
+
+
+class HybridStore(VectorStore):
+    """Fuses a vector store's ranking with a BM25 ranking of the jobs upserted through it"""
+
+    def __init__(
+        self, vector_store: VectorStore, candidates: int = 50, rrf_k: int = 60, k1: float = 1.2, b: float = 0.75
+    ):
+        if candidates < 1:
+            raise ValueError("candidates must be at least 1")
+        self.vector_store = vector_store
+        self.embedding = getattr(vector_store, "embedding", None)
+        self.query_embedding = vector_store.query_embedding
+        self.candidates = candidates
+        self.rrf_k = rrf_k
+        self.keyword_index = BM25Index(k1=k1, b=b)
+        self._inverted_index = InvertedIndex()
+        self._rows: Dict[str, int] = {}
+        self._job_ids: List[str] = []
+        self._metadata: List[Dict[str, Any]] = []
+        self._lock = threading.RLock()
+
+    @property  # type: ignore[override]
+    def namespace(self) -> str:
+        return self.vector_store.namespace
+
+    def search_namespaces(self, filters: Optional[Dict[str, Any]] = None) -> List[str]:
+        return self.vector_store.search_namespaces(filters)
+
+    def upsert_namespaces(self, job_details: List[JobVectorStore]) -> List[str]:
+        return self.vector_store.upsert_namespaces(job_details)
+
+    def add_job_details(self, job_details: List[JobVectorStore]) -> None:
+        try:
+            self.vector_store.add_job_details(job_details)
+        finally:
+            # after a partial failure the jobs that were written are searchable by keyword too;
+            # keyword hits missing from the vector store are dropped by get_job_details
+            self._index_keywords(job_details)
+
+    def _index_keywords(self, job_details: List[JobVectorStore]) -> None:
+        with self._lock:
+            for job in job_details:
+                row = self._rows.get(job.job_id)
+                if row is None:
+                    row = len(self._job_ids)
+                    self._rows[job.job_id] = row
+                    self._job_ids.append(job.job_id)
+                    self._metadata.append({})
+                else:
+                    self._inverted_index.remove(row, self._metadata[row])
+                self._metadata[row] = job.get_metadata()
+                self._inverted_index.add(row, self._metadata[row])
+                self.keyword_index.add(row, job.get_combined_text_document())
+
+    def similarity_search(
+        self, query: str, top_k: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> list[JobVectorStore]:
+        candidates = max(top_k, self.candidates)
+        search_kwargs: Dict[str, Any] = {"filters": filters} if filters else {}
+        vector_results = self.vector_store.similarity_search(query, top_k=candidates, **search_kwargs)
+        keyword_results = self.keyword_search(query, candidates, filters)
+
+        jobs = {job.job_id: job for job in vector_results}
+        rankings = [[job.job_id for job in vector_results], [job_id for job_id, _ in keyword_results]]
+        fused = reciprocal_rank_fusion(rankings, k=self.rrf_k)
+        # keyword-only hits are read back in one batch
+        jobs.update(self.vector_store.get_job_details_many([job_id for job_id, _ in fused if job_id not in jobs]))
+        # scaled to [0, 1] by the score of a job both rankings put first, so that score thresholds
+        # such as the rerank skip policy's see agreement between the rankings rather than tiny RRF values
+        best_score = len(rankings) / (self.rrf_k + 1)
+        results = []
+        for job_id, score in fused:
+            job = jobs.get(job_id)
+            if job is not None:
+                results.append(job.model_copy(update={"score": score / best_score}))
+            if len(results) == top_k:
+                break
+        logger.debug(
+            f"Fused {len(vector_results)} vector and {len(keyword_results)} keyword candidates for query '{query}'"
+        )
+        return results
+
+    def keyword_search(
+        self, query: str, top_k: int, filters: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[str, float]]:
+        """Up to top_k (job_id, BM25 score) pairs of jobs matching the filters, best first"""
+        metadata_filter = to_metadata_filter(filters)
+        with self._lock:
+            allowed = None
+            if metadata_filter:
+                allowed = np.zeros(len(self._job_ids), dtype=bool)
+                allowed[self._inverted_index.rows(metadata_filter)] = True
+            hits = self.keyword_index.search(query, top_k, allowed=allowed)
+            return [(self._job_ids[row], score) for row, score in hits]
+
+    def get_job_details(self, job_id: str) -> Optional[JobVectorStore]:
+        return self.vector_store.get_job_details(job_id)
+
+    def get_job_details_many(self, job_ids: Sequence[str]) -> Dict[str, JobVectorStore]:
+        return self.vector_store.get_job_details_many(job_ids)
+
+    def close(self) -> None:
+        self.vector_store.close()
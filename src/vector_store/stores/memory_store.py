@@ -1,39 +1,68 @@
-from typing import List
+from typing import Any, Dict, List, Optional
 
+from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
 from langchain_core.vectorstores import InMemoryVectorStore
 
+from src.common.cache import LRUCache
+from src.vector_store.filters import matches, to_metadata_filter
 from src.vector_store.interface import VectorStore
 from src.vector_store.models import JobVectorStore
 
 
 class MemoryStore(VectorStore):
-    def __init__(self, embedding: Embeddings):
-        self.vector_store = InMemoryVectorStore(embedding=embedding)
+    def __init__(
+        self,
+        embedding: Embeddings,
+        query_embedding_cache: Optional[LRUCache[List[float]]] = None,
+        embedding_model: Optional[str] = None,
+    ):
+        self.query_embedding = self.cached_query_embedding(embedding, query_embedding_cache, embedding_model)
+        self.vector_store = InMemoryVectorStore(embedding=self.query_embedding)
 
     def add_job_details(self, job_details: List[JobVectorStore]) -> None:
-
+        if not job_details:
+            return
+        metadatas = []
         for job_detail in job_details:
             metadata = job_detail.get_metadata()
             metadata["job_description"] = job_detail.job_description
             metadata["location_string"] = job_detail.location_string
-            self.vector_store.add_texts(texts=[job_detail.get_combined_text_document()], metadatas=[metadata])
-
-    def similarity_search(self, query: str) -> list[JobVectorStore]:
-        documents = self.vector_store.similarity_search(query)
-
-        job_vector_stores = []
-        for doc in documents:
-            job_vector_store = JobVectorStore(
-                job_id=doc.metadata.get("job_id"),  # type: ignore
-                job_title=doc.metadata.get("job_title"),  # type: ignore
-                job_description=doc.metadata.get("job_description", ""),
-                job_apply_link=doc.metadata.get("job_apply_link"),  # type: ignore
-                employer_name=doc.metadata.get("employer_name"),
-                job_city=doc.metadata.get("job_city"),
-                job_state=doc.metadata.get("job_state"),
-                job_country=doc.metadata.get("job_country"),
-                location_string=doc.metadata.get("location_string"),
+            metadatas.append(metadata)
+        # one add_texts call embeds the whole batch with a single embed_documents call;
+        # the job id doubles as document id so re-ingesting a job replaces it
+        self.vector_store.add_texts(
+            texts=[job_detail.get_combined_text_document() for job_detail in job_details],
+            metadatas=metadatas,
+            ids=[job_detail.job_id for job_detail in job_details],
+        )
+
+    def similarity_search(
+        self, query: str, top_k: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> list[JobVectorStore]:
+        metadata_filter = to_metadata_filter(filters)
+        if metadata_filter:
+            # InMemoryVectorStore applies the predicate before scoring, so only matching documents are scored
+            documents = self.vector_store.similarity_search(
+                query, k=top_k, filter=lambda doc: matches(doc.metadata, metadata_filter)
             )
-            job_vector_stores.append(job_vector_store)
-        return job_vector_stores
+        else:
+            documents = self.vector_store.similarity_search(query, k=top_k)
+        return [self._to_job_vector_store(doc) for doc in documents]
+
+    def get_job_details(self, job_id: str) -> Optional[JobVectorStore]:
+        documents = self.vector_store.get_by_ids([job_id])
+        return self._to_job_vector_store(documents[0]) if documents else None
+
+    def _to_job_vector_store(self, doc: Document) -> JobVectorStore:
+        return JobVectorStore(
+            job_id=doc.metadata.get("job_id"),  # type: ignore
+            job_title=doc.metadata.get("job_title"),  # type: ignore
+            job_description=doc.metadata.get("job_description", ""),
+            job_apply_link=doc.metadata.get("job_apply_link"),  # type: ignore
+            employer_name=doc.metadata.get("employer_name"),
+            job_city=doc.metadata.get("job_city"),
+            job_state=doc.metadata.get("job_state"),
+            job_country=doc.metadata.get("job_country"),
+            location_string=doc.metadata.get("location_string"),
+        )
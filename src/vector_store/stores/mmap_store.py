@@ -0,0 +1,236 @@
+import fcntl
+import heapq
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.common.cache import LRUCache
+from src.logger import get_logger
+from src.vector_store.filters import to_metadata_filter
+from src.vector_store.indexes.segments import (
+    MANIFEST,
+    STORE_FILE,
+    Segment,
+    publish_manifest,
+    read_manifest,
+    segment_files,
+    write_deleted,
+    write_segment,
+)
+from src.vector_store.interface import VectorStore
+from src.vector_store.models import JobVectorStore
+
+logger = get_logger(__name__)
+
+WRITER_LOCK = "writer.lock"
+
+
+class ReadOnlyStoreError(RuntimeError):
+    pass
+
+
+class MmapStore(VectorStore):
+    """Persistent local store of memory-mapped segments, shared by processes with one writer"""
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        path: str,
+        writer: bool = True,
+        query_embedding_cache: Optional[LRUCache[List[float]]] = None,
+        embedding_model: Optional[str] = None,
+        search_block_size: int = 65536,
+        search_threads: int = 1,
+    ):
+        self.embedding: Embeddings = embedding
+        self.query_embedding: Embeddings = self.cached_query_embedding(
+            embedding, query_embedding_cache, embedding_model
+        )
+        self.path = path
+        self.search_block_size = search_block_size
+        self.search_threads = search_threads
+        os.makedirs(path, exist_ok=True)
+        self._lock = threading.RLock()
+        self._lock_file: Optional[Any] = None
+        if writer:
+            self._acquire_writer_lock()
+        self._manifest: Dict[str, Any] = {"version": 0, "dimension": None, "next_segment": 0, "segments": []}
+        self._manifest_stat: Optional[Tuple[int, int]] = None
+        self._segments: List[Segment] = []
+        self._refresh()
+        if not self.read_only:
+            self._remove_unreferenced_files()
+
+    @property
+    def read_only(self) -> bool:
+        return self._lock_file is None
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return sum(segment.live_rows for segment in self._segments)
+
+    def close(self) -> None:
+        if self._lock_file is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+            self._lock_file.close()
+            self._lock_file = None
+
+    def add_job_details(self, job_details: List[JobVectorStore]) -> None:
+        if self.read_only:
+            raise ReadOnlyStoreError(f"Another process holds the writer lock on {self.path}")
+        jobs = [job.model_copy(update={"score": None}) for job in {job.job_id: job for job in job_details}.values()]
+        if not jobs:
+            return
+        vectors = np.asarray(
+            self.embedding.embed_documents([job.get_combined_text_document() for job in jobs]), dtype=np.float32
+        )
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.where(norms == 0, 1, norms)
+
+        with self._lock:
+            manifest = self._manifest
+            if manifest["dimension"] is not None and vectors.shape[1] != manifest["dimension"]:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match store dimension {manifest['dimension']}"
+                )
+            version = manifest["version"] + 1
+            entries = [dict(entry) for entry in manifest["segments"]]
+            self._tombstone(entries, [job.job_id for job in jobs], version)
+
+            name = f"segment-{manifest['next_segment']:08d}"
+            write_segment(self.path, name, jobs, vectors)
+            entries.append({"name": name, "deleted": None})
+            next_segment = manifest["next_segment"] + 1
+            entries, next_segment = self._merge(entries, next_segment, version)
+
+            self._publish(
+                {"version": version, "dimension": vectors.shape[1], "next_segment": next_segment, "segments": entries}
+            )
+
+    def similarity_search(
+        self, query: str, top_k: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> list[JobVectorStore]:
+        metadata_filter = to_metadata_filter(filters)
+        query_vector = np.asarray(self.query_embedding.embed_query(query), dtype=np.float32)
+        norm = np.linalg.norm(query_vector)
+        query_vector = query_vector / norm if norm else query_vector
+        with self._lock:
+            self._refresh()
+            segments = list(self._segments)
+        hits = [
+            (score, position, row)
+            for position, segment in enumerate(segments)
+            for score, row in segment.search(
+                query_vector,
+                top_k,
+                block_size=self.search_block_size,
+                threads=self.search_threads,
+                rows=segment.filter_rows(metadata_filter) if metadata_filter else None,
+            )
+        ]
+        return [
+            segments[position].job(row).model_copy(update={"score": score})
+            for score, position, row in heapq.nlargest(top_k, hits)
+        ]
+
+    def get_job_details(self, job_id: str) -> Optional[JobVectorStore]:
+        with self._lock:
+            self._refresh()
+            segments = list(self._segments)
+        for segment in reversed(segments):
+            row = segment.find(job_id)
+            if row is not None:
+                return segment.job(row)
+        return None
+
+    def _acquire_writer_lock(self) -> None:
+        lock_file = open(os.path.join(self.path, WRITER_LOCK), "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            logger.info(f"Writer lock on {self.path} is held by another process; opening read-only")
+            return
+        self._lock_file = lock_file
+
+    def _refresh(self) -> None:
+        """Map the segments of the current manifest if it changed since the last call"""
+        for _ in range(3):
+            try:
+                stat = os.stat(os.path.join(self.path, MANIFEST))
+            except FileNotFoundError:
+                return
+            if (stat.st_ino, stat.st_mtime_ns) == self._manifest_stat:
+                return
+            manifest = read_manifest(self.path)
+            if manifest is None:
+                return
+            try:
+                self._open(manifest)
+            except FileNotFoundError:
+                # the writer published again and removed files of this manifest; read the newer one
+                continue
+            self._manifest_stat = (stat.st_ino, stat.st_mtime_ns)
+            return
+        raise RuntimeError(f"Could not open a consistent manifest in {self.path}")
+
+    def _open(self, manifest: Dict[str, Any]) -> None:
+        opened = {(segment.name, segment.deleted_file): segment for segment in self._segments}
+        self._segments = [
+            opened.get((entry["name"], entry["deleted"])) or Segment(self.path, entry["name"], entry["deleted"])
+            for entry in manifest["segments"]
+        ]
+        self._manifest = manifest
+
+    def _tombstone(self, entries: List[Dict[str, Any]], job_ids: List[str], version: int) -> None:
+        segments = {segment.name: segment for segment in self._segments}
+        for entry in entries:
+            segment = segments[entry["name"]]
+            rows = [row for row in (segment.find(job_id) for job_id in job_ids) if row is not None]
+            if not rows:
+                continue
+            deleted = np.zeros(len(segment), dtype=bool) if segment.deleted is None else np.array(segment.deleted)
+            deleted[rows] = True
+            entry["deleted"] = write_deleted(self.path, entry["name"], version, deleted)
+
+    def _merge(
+        self, entries: List[Dict[str, Any]], next_segment: int, version: int
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        while len(entries) >= 2:
+            older, newer = (Segment(self.path, entry["name"], entry["deleted"]) for entry in entries[-2:])
+            if older.live_rows > newer.live_rows:
+                break
+            live = [(segment, np.flatnonzero(~segment.deleted_mask())) for segment in (older, newer)]
+            name = f"segment-{next_segment:08d}"
+            next_segment += 1
+            write_segment(
+                self.path,
+                name,
+                [segment.job(int(row)) for segment, rows in live for row in rows],
+                np.concatenate([segment.vectors[rows] for segment, rows in live]),
+            )
+            entries[-2:] = [{"name": name, "deleted": None}]
+            logger.debug(f"Merged {older.name} and {newer.name} into {name} at version {version}")
+        return entries, next_segment
+
+    def _publish(self, manifest: Dict[str, Any]) -> None:
+        publish_manifest(self.path, manifest)
+        self._refresh()
+        self._remove_unreferenced_files()
+
+    def _remove_unreferenced_files(self) -> None:
+        # readers still mapping a removed file keep their mapping; new readers only see the new manifest
+        referenced = {MANIFEST, WRITER_LOCK}
+        for entry in self._manifest["segments"]:
+            referenced.update(segment_files(entry["name"]))
+            if entry["deleted"]:
+                referenced.add(entry["deleted"])
+        # only files the store itself writes are collected; anything else in the directory is left alone
+        for filename in os.listdir(self.path):
+            file_path = os.path.join(self.path, filename)
+            if filename not in referenced and STORE_FILE.fullmatch(filename) and os.path.isfile(file_path):
+                os.remove(file_path)
@@ -0,0 +1,123 @@
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.common.cache import LRUCache
+from src.vector_store.filters import to_metadata_filter
+from src.vector_store.indexes.inverted import InvertedIndex
+from src.vector_store.interface import VectorStore
+from src.vector_store.models import JobVectorStore
+
+
+class NumpyStore(VectorStore):
+    """In-memory store that keeps every normalised embedding in one contiguous float32 matrix"""
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        query_embedding_cache: Optional[LRUCache[List[float]]] = None,
+        embedding_model: Optional[str] = None,
+        initial_capacity: int = 1024,
+    ):
+        if initial_capacity < 1:
+            raise ValueError("initial_capacity must be at least 1")
+        self.embedding: Embeddings = embedding
+        self.query_embedding: Embeddings = self.cached_query_embedding(
+            embedding, query_embedding_cache, embedding_model
+        )
+        self.initial_capacity = initial_capacity
+        self._vectors: Optional[np.ndarray] = None
+        self._size = 0
+        self._jobs: List[JobVectorStore] = []
+        self._rows: Dict[str, int] = {}
+        self._inverted_index = InvertedIndex()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add_job_details(self, job_details: List[JobVectorStore]) -> None:
+        # a job repeated within one batch keeps its last version
+        unique_jobs = list({job_detail.job_id: job_detail for job_detail in job_details}.values())
+        if not unique_jobs:
+            return
+        vectors = self._normalize(
+            np.asarray(
+                self.embedding.embed_documents([job.get_combined_text_document() for job in unique_jobs]),
+                dtype=np.float32,
+            )
+        )
+
+        with self._lock:
+            self._ensure_capacity(self._size + len(unique_jobs), vectors.shape[1])
+            assert self._vectors is not None
+            for job, vector in zip(unique_jobs, vectors):
+                job = job.model_copy(update={"score": None})
+                row = self._rows.get(job.job_id)
+                if row is None:
+                    row = self._size
+                    self._rows[job.job_id] = row
+                    self._jobs.append(job)
+                    self._size += 1
+                else:
+                    self._inverted_index.remove(row, self._jobs[row].get_metadata())
+                    self._jobs[row] = job
+                self._inverted_index.add(row, job.get_metadata())
+                self._vectors[row] = vector
+
+    def similarity_search(
+        self, query: str, top_k: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> list[JobVectorStore]:
+        query_vector = self._normalize(np.asarray(self.query_embedding.embed_query(query), dtype=np.float32))
+        metadata_filter = to_metadata_filter(filters)
+
+        with self._lock:
+            if self._vectors is None or self._size == 0 or top_k < 1:
+                return []
+            if metadata_filter:
+                rows = self._inverted_index.rows(metadata_filter)
+                if len(rows) * 4 < self._size:
+                    scores = self._vectors[rows] @ query_vector
+                else:
+                    # gathering most of the matrix costs more than scoring all of it
+                    scores = (self._vectors[: self._size] @ query_vector)[rows]
+            else:
+                rows = None
+                scores = self._vectors[: self._size] @ query_vector
+            top_k = min(top_k, len(scores))
+            top = np.argpartition(-scores, top_k - 1)[:top_k] if top_k < len(scores) else np.arange(len(scores))
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return [
+                self._jobs[int(rows[position]) if rows is not None else position].model_copy(
+                    update={"score": float(scores[position])}
+                )
+                for position in top
+            ]
+
+    def get_job_details(self, job_id: str) -> Optional[JobVectorStore]:
+        with self._lock:
+            row = self._rows.get(job_id)
+            return self._jobs[row] if row is not None else None
+
+    def _ensure_capacity(self, size: int, dimension: int) -> None:
+        if self._vectors is None:
+            self._vectors = np.empty((max(self.initial_capacity, size), dimension), dtype=np.float32)
+            return
+        if self._vectors.shape[1] != dimension:
+            raise ValueError(f"Embedding dimension {dimension} does not match store dimension {self._vectors.shape[1]}")
+        capacity = self._vectors.shape[0]
+        if size <= capacity:
+            return
+        # grow geometrically so appends stay amortised O(1)
+        while capacity < size:
+            capacity *= 2
+        vectors = np.empty((capacity, dimension), dtype=np.float32)
+        vectors[: self._size] = self._vectors[: self._size]
+        self._vectors = vectors
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
@@ -0,0 +1,206 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from langchain_core.embeddings import Embeddings
+
+from src.common.cache import LRUCache
+from src.logger import get_logger
+from src.vector_store.filters import FILTER_FIELDS, FILTERABLE_FIELDS, filter_value, to_metadata_filter
+from src.vector_store.interface import PartialUpsertError, VectorStore
+from src.vector_store.models import JobVectorStore
+
+logger = get_logger(__name__)
+
+# partition of jobs without a value in the partition field
+UNKNOWN_PARTITION = "unknown"
+# joins the store namespace and the partition value into the partition's namespace
+PARTITION_SEPARATOR = "__"
+
+
+def partitions_in(namespace: str, namespaces: Iterable[str]) -> List[str]:
+    """The partitions of a PartitionedStore in namespace among existing namespaces, such as an index's"""
+    prefix = f"{namespace}{PARTITION_SEPARATOR}"
+    return sorted(name[len(prefix) :] for name in namespaces if name.startswith(prefix) and len(name) > len(prefix))
+
+
+class PartitionedStore(VectorStore):
+    """One store per value of partition_field, each in the namespace <namespace>__<value>"""
+
+    def __init__(
+        self,
+        store_factory: Callable[[str], VectorStore],
+        namespace: str,
+        partition_field: str = "job_country",
+        partitions: Iterable[str] = (),
+        search_concurrency: int = 4,
+        query_embedding: Optional[Embeddings] = None,
+        unpartitioned: Optional[VectorStore] = None,
+        job_partitions_size: int = 100_000,
+    ):
+        partition_field = FILTER_FIELDS.get(partition_field.casefold(), partition_field.casefold())
+        if partition_field not in FILTERABLE_FIELDS:
+            raise ValueError(f"partition_field must be one of {', '.join(FILTERABLE_FIELDS)}")
+        if search_concurrency < 1:
+            raise ValueError("search_concurrency must be at least 1")
+        self.store_factory = store_factory
+        self.namespace = namespace
+        self.partition_field = partition_field
+        self.search_concurrency = search_concurrency
+        self.query_embedding = query_embedding
+        self.unpartitioned = unpartitioned
+        self._stores: Dict[str, VectorStore] = {}
+        # job id -> partition, for recently upserted jobs; older ones are looked up in every partition
+        self._job_partitions: LRUCache[str] = LRUCache(max_size=job_partitions_size)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=search_concurrency, thread_name_prefix="partition-search")
+        for partition in partitions:
+            self._create_store(partition)
+
+    @property
+    def partitions(self) -> List[str]:
+        with self._lock:
+            return sorted(self._stores)
+
+    def partition_namespace(self, partition: str) -> str:
+        return f"{self.namespace}{PARTITION_SEPARATOR}{partition}"
+
+    def partition_of(self, job_detail: JobVectorStore) -> str:
+        return filter_value(getattr(job_detail, self.partition_field)) or UNKNOWN_PARTITION
+
+    def search_namespaces(self, filters: Optional[Dict[str, Any]] = None) -> List[str]:
+        """
+        Searches filtered on the partition field depend on their partitions only; any other
+        search depends on every partition, including ones created after it ran.
+        """
+        selected = to_metadata_filter(filters).get(self.partition_field)
+        if selected is None:
+            return [self.namespace]
+        return [self.partition_namespace(partition) for partition in sorted(selected)]
+
+    def upsert_namespaces(self, job_details: List[JobVectorStore]) -> List[str]:
+        partitions = {self.partition_of(job_detail) for job_detail in job_details}
+        return [self.namespace] + [self.partition_namespace(partition) for partition in sorted(partitions)]
+
+    def add_job_details(self, job_details: List[JobVectorStore]) -> None:
+        by_partition: Dict[str, List[JobVectorStore]] = {}
+        for job_detail in job_details:
+            by_partition.setdefault(self.partition_of(job_detail), []).append(job_detail)
+        # partitions are written one after another; stores chunk and parallelise their own upserts.
+        # A failing partition does not stop the others, the failures are reported once they are written.
+        failed_ids: List[str] = []
+        errors: List[Exception] = []
+        for partition, partition_jobs in by_partition.items():
+            try:
+                self._create_store(partition).add_job_details(partition_jobs)
+            except PartialUpsertError as e:
+                failed_ids.extend(e.failed_ids)
+                errors.extend(e.errors)
+            except Exception as e:
+                logger.error(f"Upserting {len(partition_jobs)} jobs into partition '{partition}' failed: {str(e)}")
+                failed_ids.extend(job_detail.job_id for job_detail in partition_jobs)
+                errors.append(e)
+            with self._lock:
+                for job_detail in partition_jobs:
+                    self._job_partitions.set(job_detail.job_id, partition)
+        if errors:
+            raise PartialUpsertError(failed_ids=failed_ids, upserted=len(job_details) - len(failed_ids), errors=errors)
+        logger.debug(f"Upserted {len(job_details)} jobs into {len(by_partition)} partition(s)")
+
+    def similarity_search(
+        self, query: str, top_k: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> list[JobVectorStore]:
+        selected = to_metadata_filter(filters).get(self.partition_field)
+        with self._lock:
+            # partitions nothing was upserted into hold no jobs
+            stores = [
+                store for partition, store in sorted(self._stores.items()) if selected is None or partition in selected
+            ]
+        # every job of a partition matches its value, so the partitions need not filter on it again
+        partition_filters = {
+            key: value
+            for key, value in (filters or {}).items()
+            if FILTER_FIELDS.get(key.casefold(), key.casefold()) != self.partition_field
+        }
+        searches = [(store, partition_filters) for store in stores]
+        if self.unpartitioned is not None and (selected is None or selected):
+            searches.append((self.unpartitioned, filters or {}))
+        if not searches:
+            return []
+
+        def search(store_filters: Tuple[VectorStore, Dict[str, Any]]) -> list[JobVectorStore]:
+            store, store_filter = store_filters
+            search_kwargs: Dict[str, Any] = {"filters": store_filter} if store_filter else {}
+            return store.similarity_search(query, top_k=top_k, **search_kwargs)
+
+        if len(searches) == 1:
+            return search(searches[0])
+        partition_results = list(self._executor.map(search, searches))
+        logger.debug(f"Searched {len(searches)} partitions for query '{query}'")
+        return self._merge(partition_results, top_k)
+
+    @staticmethod
+    def _merge(partition_results: List[list[JobVectorStore]], top_k: int) -> list[JobVectorStore]:
+        """The top_k results of all partitions by score; results without a score rank last"""
+
+        def rank(job: JobVectorStore) -> float:
+            return -job.score if job.score is not None else float("inf")
+
+        best: Dict[str, JobVectorStore] = {}
+        for results in partition_results:
+            for job in results:
+                current = best.get(job.job_id)
+                if current is None or rank(job) < rank(current):
+                    best[job.job_id] = job
+        return sorted(best.values(), key=rank)[:top_k]
+
+    def get_job_details(self, job_id: str) -> Optional[JobVectorStore]:
+        with self._lock:
+            partition = self._job_partitions.get(job_id)
+            stores = [self._stores[partition]] if partition is not None else [*self._stores.values()]
+        if partition is None and self.unpartitioned is not None:
+            stores.append(self.unpartitioned)
+
+        def lookup(store: VectorStore) -> Optional[JobVectorStore]:
+            return store.get_job_details(job_id)
+
+        for job in self._executor.map(lookup, stores):
+            if job is not None:
+                return job
+        return None
+
+    def get_job_details_many(self, job_ids: Sequence[str]) -> Dict[str, JobVectorStore]:
+        by_store: Dict[int, Tuple[VectorStore, List[str]]] = {}
+        unknown: List[str] = []
+        with self._lock:
+            for job_id in job_ids:
+                partition = self._job_partitions.get(job_id)
+                if partition is None:
+                    unknown.append(job_id)
+                else:
+                    store = self._stores[partition]
+                    by_store.setdefault(id(store), (store, []))[1].append(job_id)
+            # ids of unknown partition are looked up everywhere, as get_job_details does
+            if unknown:
+                for store in [*self._stores.values(), *([self.unpartitioned] if self.unpartitioned else [])]:
+                    by_store.setdefault(id(store), (store, []))[1].extend(unknown)
+        jobs: Dict[str, JobVectorStore] = {}
+        for found in self._executor.map(lambda lookup: lookup[0].get_job_details_many(lookup[1]), by_store.values()):
+            for job_id, job in found.items():
+                jobs.setdefault(job_id, job)
+        return jobs
+
+    def close(self) -> None:
+        """Stop the search threads and close the partition stores"""
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            stores = [*self._stores.values(), *([self.unpartitioned] if self.unpartitioned else [])]
+        for store in stores:
+            store.close()
+
+    def _create_store(self, partition: str) -> VectorStore:
+        with self._lock:
+            store = self._stores.get(partition)
+            if store is None:
+                store = self._stores[partition] = self.store_factory(self.partition_namespace(partition))
+            return store
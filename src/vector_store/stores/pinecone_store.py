@@ -1,70 +1,263 @@
-from typing import List
+import copy
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
 
+import urllib3
 from pinecone import Index, Pinecone
 
 from config import settings
-from src.vector_store.interface import VectorStore
+from src.common.cache import LRUCache
+from src.logger import get_logger
+from src.vector_store.embeddings.micro_batching_embeddings import MicroBatchingEmbeddings
+from src.vector_store.embeddings.pinecone_embeddings import PineconeInferenceEmbeddings
+from src.vector_store.filters import FILTERABLE_FIELDS, MetadataFilter, filter_value, to_metadata_filter
+from src.vector_store.interface import PartialUpsertError, VectorStore
 from src.vector_store.models import JobVectorStore
 
+logger = get_logger(__name__)
+
+# record fields returned by searches: everything JobVectorStore needs, but not the combined
+# description the index embeds, which repeats the other fields and is the bulk of each record
+SEARCH_FIELDS = [field for field in JobVectorStore.model_fields if field != "score"]
+# failures to reach Pinecone at all, raised below its API exceptions
+TRANSPORT_ERRORS = (ConnectionError, TimeoutError, urllib3.exceptions.HTTPError)
+
+
+def chunk_records(records: List[Dict[str, Any]], max_records: int, max_bytes: int) -> List[List[Dict[str, Any]]]:
+    """
+    Split records, in order, into chunks of at most max_records records and about max_bytes of
+    JSON payload. A record bigger than max_bytes on its own gets a chunk of its own.
+    """
+    chunks: List[List[Dict[str, Any]]] = []
+    chunk: List[Dict[str, Any]] = []
+    chunk_bytes = 0
+    for record in records:
+        record_bytes = len(json.dumps(record, separators=(",", ":")).encode())
+        if chunk and (len(chunk) == max_records or chunk_bytes + record_bytes > max_bytes):
+            chunks.append(chunk)
+            chunk, chunk_bytes = [], 0
+        chunk.append(record)
+        chunk_bytes += record_bytes
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def is_retryable(error: Exception) -> bool:
+    """Throttling, server errors and transport errors are retried; client and programming errors are not"""
+    # the status attribute differs between pinecone client versions
+    status = getattr(error, "status", None) or getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    return isinstance(error, TRANSPORT_ERRORS)
+
+
+def normalized_field(field: str) -> str:
+    """Record field holding the normalised value of a filterable field, which filters compare against"""
+    return f"{field}_normalized"
+
+
+def case_variants(value: str) -> List[str]:
+    """Spellings of a normalised value that records without normalised fields commonly carry"""
+    return sorted({value, value.upper(), value.title(), value.capitalize()})
+
+
+def to_pinecone_filter(metadata_filter: MetadataFilter, legacy_fields: bool = False) -> Dict[str, Any]:
+    """
+    Pinecone metadata filter for a structured filter, over the normalised copies of the fields.
+    With legacy_fields, records written before the copies existed match on case variants of the raw field.
+    """
+    normalized: Dict[str, Any] = {
+        normalized_field(field): {"$eq": next(iter(values))} if len(values) == 1 else {"$in": sorted(values)}
+        for field, values in sorted(metadata_filter.items())
+    }
+    if not legacy_fields:
+        return normalized
+    clauses: List[Dict[str, Any]] = []
+    for field, values in sorted(metadata_filter.items()):
+        variants = sorted({variant for value in values for variant in case_variants(value)})
+        clauses.append(
+            {"$or": [{normalized_field(field): normalized[normalized_field(field)]}, {field: {"$in": variants}}]}
+        )
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
 
 class PineconeStore(VectorStore):
+    """Pinecone index with integrated inference, upserting in concurrent, retried chunks"""
+
     index: Index
     namespace: str
 
-    def __init__(self):
+    def __init__(
+        self,
+        query_embedding_cache: Optional[LRUCache[List[float]]] = None,
+        upsert_batch_size: int = 96,
+        upsert_max_bytes: int = 2_000_000,
+        upsert_concurrency: int = 4,
+        upsert_retries: int = 2,
+        upsert_retry_backoff_seconds: float = 0.5,
+        legacy_filter_fallback: bool = True,
+    ):
         api_key = settings.PINECONE_API_KEY
         index_name = settings.PINECONE_INDEX
         # pinecone already has an embedding model
         pc = Pinecone(api_key=api_key)
         self.index = pc.Index(index_name)
         self.namespace = settings.PINECONE_NAMESPACE
+        # embedding queries ourselves lets repeated queries skip the embedding round trip;
+        # the model must be the one the index is integrated with. Cache misses of concurrent
+        # searches are embedded together in one inference request.
+        self.query_embedding = None
+        self._query_batcher: Optional[MicroBatchingEmbeddings] = None
+        if query_embedding_cache is not None and settings.PINECONE_EMBEDDING_MODEL:
+            self._query_batcher = MicroBatchingEmbeddings(
+                PineconeInferenceEmbeddings(client=pc, model=settings.PINECONE_EMBEDDING_MODEL),
+                max_batch_size=settings.QUERY_EMBEDDING_BATCH_SIZE,
+                max_wait_seconds=settings.QUERY_EMBEDDING_BATCH_WAIT_SECONDS,
+            )
+            self.query_embedding = self.cached_query_embedding(
+                self._query_batcher,
+                query_embedding_cache,
+                settings.PINECONE_EMBEDDING_MODEL,
+            )
+        self.upsert_batch_size = upsert_batch_size
+        self.upsert_max_bytes = upsert_max_bytes
+        self.upsert_concurrency = upsert_concurrency
+        self.upsert_retries = upsert_retries
+        self.upsert_retry_backoff_seconds = upsert_retry_backoff_seconds
+        # also match records without normalised fields, until backfill_normalized_fields has run
+        self.legacy_filter_fallback = legacy_filter_fallback
+
+    def with_namespace(self, namespace: str) -> "PineconeStore":
+        """This store in another namespace, sharing the index connection and the query embeddings"""
+        store = copy.copy(self)
+        store.namespace = namespace
+        return store
+
+    def close(self) -> None:
+        """Stop the query embedding batcher, which stores in other namespaces share"""
+        if self._query_batcher is not None:
+            self._query_batcher.close()
+
+    def list_namespaces(self) -> List[str]:
+        """Namespaces of the index that hold records, the default one as ''"""
+        return sorted(self.index.describe_index_stats().namespaces)
 
     def add_job_details(self, job_details: List[JobVectorStore]) -> None:
         # TODO: better id
-        to_store_vector_stores = []
-        for job_detail in job_details:
-            record_id = job_detail.job_id
-            to_store_vector_stores.append(
-                {
-                    "id": record_id,
-                    "description": job_detail.get_combined_text_document(),
-                    **job_detail.model_dump(),
-                }
+        records = [self._to_record(job_detail) for job_detail in job_details]
+        chunks = chunk_records(records, self.upsert_batch_size, self.upsert_max_bytes)
+        if len(chunks) <= 1 or self.upsert_concurrency <= 1:
+            results = [self._upsert_chunk(chunk) for chunk in chunks]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(self.upsert_concurrency, len(chunks)), thread_name_prefix="pinecone-upsert"
+            ) as executor:
+                results = list(executor.map(self._upsert_chunk, chunks))
+
+        failures = [(chunk, error) for chunk, error in zip(chunks, results) if error is not None]
+        if failures:
+            failed_ids = [record["id"] for chunk, _ in failures for record in chunk]
+            raise PartialUpsertError(
+                failed_ids=failed_ids,
+                upserted=len(records) - len(failed_ids),
+                errors=[error for _, error in failures],
             )
-        # remove None values in to_store_vector_stores
-        to_store_vector_stores = [
-            {k: v for k, v in record.items() if v is not None} for record in to_store_vector_stores
-        ]
-        self.index.upsert_records(self.namespace, to_store_vector_stores)
-
-    def similarity_search(self, query: str) -> list[JobVectorStore]:
-        reranked_results = self.index.search(
-            namespace=self.namespace,
-            query={"top_k": 5, "inputs": {"text": query}},
-            rerank={
-                "model": "bge-reranker-v2-m3",
-                "top_n": 5,
-                "rank_fields": ["description"],
-                "parameters": {
-                    "truncate": "END",
-                },
-            },
+        logger.debug(f"Upserted {len(records)} records in {len(chunks)} chunk(s)")
+
+    def _upsert_chunk(self, records: List[Dict[str, Any]]) -> Optional[Exception]:
+        """Upsert one chunk with retries, returning the last error if it never succeeded"""
+        attempt = 0
+        while True:
+            try:
+                self.index.upsert_records(self.namespace, records)
+                return None
+            except Exception as e:
+                if attempt >= self.upsert_retries or not is_retryable(e):
+                    logger.error(f"Upserting a chunk of {len(records)} records failed: {str(e)}")
+                    return e
+                logger.warning(f"Upserting a chunk of {len(records)} records failed, retrying: {str(e)}")
+                time.sleep(self.upsert_retry_backoff_seconds * 2**attempt)
+                attempt += 1
+
+    def _to_record(self, job_detail: JobVectorStore) -> Dict[str, Any]:
+        # pinecone rejects None values, so they are left out of the record
+        return {
+            "id": job_detail.job_id,
+            "description": job_detail.get_combined_text_document(),
+            **job_detail.model_dump(exclude_none=True),
+            **self._normalized_fields(job_detail),
+        }
+
+    @staticmethod
+    def _normalized_fields(job_detail: JobVectorStore) -> Dict[str, str]:
+        # pinecone compares strings exactly, so filters match lowercased copies rather than the vendor's spelling
+        normalized = {field: filter_value(getattr(job_detail, field)) for field in FILTERABLE_FIELDS}
+        return {normalized_field(field): value for field, value in normalized.items() if value is not None}
+
+    def similarity_search(
+        self, query: str, top_k: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> list[JobVectorStore]:
+        # reranking is a separate stage of the search pipeline (see VectorStoreService)
+        metadata_filter = to_metadata_filter(filters)
+        if any(not values for values in metadata_filter.values()):
+            # contradicting filters match nothing
+            return []
+        search_query: Dict[str, Any] = {"top_k": top_k, "inputs": {"text": query}}
+        if self.query_embedding is not None:
+            search_query = {"top_k": top_k, "vector": {"values": self.query_embedding.embed_query(query)}}
+        if metadata_filter:
+            search_query["filter"] = to_pinecone_filter(metadata_filter, legacy_fields=self.legacy_filter_fallback)
+        search_results = self.index.search(namespace=self.namespace, query=search_query, fields=SEARCH_FIELDS)
+        return [self._to_job_vector_store(hit.fields, score=hit._score) for hit in search_results.result.hits]
+
+    def backfill_normalized_fields(self, batch_size: int = 100) -> int:
+        """Add the normalised filter fields to records written without them, returning how many were updated"""
+        updated = 0
+        # list yields the record ids of the namespace a page at a time
+        for job_ids in self.index.list(namespace=self.namespace, limit=batch_size):
+            fetched = self.index.fetch(ids=job_ids, namespace=self.namespace)
+            for job_id, record in fetched.vectors.items():
+                metadata = record.metadata or {}
+                values = {normalized_field(field): filter_value(metadata.get(field)) for field in FILTERABLE_FIELDS}
+                normalized = {field: value for field, value in values.items() if value is not None}
+                if normalized and any(metadata.get(field) != value for field, value in normalized.items()):
+                    # metadata updates keep the record's vector, so nothing is re-embedded
+                    self.index.update(id=job_id, set_metadata=normalized, namespace=self.namespace)
+                    updated += 1
+        logger.info(f"Backfilled normalised filter fields of {updated} records in namespace '{self.namespace}'")
+        return updated
+
+    def get_job_details(self, job_id: str) -> Optional[JobVectorStore]:
+        fetched = self.index.fetch(ids=[job_id], namespace=self.namespace)
+        record = fetched.vectors.get(job_id)
+        if record is None or not record.metadata:
+            return None
+        return self._to_job_vector_store(record.metadata)
+
+    def get_job_details_many(self, job_ids: Sequence[str]) -> Dict[str, JobVectorStore]:
+        # one fetch round trip for every id
+        if not job_ids:
+            return {}
+        fetched = self.index.fetch(ids=list(job_ids), namespace=self.namespace)
+        return {
+            job_id: self._to_job_vector_store(record.metadata)
+            for job_id, record in fetched.vectors.items()
+            if record.metadata
+        }
+
+    def _to_job_vector_store(self, fields: Dict[str, Any], score: Optional[float] = None) -> JobVectorStore:
+        return JobVectorStore(
+            job_id=fields.get("job_id"),
+            job_title=fields.get("job_title"),
+            job_description=fields.get("job_description"),
+            job_apply_link=fields.get("job_apply_link"),
+            employer_name=fields.get("employer_name"),
+            job_city=fields.get("job_city"),
+            job_state=fields.get("job_state"),
+            job_country=fields.get("job_country"),
+            location_string=fields.get("location_string"),
+            score=score,
         )
-        reranked_results_hits = reranked_results.result.hits
-        job_vector_stores = []
-        for hit in reranked_results_hits:
-            fields = hit.fields
-            job_vector_store = JobVectorStore(
-                job_id=fields.get("job_id"),
-                job_title=fields.get("job_title"),
-                job_description=fields.get("job_description"),
-                job_apply_link=fields.get("job_apply_link"),
-                employer_name=fields.get("employer_name"),
-                job_city=fields.get("job_city"),
-                job_state=fields.get("job_state"),
-                job_country=fields.get("job_country"),
-                location_string=fields.get("location_string"),
-                score=hit._score,
-            )
-            job_vector_stores.append(job_vector_store)
-        return job_vector_stores
@@ -0,0 +1,266 @@
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.common.cache import LRUCache
+from src.logger import get_logger
+from src.vector_store.filters import to_metadata_filter
+from src.vector_store.indexes.inverted import InvertedIndex
+from src.vector_store.indexes.quantization import ProductQuantizer, Quantizer, ScalarQuantizer
+from src.vector_store.interface import VectorStore
+from src.vector_store.models import JobVectorStore
+
+logger = get_logger(__name__)
+
+QUANTIZATIONS = ("int8", "pq")
+# the header records the dimension of the rows in the vectors file, the jobs file one job per row
+HEADER_FILE = "store.json"
+JOBS_FILE = "jobs.jsonl"
+FORMAT_VERSION = 1
+
+
+class QuantizedStore(VectorStore):
+    """
+    Local store that keeps compressed codes in memory and the full vectors on disk.
+    A store opened on a path written before reloads its jobs, retrains its codes and appends.
+    """
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        path: str,
+        quantization: str = "int8",
+        pq_subspaces: int = 64,
+        rescore_factor: int = 4,
+        min_train_size: int = 1024,
+        max_train_size: int = 16384,
+        query_embedding_cache: Optional[LRUCache[List[float]]] = None,
+        embedding_model: Optional[str] = None,
+    ):
+        if quantization not in QUANTIZATIONS:
+            raise ValueError(f"quantization must be one of {QUANTIZATIONS}, got '{quantization}'")
+        if rescore_factor < 1:
+            raise ValueError("rescore_factor must be at least 1")
+        self.embedding: Embeddings = embedding
+        self.query_embedding: Embeddings = self.cached_query_embedding(
+            embedding, query_embedding_cache, embedding_model
+        )
+        self.quantization = quantization
+        self.pq_subspaces = pq_subspaces
+        self.rescore_factor = rescore_factor
+        self.min_train_size = min_train_size
+        self.max_train_size = max_train_size
+        os.makedirs(path, exist_ok=True)
+        self.vectors_path = os.path.join(path, "vectors.f32")
+        self.header_path = os.path.join(path, HEADER_FILE)
+        self.jobs_path = os.path.join(path, JOBS_FILE)
+        self.dimension: Optional[int] = None
+        self.quantizer: Optional[Quantizer] = None
+        self._trained_size = 0
+        # codes live in a buffer that grows geometrically; rows past len(self) are unused
+        self._code_buffer = np.empty((0, 0), dtype=np.uint8)
+        self._vectors: Optional[np.memmap] = None
+        self._jobs: List[JobVectorStore] = []
+        self._rows: Dict[str, int] = {}
+        self._inverted_index = InvertedIndex()
+        self._lock = threading.RLock()
+        if os.path.exists(self.header_path):
+            self._load()
+        elif os.path.exists(self.vectors_path) and os.path.getsize(self.vectors_path) > 0:
+            # without a header the rows cannot be matched to jobs, so the file is left untouched
+            raise ValueError(f"{self.vectors_path} holds vectors but no {HEADER_FILE}; use an empty path")
+        open(self.vectors_path, "ab").close()
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    @property
+    def _codes(self) -> np.ndarray:
+        return self._code_buffer[: len(self._jobs)]
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes of codes held in memory for the stored jobs"""
+        return self._codes.nbytes
+
+    def add_job_details(self, job_details: List[JobVectorStore]) -> None:
+        unique_jobs = list({job_detail.job_id: job_detail for job_detail in job_details}.values())
+        if not unique_jobs:
+            return
+        vectors = np.asarray(
+            self.embedding.embed_documents([job.get_combined_text_document() for job in unique_jobs]),
+            dtype=np.float32,
+        )
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.where(norms == 0, 1, norms)
+
+        with self._lock:
+            if self.dimension is None:
+                self.dimension = vectors.shape[1]
+                self._code_buffer = np.empty((1024, self._code_size()), dtype=np.uint8)
+                with open(self.header_path, "w") as f:
+                    json.dump({"version": FORMAT_VERSION, "dimension": self.dimension}, f)
+            elif vectors.shape[1] != self.dimension:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match store dimension {self.dimension}"
+                )
+
+            new_rows = []
+            stored_jobs = []
+            for job, vector in zip(unique_jobs, vectors):
+                job = job.model_copy(update={"score": None})
+                stored_jobs.append(job)
+                row = self._rows.get(job.job_id)
+                if row is None:
+                    row = len(self._jobs)
+                    self._rows[job.job_id] = row
+                    self._jobs.append(job)
+                    new_rows.append(vector)
+                else:
+                    self._inverted_index.remove(row, self._jobs[row].get_metadata())
+                    self._jobs[row] = job
+                    self._overwrite(row, vector)
+                self._inverted_index.add(row, job.get_metadata())
+            if new_rows:
+                self._append(np.stack(new_rows))
+            # written after the vectors, so a reopened store never has a job without its row
+            with open(self.jobs_path, "a") as f:
+                f.write("".join(f"{job.model_dump_json()}\n" for job in stored_jobs))
+            self._maybe_train()
+
+    def similarity_search(
+        self, query: str, top_k: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> list[JobVectorStore]:
+        query_vector = np.asarray(self.query_embedding.embed_query(query), dtype=np.float32)
+        norm = np.linalg.norm(query_vector)
+        query_vector = query_vector / norm if norm else query_vector
+        metadata_filter = to_metadata_filter(filters)
+
+        with self._lock:
+            size = len(self._jobs)
+            if size == 0 or top_k < 1:
+                return []
+            vectors = self._mapped_vectors()
+            rows = self._inverted_index.rows(metadata_filter) if metadata_filter else np.arange(size)
+            shortlist = min(top_k * self.rescore_factor, len(rows))
+            if self.quantizer is not None and shortlist < len(rows):
+                approximate = self.quantizer.scores(self._codes[rows] if metadata_filter else self._codes, query_vector)
+                candidates = np.sort(rows[np.argpartition(-approximate, shortlist - 1)[:shortlist]])
+            else:
+                candidates = rows
+            # exact re-scoring of the shortlist with the full-precision vectors on disk
+            exact = vectors[candidates] @ query_vector
+            order = np.argsort(-exact, kind="stable")[:top_k]
+            return [
+                self._jobs[int(candidates[position])].model_copy(update={"score": float(exact[position])})
+                for position in order
+            ]
+
+    def get_job_details(self, job_id: str) -> Optional[JobVectorStore]:
+        with self._lock:
+            row = self._rows.get(job_id)
+            return self._jobs[row] if row is not None else None
+
+    def _load(self) -> None:
+        """Reload the jobs and vectors a previous store wrote, dropping the tail of an interrupted upsert"""
+        with open(self.header_path) as f:
+            header = json.load(f)
+        dimension = header.get("dimension")
+        if header.get("version") != FORMAT_VERSION or not isinstance(dimension, int) or dimension < 1:
+            raise ValueError(f"{self.header_path} is not a version {FORMAT_VERSION} QuantizedStore header")
+        self.dimension = dimension
+
+        jobs_bytes = b""
+        if os.path.exists(self.jobs_path):
+            with open(self.jobs_path, "rb") as f:
+                jobs_bytes = f.read()
+            complete = jobs_bytes.rfind(b"\n") + 1
+            if complete < len(jobs_bytes):
+                os.truncate(self.jobs_path, complete)
+                jobs_bytes = jobs_bytes[:complete]
+        # a re-added job is written again; its last line wins and it keeps the row of its first one
+        for line in jobs_bytes.splitlines():
+            job = JobVectorStore.model_validate_json(line)
+            row = self._rows.setdefault(job.job_id, len(self._jobs))
+            if row == len(self._jobs):
+                self._jobs.append(job)
+            else:
+                self._jobs[row] = job
+
+        rows_bytes = len(self._jobs) * dimension * 4
+        vectors_bytes = os.path.getsize(self.vectors_path) if os.path.exists(self.vectors_path) else 0
+        if vectors_bytes < rows_bytes:
+            raise ValueError(
+                f"{self.vectors_path} holds {vectors_bytes // (dimension * 4)} vectors of dimension {dimension} "
+                f"for {len(self._jobs)} jobs"
+            )
+        if vectors_bytes > rows_bytes:
+            os.truncate(self.vectors_path, rows_bytes)
+
+        for row, job in enumerate(self._jobs):
+            self._inverted_index.add(row, job.get_metadata())
+        self._code_buffer = np.empty((max(1024, len(self._jobs)), self._code_size()), dtype=np.uint8)
+        self._maybe_train()
+        logger.info(f"Reopened {len(self._jobs)} jobs of dimension {dimension} from {self.vectors_path}")
+
+    def _code_size(self) -> int:
+        assert self.dimension is not None
+        return self.dimension if self.quantization == "int8" else self.pq_subspaces
+
+    def _new_quantizer(self) -> Quantizer:
+        assert self.dimension is not None
+        if self.quantization == "int8":
+            return ScalarQuantizer(self.dimension)
+        return ProductQuantizer(self.dimension, subspaces=self.pq_subspaces)
+
+    def _append(self, vectors: np.ndarray) -> None:
+        """Write rows for jobs already appended to self._jobs"""
+        with open(self.vectors_path, "ab") as f:
+            f.write(vectors.astype(np.float32).tobytes())
+        self._vectors = None
+        size = len(self._jobs)
+        capacity = len(self._code_buffer)
+        if size > capacity:
+            while capacity < size:
+                capacity *= 2
+            code_buffer = np.empty((capacity, self._code_size()), dtype=np.uint8)
+            code_buffer[: size - len(vectors)] = self._code_buffer[: size - len(vectors)]
+            self._code_buffer = code_buffer
+        # codes are not used before the first training, which re-encodes every row
+        if self.quantizer is not None:
+            self._code_buffer[size - len(vectors) : size] = self.quantizer.encode(vectors)
+
+    def _overwrite(self, row: int, vector: np.ndarray) -> None:
+        assert self.dimension is not None
+        with open(self.vectors_path, "r+b") as f:
+            f.seek(row * self.dimension * 4)
+            f.write(vector.astype(np.float32).tobytes())
+        self._vectors = None
+        if self.quantizer is not None:
+            self._codes[row] = self.quantizer.encode(vector[np.newaxis])[0]
+
+    def _maybe_train(self) -> None:
+        size = len(self._jobs)
+        if size < self.min_train_size or (self._trained_size and size < 2 * self._trained_size):
+            return
+        vectors = self._mapped_vectors()
+        rng = np.random.default_rng()
+        sample = np.sort(rng.choice(size, self.max_train_size, replace=False)) if size > self.max_train_size else None
+        quantizer = self._new_quantizer()
+        quantizer.fit(np.asarray(vectors[sample] if sample is not None else vectors))
+        self._code_buffer[:size] = quantizer.encode(vectors)
+        self.quantizer = quantizer
+        self._trained_size = size
+        logger.info(f"Trained {self.quantization} quantizer on {min(size, self.max_train_size)} of {size} vectors")
+
+    def _mapped_vectors(self) -> np.memmap:
+        assert self.dimension is not None
+        if self._vectors is None:
+            self._vectors = np.memmap(
+                self.vectors_path, dtype=np.float32, mode="r", shape=(len(self._jobs), self.dimension)
+            )
+        return self._vectors
@@ -1,4 +1,4 @@
-from typing import List
+from typing import AsyncIterable, AsyncIterator, List
 
 from src.job_searcher.models import JobDetails
 from src.vector_store.models import JobVectorStore
@@ -6,17 +6,21 @@ from src.vector_store.models import JobVectorStore
 
 class VectorTransformerService:
     def transform(self, data: List[JobDetails]) -> List[JobVectorStore]:
-        return [
-            JobVectorStore(
-                job_id=job_detail.job_id,
-                job_title=job_detail.title,
-                job_description=job_detail.description,
-                job_apply_link=job_detail.job_url,
-                employer_name=job_detail.company,
-                job_city=job_detail.city,
-                job_state=job_detail.state,
-                job_country=job_detail.country,
-                location_string=job_detail.location,
-            )
-            for job_detail in data
-        ]
+        return [self.transform_one(job_detail) for job_detail in data]
+
+    async def transform_stream(self, data: AsyncIterable[JobDetails]) -> AsyncIterator[JobVectorStore]:
+        async for job_detail in data:
+            yield self.transform_one(job_detail)
+
+    def transform_one(self, job_detail: JobDetails) -> JobVectorStore:
+        return JobVectorStore(
+            job_id=job_detail.job_id,
+            job_title=job_detail.title,
+            job_description=job_detail.description,
+            job_apply_link=job_detail.job_url,
+            employer_name=job_detail.company,
+            job_city=job_detail.city,
+            job_state=job_detail.state,
+            job_country=job_detail.country,
+            location_string=job_detail.location,
+        )
@@ -1,3 +1,5 @@
+from typing import List, Optional
+
 from polyfactory.factories.pydantic_factory import ModelFactory
 
 from src.vector_store.models import JobVectorStore
@@ -5,3 +7,22 @@ from src.vector_store.models import JobVectorStore
 
 class JobVectorStoreFactory(ModelFactory[JobVectorStore]):
     __model__ = JobVectorStore
+
+
+class TitleOnlyJobFactory(JobVectorStoreFactory):
+    """Jobs whose embedded text holds nothing but their title, for fake keyword embeddings"""
+
+    job_description = ""
+    employer_name = None
+    location_string = None
+    job_country = "US"
+
+    @classmethod
+    def numbered(
+        cls, count: int, start: int = 0, title: str = "Job", country: Optional[str] = None
+    ) -> List[JobVectorStore]:
+        """Jobs "<title> #<i>" with id i; unless a country is given, even ones are in Germany, odd ones in Austria"""
+        return [
+            cls.build(job_id=str(i), job_title=f"{title} #{i}", job_country=country or ("DE" if i % 2 == 0 else "AT"))
+            for i in range(start, start + count)
+        ]
@@ -0,0 +1,89 @@
+import asyncio
+from typing import AsyncIterator, List
+
+import pytest
+
+from src.common.async_pipeline import batched, flatten, prefetch
+
+
+async def arange(n: int) -> AsyncIterator[int]:
+    for i in range(n):
+        yield i
+
+
+async def collect(source) -> List:
+    return [item async for item in source]
+
+
+class TestFlatten:
+    """Test cases for flatten"""
+
+    @pytest.mark.asyncio
+    async def test_flatten(self):
+        """Test that nested iterables are flattened in order"""
+
+        async def pages():
+            yield [1, 2]
+            yield []
+            yield [3]
+
+        assert await collect(flatten(pages())) == [1, 2, 3]
+
+
+class TestBatched:
+    """Test cases for batched"""
+
+    @pytest.mark.asyncio
+    async def test_batches_with_remainder(self):
+        """Test that the last batch holds the remainder"""
+        assert await collect(batched(arange(5), 2)) == [[0, 1], [2, 3], [4]]
+
+    @pytest.mark.asyncio
+    async def test_empty_source(self):
+        """Test that an empty source yields no batches"""
+        assert await collect(batched(arange(0), 2)) == []
+
+    @pytest.mark.asyncio
+    async def test_invalid_size(self):
+        """Test that a non-positive size is rejected"""
+        with pytest.raises(ValueError):
+            await collect(batched(arange(1), 0))
+
+
+class TestPrefetch:
+    """Test cases for prefetch"""
+
+    @pytest.mark.asyncio
+    async def test_yields_all_items_in_order(self):
+        """Test that prefetching does not change the items or their order"""
+        assert await collect(prefetch(arange(5), max_buffered=2)) == [0, 1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_producer_is_bounded_by_buffer(self):
+        """Test that the producer never runs more than max_buffered items ahead"""
+        produced = 0
+
+        async def source():
+            nonlocal produced
+            for i in range(10):
+                produced += 1
+                yield i
+
+        stream = prefetch(source(), max_buffered=2)
+        assert await stream.__anext__() == 0
+        await asyncio.sleep(0.01)
+
+        # one item consumed, two buffered and one blocked on the full queue
+        assert produced <= 4
+        await stream.aclose()
+
+    @pytest.mark.asyncio
+    async def test_producer_errors_are_raised_to_consumer(self):
+        """Test that an exception in the producer surfaces in the consumer"""
+
+        async def failing():
+            yield 1
+            raise RuntimeError("vendor down")
+
+        with pytest.raises(RuntimeError, match="vendor down"):
+            await collect(prefetch(failing()))
@@ -0,0 +1,86 @@
+from unittest.mock import patch
+
+import pytest
+
+from src.common.cache import LRUCache
+
+
+class TestLRUCache:
+    """Test cases for LRUCache"""
+
+    def test_get_missing_key_returns_none(self):
+        """Test that a missing key is a miss"""
+        cache: LRUCache[str] = LRUCache(max_size=2)
+
+        assert cache.get("missing") is None
+        assert cache.misses == 1
+        assert cache.hits == 0
+
+    def test_set_then_get(self):
+        """Test that a stored value is returned and counted as a hit"""
+        cache: LRUCache[str] = LRUCache(max_size=2)
+        cache.set("a", "value")
+
+        assert cache.get("a") == "value"
+        assert cache.hits == 1
+
+    def test_evicts_least_recently_used(self):
+        """Test that the least recently used entry is evicted when full"""
+        cache: LRUCache[int] = LRUCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" is now the least recently used
+        cache.set("c", 3)
+
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_clear(self):
+        """Test that clear drops every entry"""
+        cache: LRUCache[int] = LRUCache(max_size=2)
+        cache.set("a", 1)
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.get("a") is None
+
+    def test_stats_hit_rate(self):
+        """Test that stats report the hit rate"""
+        cache: LRUCache[int] = LRUCache(max_size=2)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("b")
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["size"] == 1
+
+    def test_invalid_max_size(self):
+        """Test that a non-positive max_size is rejected"""
+        with pytest.raises(ValueError):
+            LRUCache(max_size=0)
+
+    def test_expired_entries_are_misses(self):
+        """Test that entries older than the TTL are dropped"""
+        cache: LRUCache[int] = LRUCache(max_size=2, ttl_seconds=10)
+        with patch("src.common.cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+        with patch("src.common.cache.time.monotonic", return_value=105.0):
+            assert cache.get("a") == 1
+        with patch("src.common.cache.time.monotonic", return_value=111.0):
+            assert cache.get("a") is None
+
+        assert len(cache) == 0
+        assert cache.misses == 1
+
+    def test_pop_removes_entry(self):
+        """Test that pop returns and removes the entry"""
+        cache: LRUCache[int] = LRUCache(max_size=2)
+        cache.set("a", 1)
+
+        assert cache.pop("a") == 1
+        assert cache.pop("a") is None
@@ -0,0 +1,11 @@
+from src.common.hashing import content_hash
+
+
+class TestContentHash:
+    """Test cases for content_hash"""
+
+    def test_is_stable_and_content_sensitive(self):
+        """Test that equal text hashes equally and any change gives a different hash"""
+        assert content_hash("python developer") == content_hash("python developer")
+        assert content_hash("python developer") != content_hash("python developer ")
+        assert len(content_hash("")) == 32
@@ -0,0 +1,32 @@
+from src.common.normalization import normalize_filters, normalize_query
+
+
+class TestNormalizeQuery:
+    """Test cases for normalize_query"""
+
+    def test_case_and_whitespace_are_normalized(self):
+        """Test that case and repeated whitespace do not matter"""
+        assert normalize_query("  Senior   Python\tEngineer ") == "senior python engineer"
+
+
+class TestNormalizeFilters:
+    """Test cases for normalize_filters"""
+
+    def test_empty_filters(self):
+        """Test that missing filters normalize to an empty tuple"""
+        assert normalize_filters(None) == ()
+        assert normalize_filters({}) == ()
+
+    def test_order_and_case_do_not_matter(self):
+        """Test that filter ordering and value case do not change the result"""
+        assert normalize_filters({"country": "DE", "city": "Berlin"}) == normalize_filters(
+            {"city": "berlin", "country": "de"}
+        )
+
+    def test_none_values_are_dropped(self):
+        """Test that unset filters are ignored"""
+        assert normalize_filters({"country": "de", "city": None}) == (("country", "de"),)
+
+    def test_list_values_are_sorted(self):
+        """Test that multi-valued filters are order independent"""
+        assert normalize_filters({"country": ["US", "de"]}) == (("country", ("de", "us")),)
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from src.common.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test cases for SingleFlight"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_computation(self):
+        """Test that concurrent calls with the same key run the function once"""
+        single_flight: SingleFlight[int] = SingleFlight()
+        calls = 0
+        release = asyncio.Event()
+
+        async def compute() -> int:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return 42
+
+        callers = [asyncio.create_task(single_flight.do("key", compute)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*callers) == [42] * 5
+        assert calls == 1
+        assert not single_flight.in_flight("key")
+
+    @pytest.mark.asyncio
+    async def test_different_keys_do_not_coalesce(self):
+        """Test that calls with different keys run independently"""
+        single_flight: SingleFlight[str] = SingleFlight()
+
+        async def compute(value: str) -> str:
+            await asyncio.sleep(0)
+            return value
+
+        results = await asyncio.gather(
+            single_flight.do("a", lambda: compute("a")),
+            single_flight.do("b", lambda: compute("b")),
+        )
+
+        assert results == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_does_not_cancel_followers(self):
+        """Test that cancelling the first caller leaves the shared work running"""
+        single_flight: SingleFlight[int] = SingleFlight()
+        release = asyncio.Event()
+
+        async def compute() -> int:
+            await release.wait()
+            return 7
+
+        leader = asyncio.create_task(single_flight.do("key", compute))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(single_flight.do("key", compute))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await follower == 7
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+    @pytest.mark.asyncio
+    async def test_exceptions_are_shared_and_key_is_released(self):
+        """Test that every caller sees the error and the key can be retried"""
+        single_flight: SingleFlight[int] = SingleFlight()
+
+        async def fail() -> int:
+            await asyncio.sleep(0)
+            raise RuntimeError("vendor down")
+
+        results = await asyncio.gather(
+            single_flight.do("key", fail), single_flight.do("key", fail), return_exceptions=True
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert not single_flight.in_flight("key")
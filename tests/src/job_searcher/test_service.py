@@ -1,5 +1,5 @@
-from typing import Any, Dict, List, Optional
-from unittest.mock import Mock
+from typing import Any, Dict, List, Optional, Set
+from unittest.mock import Mock, call
 
 import pytest
 
@@ -70,6 +70,16 @@ class TestJobSearcher:
         with pytest.raises(ValueError, match="API error"):
             await service.search_jobs("test query")
 
+    @pytest.mark.asyncio
+    async def test_get_job_details_delegates_to_vendor(self, mock_vendor, sample_job_details):
+        """Test that get_job_details delegates to the vendor"""
+        service = JobSearcher(vendor=mock_vendor)
+
+        result = await service.get_job_details("job-1")
+
+        assert result == sample_job_details[0]
+        mock_vendor.get_job_details.assert_called_once_with("job-1")
+
     @pytest.mark.asyncio
     async def test_search_jobs_delegates_to_vendor(self, mock_vendor, sample_job_details):
         """Test that search_jobs properly delegates to the vendor"""
@@ -378,3 +388,60 @@ class TestJobSearcherDeduplication:
         assert result[0].job_id == "1"
         assert result[1].job_id == "2"
         # The third job should be filtered out as it has the same URL as the first
+
+    def test_deduplicate_jobs_across_calls(self):
+        """Test deduplication across calls sharing a job_hashes set"""
+        vendor = Mock(spec=JobSearchVendor)
+        vendor.get_vendor_name.return_value = "test_vendor"
+        service = JobSearcher(vendor=vendor)
+        first_page = JobDetailsFactory.batch(2)
+        second_page = [JobDetailsFactory.build(job_url=first_page[0].job_url), JobDetailsFactory.build()]
+        job_hashes: Set[str] = set()
+
+        assert service.deduplicate_jobs(first_page, job_hashes) == first_page
+        assert service.deduplicate_jobs(second_page, job_hashes) == [second_page[1]]
+        assert len(job_hashes) == 3
+
+
+class TestJobSearcherPagination:
+    """Test page-by-page job fetching"""
+
+    @pytest.mark.asyncio
+    async def test_iter_job_pages_requests_each_page(self, mock_vendor, sample_job_details):
+        """Test that every page is requested with the page number added to the filters"""
+        service = JobSearcher(vendor=mock_vendor)
+
+        pages = [page async for page in service.iter_job_pages("python", {"country": "de"}, num_pages=3)]
+
+        assert pages == [sample_job_details] * 3
+        assert mock_vendor.search_jobs.call_args_list == [
+            call("python", {"country": "de", "page": 1}),
+            call("python", {"country": "de", "page": 2}),
+            call("python", {"country": "de", "page": 3}),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_iter_job_pages_stops_at_empty_page(self, mock_vendor, sample_job_details):
+        """Test that paging stops at the first empty page"""
+        mock_vendor.search_jobs.side_effect = [sample_job_details, [], sample_job_details]
+        service = JobSearcher(vendor=mock_vendor)
+
+        pages = [page async for page in service.iter_job_pages("python", None, num_pages=3)]
+
+        assert pages == [sample_job_details]
+        assert mock_vendor.search_jobs.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_deduplicate_stream(self):
+        """Test that the streaming dedupe drops jobs with an already seen URL"""
+        vendor = Mock(spec=JobSearchVendor)
+        vendor.get_vendor_name.return_value = "test_vendor"
+        service = JobSearcher(vendor=vendor)
+        first = JobDetailsFactory.build()
+        second = JobDetailsFactory.build()
+
+        async def jobs():
+            for job in [first, second, JobDetailsFactory.build(job_url=first.job_url)]:
+                yield job
+
+        assert [job async for job in service.deduplicate_stream(jobs())] == [first, second]
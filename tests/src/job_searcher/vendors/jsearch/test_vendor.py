@@ -99,6 +99,21 @@ class TestJSearchVendorSearchJobs:
         assert call_args[1]["params"]["country"] == "us"
         assert call_args[1]["params"]["date_posted"] == "all"
 
+    @pytest.mark.asyncio
+    async def test_search_jobs_with_page_filter(self, jsearch_vendor):
+        """Test that the page filter is forwarded to the JSearch API"""
+        mock_http_client = MagicMock()
+        jsearch_vendor.http_client = mock_http_client
+        mock_response = Mock()
+        mock_response.json.return_value = JSearchSearchResponseFactory.build(data=[]).model_dump()
+        mock_http_client.get = AsyncMock(return_value=mock_response)
+
+        await jsearch_vendor.search_jobs("software engineer", {"country": "us", "page": 3})
+
+        params = mock_http_client.get.call_args[1]["params"]
+        assert params["page"] == "3"
+        assert params["country"] == "us"
+
     @pytest.mark.asyncio
     @pytest.mark.parametrize(
         "exception_type,expected_message",
@@ -0,0 +1,95 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.common.cache import LRUCache
+from src.job_searcher.service import JobSearcher
+from src.services.job_detail_service import JobDetailService
+from src.vector_store.models import JobVectorStore
+from src.vector_store.service import VectorStoreService
+from src.vector_store.vector_transformer.service import VectorTransformerService
+from tests.factories.job_searcher import JobDetailsFactory
+from tests.factories.vector_store import JobVectorStoreFactory
+
+
+@pytest.fixture
+def job_searcher() -> Mock:
+    job_searcher = Mock(spec=JobSearcher)
+    job_searcher.get_job_details = AsyncMock(return_value=JobDetailsFactory.build(job_id="vendor-job"))
+    return job_searcher
+
+
+@pytest.fixture
+def vector_store_service() -> Mock:
+    vector_store_service = Mock(spec=VectorStoreService)
+    vector_store_service.get_job_details.return_value = None
+    return vector_store_service
+
+
+@pytest.fixture
+def job_detail_service(job_searcher, vector_store_service) -> JobDetailService:
+    return JobDetailService(
+        job_searcher=job_searcher,
+        vector_store_service=vector_store_service,
+        vector_transformer_service=VectorTransformerService(),
+        cache=LRUCache[JobVectorStore](max_size=16),
+        prefetch_top_n=2,
+    )
+
+
+class TestJobDetailService:
+    """Test cases for JobDetailService"""
+
+    @pytest.mark.asyncio
+    async def test_store_hit_is_cached(self, job_detail_service, job_searcher, vector_store_service):
+        """Test that a job found in the store is cached and the vendor is not called"""
+        job = JobVectorStoreFactory.build()
+        vector_store_service.get_job_details.return_value = job
+
+        assert await job_detail_service.get_job_details(job.job_id) == job
+        assert await job_detail_service.get_job_details(job.job_id) == job
+
+        vector_store_service.get_job_details.assert_called_once_with(job.job_id)
+        job_searcher.get_job_details.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_vendor(self, job_detail_service, job_searcher, vector_store_service):
+        """Test that a job missing from the store is fetched from the vendor"""
+        result = await job_detail_service.get_job_details("vendor-job")
+
+        assert result is not None
+        assert result.job_id == "vendor-job"
+        job_searcher.get_job_details.assert_called_once_with("vendor-job")
+        assert job_detail_service.cache.get("vendor-job") == result
+
+    @pytest.mark.asyncio
+    async def test_vendor_failure_returns_none(self, job_detail_service, job_searcher):
+        """Test that a vendor error is treated as not found and nothing is cached"""
+        job_searcher.get_job_details.side_effect = Exception("Job not found")
+
+        assert await job_detail_service.get_job_details("missing") is None
+        assert len(job_detail_service.cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_prefetch_seeds_cache_with_top_results(self, job_detail_service, vector_store_service):
+        """Test that prefetch caches the top N results without looking them up again"""
+        results = JobVectorStoreFactory.batch(3, score=0.5)
+
+        await job_detail_service.prefetch(results)
+
+        assert job_detail_service.cache.get(results[0].job_id) == results[0].model_copy(update={"score": None})
+        assert job_detail_service.cache.get(results[1].job_id) is not None
+        assert job_detail_service.cache.get(results[2].job_id) is None
+        vector_store_service.get_job_details.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_prefetch_fetches_results_without_description(self, job_detail_service, job_searcher):
+        """Test that results lacking a description are fetched concurrently"""
+        results = [JobVectorStoreFactory.build(job_id="vendor-job", job_description="")]
+
+        await job_detail_service.prefetch(results)
+        await asyncio.sleep(0)
+
+        job_searcher.get_job_details.assert_called_once_with("vendor-job")
+        assert job_detail_service.cache.get("vendor-job") is not None
@@ -0,0 +1,383 @@
+import asyncio
+import threading
+from functools import partial
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from src.job_searcher.service import JobSearcher
+from src.services.job_search_service import JobSearchService
+from src.services.semantic_query_cache import SemanticQueryCache
+from src.vector_store.interface import PartialUpsertError
+from src.vector_store.rerankers.interface import RerankOptions
+from src.vector_store.search_cache import SimilaritySearchCache
+from src.vector_store.service import VectorStoreService
+from src.vector_store.stores.memory_store import MemoryStore
+from src.vector_store.vector_transformer.service import VectorTransformerService
+from tests.factories.job_searcher import JobDetailsFactory
+from tests.factories.vector_store import JobVectorStoreFactory
+
+
+@pytest.fixture
+def job_searcher() -> Mock:
+    job_searcher = Mock(spec=JobSearcher)
+    jobs = JobDetailsFactory.batch(3)
+    job_searcher.search_jobs = AsyncMock(return_value=jobs)
+    job_searcher.deduplicate_jobs.return_value = jobs
+    # the streaming helpers run for real on top of the mocked search_jobs
+    job_searcher.iter_job_pages = partial(JobSearcher.iter_job_pages, job_searcher)
+    job_searcher.deduplicate_stream = partial(JobSearcher.deduplicate_stream, job_searcher)
+    job_searcher._job_hash = JobSearcher._job_hash
+    return job_searcher
+
+
+@pytest.fixture
+def vector_store_service() -> Mock:
+    vector_store_service = Mock(spec=VectorStoreService)
+    vector_store_service.add_job_details_stream = partial(
+        VectorStoreService.add_job_details_stream, vector_store_service
+    )
+    vector_store_service.similarity_search.return_value = JobVectorStoreFactory.batch(2)
+    return vector_store_service
+
+
+@pytest.fixture
+def job_search_service(job_searcher, vector_store_service) -> JobSearchService:
+    return JobSearchService(
+        job_searcher=job_searcher,
+        vector_store_service=vector_store_service,
+        vector_transformer_service=VectorTransformerService(),
+    )
+
+
+class TestJobSearchService:
+    """Test cases for JobSearchService"""
+
+    def test_get_semantic_search_query_is_normalized(self, job_search_service):
+        """Test that case and whitespace do not change the semantic query"""
+        assert job_search_service.get_semantic_search_query("Python  Developer") == "python developer"
+
+    def test_get_search_key_is_normalized(self, job_search_service):
+        """Test that equivalent searches share the same key"""
+        assert job_search_service.get_search_key("Python  Developer", {"country": "DE"}) == (
+            job_search_service.get_search_key("python developer", {"country": "de"})
+        )
+
+    @pytest.mark.asyncio
+    async def test_search_relevant_jobs(self, job_search_service, job_searcher, vector_store_service):
+        """Test the search, upsert and similarity search pipeline"""
+        results = await job_search_service.search_relevant_jobs("python", {"country": "de"})
+
+        assert results == vector_store_service.similarity_search.return_value
+        job_searcher.search_jobs.assert_awaited_once_with("python", {"country": "de", "page": 1})
+        vector_store_service.add_job_details.assert_called_once()
+        vector_store_service.similarity_search.assert_called_once_with(
+            "python", top_k=None, filters={"country": "de"}, rerank=None
+        )
+
+    @pytest.mark.asyncio
+    async def test_partial_upsert_failure_still_searches(self, job_search_service, vector_store_service):
+        """Test that jobs stored before an upsert failure are still searched instead of failing the request"""
+        vector_store_service.add_job_details.side_effect = PartialUpsertError(
+            failed_ids=["1"], upserted=2, errors=[OSError("unavailable")]
+        )
+
+        results = await job_search_service.search_relevant_jobs("python", {"country": "de"})
+
+        assert results == vector_store_service.similarity_search.return_value
+
+    @pytest.mark.asyncio
+    async def test_search_relevant_jobs_passes_rerank_options(self, job_search_service, vector_store_service):
+        """Test that per-request rerank options reach the similarity search"""
+        rerank = RerankOptions(candidates=20)
+
+        await job_search_service.search_relevant_jobs("python", {"country": "de"}, top_k=3, rerank=rerank)
+
+        vector_store_service.similarity_search.assert_called_once_with(
+            "python", top_k=3, filters={"country": "de"}, rerank=rerank
+        )
+
+    @pytest.mark.asyncio
+    async def test_search_relevant_jobs_without_jobs(self, job_search_service, job_searcher, vector_store_service):
+        """Test that jobs indexed by earlier searches are still found when the vendor has nothing new"""
+        job_searcher.search_jobs.return_value = []
+
+        results = await job_search_service.search_relevant_jobs("python", {"country": "de"})
+
+        assert results == vector_store_service.similarity_search.return_value
+        vector_store_service.add_job_details.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_failed_upsert_still_searches(self, job_search_service, vector_store_service):
+        """Test that the index is searched even when none of the vendor jobs could be upserted"""
+        vector_store_service.add_job_details.side_effect = PartialUpsertError(
+            failed_ids=["1", "2", "3"], upserted=0, errors=[OSError("unavailable")]
+        )
+
+        results = await job_search_service.search_relevant_jobs("python", {"country": "de"})
+
+        assert results == vector_store_service.similarity_search.return_value
+
+    @pytest.mark.asyncio
+    async def test_semantic_search_runs_off_the_event_loop(self, job_search_service, vector_store_service):
+        """Test that the blocking similarity search and rerank of a search run in a worker thread"""
+        threads = []
+        vector_store_service.similarity_search.side_effect = (
+            lambda *args, **kwargs: threads.append(threading.current_thread()) or []
+        )
+
+        await job_search_service.search_relevant_jobs("python", {"country": "de"})
+
+        assert len(threads) == 1
+        assert threads[0] is not threading.main_thread()
+
+    @pytest.mark.asyncio
+    async def test_ingest_vendor_page_upserts_off_the_event_loop(
+        self, job_search_service, job_searcher, vector_store_service
+    ):
+        """Test that a vendor page is transformed and upserted in a worker thread"""
+        threads = []
+        vector_store_service.add_job_details.side_effect = lambda *args: threads.append(threading.current_thread())
+
+        fetched = await job_search_service.ingest_vendor_page("python", {"country": "de"}, 2)
+
+        assert fetched == 3
+        job_searcher.search_jobs.assert_awaited_once_with("python", {"country": "de", "page": 2})
+        assert len(threads) == 1
+        assert threads[0] is not threading.main_thread()
+
+    @pytest.mark.asyncio
+    async def test_identical_concurrent_searches_are_coalesced(self, job_search_service, job_searcher):
+        """Test that identical in-flight searches share one vendor call"""
+        release = asyncio.Event()
+        jobs = JobDetailsFactory.batch(2)
+
+        async def slow_search(*args, **kwargs):
+            await release.wait()
+            return jobs
+
+        job_searcher.search_jobs.side_effect = slow_search
+        searches = [
+            asyncio.create_task(job_search_service.search_relevant_jobs("Python", {"country": "DE"})),
+            asyncio.create_task(job_search_service.search_relevant_jobs("python ", {"country": "de"})),
+        ]
+        await asyncio.sleep(0)
+        release.set()
+
+        first, second = await asyncio.gather(*searches)
+
+        assert first == second
+        job_searcher.search_jobs.assert_awaited_once()
+
+
+class TestJobSearchServiceSearchCache:
+    """Test cases for the similarity search cache behind the ingest-then-search flow"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_identical_search_hits_the_cache(self, job_searcher):
+        """Test that re-ingesting the same vendor jobs keeps the cached search results"""
+        store = Mock(spec=MemoryStore)
+        store.namespace = "jobs"
+        store.search_namespaces.return_value = ["jobs"]
+        store.upsert_namespaces.return_value = ["jobs"]
+        store.similarity_search.return_value = JobVectorStoreFactory.batch(2)
+        search_cache = SimilaritySearchCache()
+        service = JobSearchService(
+            job_searcher=job_searcher,
+            vector_store_service=VectorStoreService(store, search_cache=search_cache),
+            vector_transformer_service=VectorTransformerService(),
+        )
+
+        results = [await service.search_relevant_jobs("python", {"country": "de"}) for _ in range(3)]
+
+        assert results[0] == results[1] == results[2]
+        assert store.add_job_details.call_count == 3
+        store.similarity_search.assert_called_once()
+        assert search_cache.stats()["hits"] == 2
+        assert search_cache.generation("jobs") == 1
+
+
+class TestJobSearchServiceStreaming:
+    """Test cases for JobSearchService.stream_relevant_jobs"""
+
+    @staticmethod
+    def iter_pages(*pages):
+        async def iter_job_pages(query, filters=None, num_pages=1):
+            for page in pages:
+                yield page
+
+        return iter_job_pages
+
+    @pytest.mark.asyncio
+    async def test_events_are_emitted_in_order(self, job_search_service, job_searcher, vector_store_service):
+        """Test that index matches, vendor pages and the final ranking are streamed in order"""
+        first_page, second_page = JobDetailsFactory.batch(2), JobDetailsFactory.batch(1)
+        job_searcher.iter_job_pages = self.iter_pages(first_page, second_page)
+        job_searcher.deduplicate_jobs.side_effect = lambda jobs, job_hashes: jobs
+
+        events = [event async for event in job_search_service.stream_relevant_jobs("python", {"country": "de"}, 2)]
+
+        assert [event["event"] for event in events] == ["index_matches", "vendor_jobs", "vendor_jobs", "final"]
+        assert [len(event["jobs"]) for event in events[1:3]] == [2, 1]
+        assert [event["page"] for event in events[1:3]] == [1, 2]
+        assert vector_store_service.add_job_details.call_count == 2
+        vector_store_service.similarity_search.assert_called_with("python", filters={"country": "de"}, rerank=None)
+
+    @pytest.mark.asyncio
+    async def test_no_vendor_results_reuses_index_matches(self, job_search_service, job_searcher, vector_store_service):
+        """Test that the final event reuses index matches when the vendor returns nothing new"""
+        job_searcher.iter_job_pages = self.iter_pages()
+
+        events = [event async for event in job_search_service.stream_relevant_jobs("python", {"country": "de"})]
+
+        assert [event["event"] for event in events] == ["index_matches", "final"]
+        assert events[1]["jobs"] == vector_store_service.similarity_search.return_value
+        vector_store_service.similarity_search.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_vector_store_work_runs_off_the_event_loop(
+        self, job_search_service, job_searcher, vector_store_service
+    ):
+        """Test that the blocking upsert and searches run in worker threads, not on the event loop"""
+        job_searcher.iter_job_pages = self.iter_pages(JobDetailsFactory.batch(2))
+        job_searcher.deduplicate_jobs.side_effect = lambda jobs, job_hashes: jobs
+        threads = []
+        vector_store_service.similarity_search.side_effect = (
+            lambda *args, **kwargs: threads.append(threading.current_thread()) or []
+        )
+        vector_store_service.add_job_details.side_effect = lambda *args: threads.append(threading.current_thread())
+
+        _ = [event async for event in job_search_service.stream_relevant_jobs("python", {"country": "de"})]
+
+        assert len(threads) == 3
+        assert threading.main_thread() not in threads
+
+
+class TestJobSearchServiceBatch:
+    """Test cases for JobSearchService.search_relevant_jobs_batch"""
+
+    @pytest.mark.asyncio
+    async def test_equivalent_searches_run_once(self, job_search_service, job_searcher, vector_store_service):
+        """Test that equivalent searches share the vendor call and the semantic search"""
+        results = await job_search_service.search_relevant_jobs_batch(
+            [("Python", {"country": "DE"}), ("python", {"country": "de"}), ("java", {"country": "de"})]
+        )
+
+        assert len(results) == 3
+        assert results[0] == results[1]
+        assert job_searcher.search_jobs.await_count == 2
+        assert vector_store_service.similarity_search.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_vendor_results_are_upserted_once(self, job_search_service, job_searcher, vector_store_service):
+        """Test that vendor results are deduplicated across searches before a single upsert"""
+        shared_job = JobDetailsFactory.build()
+        job_searcher.search_jobs.side_effect = [[shared_job], [shared_job, JobDetailsFactory.build()]]
+        job_searcher.deduplicate_jobs.side_effect = JobSearcher(vendor=Mock()).deduplicate_jobs
+
+        await job_search_service.search_relevant_jobs_batch([("python", {"country": "de"}), ("java", None)])
+
+        vector_store_service.add_job_details.assert_called_once()
+        upserted = vector_store_service.add_job_details.call_args[0][0]
+        assert len(upserted) == 2
+
+    @pytest.mark.asyncio
+    async def test_vendor_failure_does_not_fail_batch(self, job_search_service, job_searcher, vector_store_service):
+        """Test that a failing vendor call still returns index results for that search"""
+        job_searcher.search_jobs.side_effect = [RuntimeError("vendor down"), JobDetailsFactory.batch(1)]
+
+        results = await job_search_service.search_relevant_jobs_batch([("python", None), ("java", None)])
+
+        assert results == [vector_store_service.similarity_search.return_value] * 2
+
+    @pytest.mark.asyncio
+    async def test_search_failure_does_not_fail_batch(self, job_search_service, vector_store_service):
+        """Test that a failing semantic search is returned as its error while the other searches succeed"""
+        error = RuntimeError("index unavailable")
+        found = vector_store_service.similarity_search.return_value
+
+        def similarity_search(query, **kwargs):
+            if query == "java":
+                raise error
+            return found
+
+        vector_store_service.similarity_search.side_effect = similarity_search
+
+        results = await job_search_service.search_relevant_jobs_batch(
+            [("python", None), ("java", None), ("Java", None)]
+        )
+
+        assert results == [found, error, error]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_budget_is_respected(self, job_searcher, vector_store_service):
+        """Test that no more than batch_concurrency vendor calls run at once"""
+        running = max_running = 0
+
+        async def search_jobs(query, filters=None):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return []
+
+        job_searcher.search_jobs.side_effect = search_jobs
+        service = JobSearchService(
+            job_searcher=job_searcher,
+            vector_store_service=vector_store_service,
+            vector_transformer_service=VectorTransformerService(),
+            batch_concurrency=2,
+        )
+
+        await service.search_relevant_jobs_batch([(f"query {i}", None) for i in range(6)])
+
+        assert max_running == 2
+
+
+class TestJobSearchServiceSemanticCache:
+    """Test cases for near-duplicate query caching in JobSearchService"""
+
+    @pytest.mark.asyncio
+    async def test_near_duplicate_query_skips_vendor_and_search(self, job_searcher, vector_store_service):
+        """Test that a near-duplicate query is served without a vendor call or similarity search"""
+        mock_embedding = Mock(spec=Embeddings)
+        mock_embedding.aembed_query = AsyncMock(side_effect=[[1.0, 0.0], [0.99, 0.01]])
+        service = JobSearchService(
+            job_searcher=job_searcher,
+            vector_store_service=vector_store_service,
+            vector_transformer_service=VectorTransformerService(),
+            query_embedding=mock_embedding,
+            semantic_query_cache=SemanticQueryCache(max_distance=0.05),
+        )
+
+        first = await service.search_relevant_jobs("senior python engineer germany", {"country": "de"})
+        second = await service.search_relevant_jobs("Senior Python Developer in Germany", {"country": "de"})
+
+        assert first == second
+        job_searcher.search_jobs.assert_awaited_once()
+        vector_store_service.similarity_search.assert_called_once()
+
+
+class TestJobSearchServiceIngestion:
+    """Test cases for the streaming ingestion pipeline"""
+
+    @pytest.mark.asyncio
+    async def test_ingest_job_pages_dedupes_across_pages_and_batches(self, job_searcher, vector_store_service):
+        """Test that pages are deduplicated across the whole stream and upserted in fixed-size chunks"""
+        first_page = JobDetailsFactory.batch(3)
+        second_page = [JobDetailsFactory.build(job_url=first_page[0].job_url), *JobDetailsFactory.batch(2)]
+        job_searcher.search_jobs.side_effect = [first_page, second_page, []]
+        service = JobSearchService(
+            job_searcher=job_searcher,
+            vector_store_service=vector_store_service,
+            vector_transformer_service=VectorTransformerService(),
+            ingest_batch_size=2,
+        )
+
+        upserted = await service.ingest_job_pages("python", {"country": "de"}, num_pages=3)
+
+        assert upserted == 5
+        assert [len(call.args[0]) for call in vector_store_service.add_job_details.call_args_list] == [2, 2, 1]
+        assert job_searcher.search_jobs.await_count == 3
@@ -0,0 +1,126 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.common.cache import LRUCache
+from src.services.job_search_service import JobSearchService
+from src.services.models import SearchResultSet
+from src.services.paginated_job_search_service import InvalidCursorError, PaginatedJobSearchService
+from src.vector_store.rerankers.interface import RerankOptions
+from tests.factories.vector_store import JobVectorStoreFactory
+
+
+@pytest.fixture
+def job_search_service() -> Mock:
+    job_search_service = Mock(spec=JobSearchService)
+    job_search_service.search_relevant_jobs = AsyncMock(return_value=JobVectorStoreFactory.batch(2))
+    job_search_service.ingest_vendor_page = AsyncMock(return_value=10)
+    return job_search_service
+
+
+@pytest.fixture
+def paginated_service(job_search_service) -> PaginatedJobSearchService:
+    return PaginatedJobSearchService(job_search_service=job_search_service, result_sets=LRUCache[SearchResultSet]())
+
+
+class TestPaginatedJobSearchService:
+    """Test cases for PaginatedJobSearchService"""
+
+    @pytest.mark.asyncio
+    async def test_first_page_runs_plain_search(self, paginated_service, job_search_service):
+        """Test that the first page is a plain search with top_k set to the page size"""
+        results, cursor = await paginated_service.search_first_page("python", {"country": "de"}, page_size=2)
+
+        assert results == job_search_service.search_relevant_jobs.return_value
+        assert cursor is not None
+        job_search_service.search_relevant_jobs.assert_awaited_once_with(
+            "python", {"country": "de"}, top_k=2, rerank=None
+        )
+        job_search_service.ingest_vendor_page.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_short_first_page_has_no_cursor(self, paginated_service):
+        """Test that no cursor is issued when the first page is not full"""
+        _, cursor = await paginated_service.search_first_page("python", {"country": "de"}, page_size=5)
+
+        assert cursor is None
+
+    @pytest.mark.asyncio
+    async def test_next_page_fetches_vendor_page_and_skips_returned_jobs(self, paginated_service, job_search_service):
+        """Test that a deeper page fetches the next vendor page and only returns new jobs"""
+        first_page = job_search_service.search_relevant_jobs.return_value
+        second_page = JobVectorStoreFactory.batch(2)
+        job_search_service.semantic_search.return_value = first_page + second_page
+        _, cursor = await paginated_service.search_first_page("python", {"country": "de"}, page_size=2)
+
+        results, next_cursor = await paginated_service.search_next_page(cursor)
+
+        assert results == second_page
+        assert next_cursor is not None and next_cursor != cursor
+        job_search_service.ingest_vendor_page.assert_awaited_once_with("python", {"country": "de"}, 2)
+        job_search_service.semantic_search.assert_called_once_with("python", {"country": "de"}, 4, None)
+
+    @pytest.mark.asyncio
+    async def test_exhausted_vendor_is_not_called_again(self, paginated_service, job_search_service):
+        """Test that once the vendor returns an empty page no further vendor pages are requested"""
+        job_search_service.ingest_vendor_page.return_value = 0
+        job_search_service.semantic_search.side_effect = lambda query, filters, top_k, rerank: (
+            JobVectorStoreFactory.batch(2)
+        )
+        _, cursor = await paginated_service.search_first_page("python", None, page_size=2)
+
+        _, cursor = await paginated_service.search_next_page(cursor)
+        await paginated_service.search_next_page(cursor)
+
+        job_search_service.ingest_vendor_page.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_deeper_pages_are_served_from_the_ranked_snapshot(self, paginated_service, job_search_service):
+        """Test that jobs found for a page are served in order later even if the ranking shifts meanwhile"""
+        first_page = job_search_service.search_relevant_jobs.return_value
+        more_results = JobVectorStoreFactory.batch(4)
+        job_search_service.semantic_search.return_value = first_page + more_results
+        _, cursor = await paginated_service.search_first_page("python", {"country": "de"}, page_size=2)
+
+        second_page, cursor = await paginated_service.search_next_page(cursor)
+        job_search_service.semantic_search.return_value = JobVectorStoreFactory.batch(6)
+        third_page, _ = await paginated_service.search_next_page(cursor)
+
+        assert second_page == more_results[:2]
+        assert third_page == more_results[2:]
+        job_search_service.semantic_search.assert_called_once()
+        job_search_service.ingest_vendor_page.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_vendor_failure_serves_indexed_jobs(self, paginated_service, job_search_service):
+        """Test that a failing vendor call still serves the page from the index and is retried next time"""
+        job_search_service.ingest_vendor_page.side_effect = RuntimeError("vendor unavailable")
+        job_search_service.semantic_search.side_effect = lambda query, filters, top_k, rerank: (
+            JobVectorStoreFactory.batch(2)
+        )
+        _, cursor = await paginated_service.search_first_page("python", {"country": "de"}, page_size=2)
+
+        results, cursor = await paginated_service.search_next_page(cursor)
+        job_search_service.ingest_vendor_page.side_effect = None
+        await paginated_service.search_next_page(cursor)
+
+        assert len(results) == 2
+        assert [call.args[2] for call in job_search_service.ingest_vendor_page.await_args_list] == [2, 2]
+
+    @pytest.mark.asyncio
+    async def test_next_page_keeps_rerank_options(self, paginated_service, job_search_service):
+        """Test that deeper pages rerank with the options of the first page"""
+        rerank = RerankOptions(candidates=20)
+        job_search_service.semantic_search.return_value = JobVectorStoreFactory.batch(4)
+        _, cursor = await paginated_service.search_first_page("python", None, page_size=2, rerank=rerank)
+
+        await paginated_service.search_next_page(cursor)
+
+        assert job_search_service.search_relevant_jobs.call_args[1]["rerank"] == rerank
+        job_search_service.semantic_search.assert_called_once_with("python", None, 4, rerank)
+
+    @pytest.mark.asyncio
+    async def test_unknown_cursor_is_rejected(self, paginated_service):
+        """Test that an unknown or expired cursor raises InvalidCursorError"""
+        with pytest.raises(InvalidCursorError):
+            await paginated_service.search_next_page("unknown")
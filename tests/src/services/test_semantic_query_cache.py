@@ -0,0 +1,53 @@
+from unittest.mock import patch
+
+from src.services.semantic_query_cache import SemanticQueryCache
+from tests.factories.vector_store import JobVectorStoreFactory
+
+FILTERS_KEY = ((("country", "de"),), None)
+
+
+class TestSemanticQueryCache:
+    """Test cases for SemanticQueryCache"""
+
+    def test_near_duplicate_query_is_a_hit(self):
+        """Test that a query within max_distance returns the cached results"""
+        cache = SemanticQueryCache(max_distance=0.05)
+        results = JobVectorStoreFactory.batch(2)
+        cache.set([1.0, 0.0, 0.0], FILTERS_KEY, results)
+
+        assert cache.get([0.99, 0.05, 0.0], FILTERS_KEY) == results
+        assert cache.hits == 1
+
+    def test_distant_query_is_a_miss(self):
+        """Test that a query outside max_distance is not served from the cache"""
+        cache = SemanticQueryCache(max_distance=0.05)
+        cache.set([1.0, 0.0, 0.0], FILTERS_KEY, JobVectorStoreFactory.batch(1))
+
+        assert cache.get([0.0, 1.0, 0.0], FILTERS_KEY) is None
+        assert cache.misses == 1
+
+    def test_different_filters_are_a_miss(self):
+        """Test that identical vectors with different filters do not match"""
+        cache = SemanticQueryCache()
+        cache.set([1.0, 0.0], FILTERS_KEY, JobVectorStoreFactory.batch(1))
+
+        assert cache.get([1.0, 0.0], ((("country", "us"),), None)) is None
+
+    def test_oldest_entries_are_evicted(self):
+        """Test that the cache holds at most max_entries query embeddings"""
+        cache = SemanticQueryCache(max_entries=1)
+        cache.set([1.0, 0.0], FILTERS_KEY, JobVectorStoreFactory.batch(1))
+        cache.set([0.0, 1.0], FILTERS_KEY, JobVectorStoreFactory.batch(1))
+
+        assert cache.get([1.0, 0.0], FILTERS_KEY) is None
+        assert cache.get([0.0, 1.0], FILTERS_KEY) is not None
+
+    def test_expired_entries_are_ignored(self):
+        """Test that entries older than the TTL are dropped"""
+        cache = SemanticQueryCache(ttl_seconds=10)
+        with patch("src.services.semantic_query_cache.time.monotonic", return_value=100.0):
+            cache.set([1.0, 0.0], FILTERS_KEY, JobVectorStoreFactory.batch(1))
+        with patch("src.services.semantic_query_cache.time.monotonic", return_value=111.0):
+            assert cache.get([1.0, 0.0], FILTERS_KEY) is None
+
+        assert cache.stats()["size"] == 0
@@ -1,6 +1,7 @@
-from typing import List
+from typing import Callable, List
 from unittest.mock import Mock
 
+import numpy as np
 import pytest
 from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
@@ -11,6 +12,49 @@ from src.vector_store.service import VectorStoreService
 from src.vector_store.stores.memory_store import MemoryStore
 from tests.factories.vector_store import JobVectorStoreFactory
 
+# one dimension per title, and a title close to python
+KEYWORD_VECTORS = {
+    "python": [1.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+    "java": [0.0, 1.0, 0.0, 0.0, 0.0, 0.0],
+    "rust": [0.0, 0.0, 1.0, 0.0, 0.0, 0.0],
+    "go": [0.0, 0.0, 0.0, 1.0, 0.0, 0.0],
+    "scala": [0.0, 0.0, 0.0, 0.0, 1.0, 0.0],
+    "kotlin": [0.0, 0.0, 0.0, 0.0, 0.0, 1.0],
+    "python backend": [0.9, 0.1, 0.0, 0.0, 0.0, 0.0],
+}
+SEEDED_DIMENSION = 16
+
+
+def _keyword_vector(text: str) -> List[float]:
+    for keyword, vector in sorted(KEYWORD_VECTORS.items(), key=lambda item: -len(item[0])):
+        if keyword in text.lower():
+            return vector
+    return [0.0] * len(KEYWORD_VECTORS["python"])
+
+
+def _seeded_vector(text: str) -> List[float]:
+    seed = int(text.split("#")[1].split()[0]) if "#" in text else 0
+    return np.random.default_rng(seed).standard_normal(SEEDED_DIMENSION).tolist()
+
+
+def _fake_embedding(embed: Callable[[str], List[float]]) -> Mock:
+    embedding = Mock(spec=Embeddings)
+    embedding.embed_documents.side_effect = lambda texts: [embed(text) for text in texts]
+    embedding.embed_query.side_effect = embed
+    return embedding
+
+
+@pytest.fixture
+def keyword_embedding() -> Mock:
+    """Embedding that maps a text to the vector of the longest keyword it contains"""
+    return _fake_embedding(_keyword_vector)
+
+
+@pytest.fixture
+def seeded_embedding() -> Mock:
+    """Embedding that turns "#<n>" in a text into a random vector seeded with n"""
+    return _fake_embedding(_seeded_vector)
+
 
 @pytest.fixture
 def sample_job_vector_store() -> JobVectorStore:
@@ -0,0 +1,61 @@
+from typing import List
+
+import pytest
+
+from src.common.cache import LRUCache
+from src.vector_store.embeddings.cached_query_embeddings import CachedQueryEmbeddings
+
+
+@pytest.fixture
+def query_embedding_cache() -> LRUCache[List[float]]:
+    return LRUCache[List[float]](max_size=8)
+
+
+class TestCachedQueryEmbeddings:
+    """Test cases for CachedQueryEmbeddings"""
+
+    def test_repeated_query_is_embedded_once(self, mock_embedding, query_embedding_cache):
+        """Test that a repeated query skips the underlying embedding call"""
+        embeddings = CachedQueryEmbeddings(mock_embedding, cache=query_embedding_cache)
+
+        first = embeddings.embed_query("python developer")
+        second = embeddings.embed_query("python developer")
+
+        assert first == second == mock_embedding.embed_query.return_value
+        mock_embedding.embed_query.assert_called_once_with("python developer")
+        assert query_embedding_cache.stats()["hit_rate"] == 0.5
+
+    def test_equivalent_queries_share_a_vector(self, mock_embedding, query_embedding_cache):
+        """Test that case and whitespace differences hit the same cache entry"""
+        embeddings = CachedQueryEmbeddings(mock_embedding, cache=query_embedding_cache)
+
+        embeddings.embed_query("Python   Developer")
+        embeddings.embed_query("python developer ")
+
+        mock_embedding.embed_query.assert_called_once_with("python developer")
+
+    def test_cache_namespaces_are_isolated(self, mock_embedding, query_embedding_cache):
+        """Test that wrappers for different models sharing one cache do not mix vectors"""
+        CachedQueryEmbeddings(mock_embedding, cache=query_embedding_cache, cache_namespace="a").embed_query("python")
+        CachedQueryEmbeddings(mock_embedding, cache=query_embedding_cache, cache_namespace="b").embed_query("python")
+
+        assert mock_embedding.embed_query.call_count == 2
+
+    def test_embed_documents_is_not_cached(self, mock_embedding, query_embedding_cache):
+        """Test that document embeddings are passed straight through"""
+        embeddings = CachedQueryEmbeddings(mock_embedding, cache=query_embedding_cache)
+
+        embeddings.embed_documents(["doc"])
+        embeddings.embed_documents(["doc"])
+
+        assert mock_embedding.embed_documents.call_count == 2
+        assert len(query_embedding_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_aembed_query_uses_cache(self, mock_embedding, query_embedding_cache):
+        """Test that the async path shares the cache with the sync path"""
+        embeddings = CachedQueryEmbeddings(mock_embedding, cache=query_embedding_cache)
+        embeddings.embed_query("python developer")
+
+        assert await embeddings.aembed_query("Python developer") == mock_embedding.embed_query.return_value
+        mock_embedding.aembed_query.assert_not_called()
@@ -0,0 +1,63 @@
+from unittest.mock import Mock
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from src.vector_store.embeddings.disk_cached_embeddings import DiskCachedEmbeddings
+from src.vector_store.embeddings.embedding_cache import EmbeddingCache
+
+
+@pytest.fixture
+def embedding() -> Mock:
+    embedding = Mock(spec=Embeddings)
+    embedding.embed_documents.side_effect = lambda texts: [[float(len(text)), 1.0] for text in texts]
+    embedding.embed_query.return_value = [0.0, 1.0]
+    return embedding
+
+
+class TestDiskCachedEmbeddings:
+    """Test cases for DiskCachedEmbeddings"""
+
+    def test_only_new_texts_are_embedded(self, tmp_path, embedding):
+        """Test that texts embedded before are served from the cache"""
+        embeddings = DiskCachedEmbeddings(embedding, cache=EmbeddingCache(str(tmp_path)), model="model")
+        embeddings.embed_documents(["a", "bb"])
+
+        vectors = embeddings.embed_documents(["bb", "ccc", "a"])
+
+        assert vectors == [[2.0, 1.0], [3.0, 1.0], [1.0, 1.0]]
+        assert embedding.embed_documents.call_args_list[1][0][0] == ["ccc"]
+
+    def test_restart_needs_no_embedding_calls(self, tmp_path, embedding):
+        """Test that a reindex after reopening the cache embeds nothing"""
+        texts = [f"job {i}" for i in range(10)]
+        DiskCachedEmbeddings(embedding, cache=EmbeddingCache(str(tmp_path)), model="model").embed_documents(texts)
+
+        restarted = DiskCachedEmbeddings(embedding, cache=EmbeddingCache(str(tmp_path)), model="model")
+
+        assert restarted.embed_documents(texts) == [[5.0, 1.0]] * 10
+        embedding.embed_documents.assert_called_once()
+
+    def test_models_do_not_share_vectors(self, tmp_path, embedding):
+        """Test that another model name embeds the same texts again"""
+        cache = EmbeddingCache(str(tmp_path))
+        DiskCachedEmbeddings(embedding, cache=cache, model="a").embed_documents(["text"])
+        DiskCachedEmbeddings(embedding, cache=cache, model="b").embed_documents(["text"])
+
+        assert embedding.embed_documents.call_count == 2
+
+    def test_duplicate_texts_are_embedded_once(self, tmp_path, embedding):
+        """Test that identical texts in one call share one embedding"""
+        embeddings = DiskCachedEmbeddings(embedding, cache=EmbeddingCache(str(tmp_path)), model="model")
+
+        assert embeddings.embed_documents(["a", "a"]) == [[1.0, 1.0], [1.0, 1.0]]
+        embedding.embed_documents.assert_called_once_with(["a"])
+
+    def test_queries_are_passed_through(self, tmp_path, embedding):
+        """Test that query embeddings are not cached on disk"""
+        embeddings = DiskCachedEmbeddings(embedding, cache=EmbeddingCache(str(tmp_path)), model="model")
+
+        embeddings.embed_query("python")
+        embeddings.embed_query("python")
+
+        assert embedding.embed_query.call_count == 2
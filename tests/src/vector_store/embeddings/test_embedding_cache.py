@@ -0,0 +1,113 @@
+import os
+
+import numpy as np
+import pytest
+
+from src.common.hashing import content_hash
+from src.vector_store.embeddings.embedding_cache import KEYS_FILE, VECTORS_FILE, EmbeddingCache
+
+
+class TestEmbeddingCache:
+    """Test cases for EmbeddingCache"""
+
+    def test_put_then_get(self, tmp_path):
+        """Test that stored vectors are returned and unknown hashes are None"""
+        cache = EmbeddingCache(str(tmp_path))
+        cache.put_many("model", [content_hash("a"), content_hash("b")], [[1.0, 2.0], [3.0, 4.0]])
+
+        vectors = cache.get_many("model", [content_hash("b"), content_hash("c"), content_hash("a")])
+
+        assert vectors[0].tolist() == [3.0, 4.0]
+        assert vectors[1] is None
+        assert vectors[2].tolist() == [1.0, 2.0]
+        assert vectors[0].dtype == np.float32
+
+    def test_vectors_survive_reopening(self, tmp_path):
+        """Test that a new cache on the same directory sees every stored vector"""
+        EmbeddingCache(str(tmp_path)).put_many("model", [content_hash("a")], [[0.5, 0.25]])
+
+        reopened = EmbeddingCache(str(tmp_path))
+
+        assert reopened.get_many("model", [content_hash("a")])[0].tolist() == [0.5, 0.25]
+        assert reopened.count("model") == 1
+
+    def test_namespaces_are_isolated(self, tmp_path):
+        """Test that vectors of one model are never returned for another"""
+        cache = EmbeddingCache(str(tmp_path))
+        cache.put_many("model-a", [content_hash("a")], [[1.0]])
+
+        assert cache.get_many("model-b", [content_hash("a")]) == [None]
+        assert cache.count("model-b") == 0
+
+    def test_existing_hashes_are_not_appended_again(self, tmp_path):
+        """Test that storing a known hash keeps the first vector and does not grow the files"""
+        cache = EmbeddingCache(str(tmp_path))
+        cache.put_many("model", [content_hash("a")], [[1.0]])
+
+        cache.put_many("model", [content_hash("a"), content_hash("a")], [[2.0], [3.0]])
+
+        assert cache.count("model") == 1
+        assert cache.get_many("model", [content_hash("a")])[0].tolist() == [1.0]
+
+    def test_appends_from_another_instance_are_visible(self, tmp_path):
+        """Test that a cache picks up vectors appended by another process on the next lookup"""
+        reader = EmbeddingCache(str(tmp_path))
+        reader.put_many("model", [content_hash("a")], [[1.0, 1.0]])
+        assert reader.get_many("model", [content_hash("b")]) == [None]
+
+        EmbeddingCache(str(tmp_path)).put_many("model", [content_hash("b")], [[2.0, 2.0]])
+
+        assert reader.get_many("model", [content_hash("b")])[0].tolist() == [2.0, 2.0]
+
+    def test_float16_halves_the_vector_file(self, tmp_path):
+        """Test that float16 storage is half the size and close to the original vectors"""
+        vectors = np.random.default_rng(0).standard_normal((4, 8)).astype(np.float32)
+        hashes = [content_hash(str(i)) for i in range(4)]
+        EmbeddingCache(str(tmp_path / "f32")).put_many("model", hashes, vectors)
+        half = EmbeddingCache(str(tmp_path / "f16"), dtype="float16")
+        half.put_many("model", hashes, vectors)
+
+        sizes = [os.path.getsize(path) for path in sorted(tmp_path.glob(f"f*/*/{VECTORS_FILE}"), reverse=True)]
+
+        assert sizes == [4 * 8 * 4, 4 * 8 * 2]
+        assert np.allclose(np.stack(half.get_many("model", hashes)), vectors, atol=1e-2)
+
+    def test_files_decide_the_dtype(self, tmp_path):
+        """Test that reopening with another dtype keeps reading the stored format"""
+        EmbeddingCache(str(tmp_path), dtype="float16").put_many("model", [content_hash("a")], [[0.5]])
+
+        cache = EmbeddingCache(str(tmp_path), dtype="float32")
+        cache.put_many("model", [content_hash("b")], [[0.25]])
+
+        assert [vector.tolist() for vector in cache.get_many("model", [content_hash("a"), content_hash("b")])] == [
+            [0.5],
+            [0.25],
+        ]
+
+    def test_torn_key_record_is_ignored_and_overwritten(self, tmp_path):
+        """Test that a partial key left by a crashed writer is dropped by the next append"""
+        cache = EmbeddingCache(str(tmp_path))
+        cache.put_many("model", [content_hash("a")], [[1.0]])
+        (partition,) = [entry for entry in tmp_path.iterdir() if entry.is_dir()]
+        with open(partition / KEYS_FILE, "ab") as keys_file:
+            keys_file.write(b"torn")
+
+        reopened = EmbeddingCache(str(tmp_path))
+        assert reopened.count("model") == 1
+        reopened.put_many("model", [content_hash("b")], [[2.0]])
+
+        assert os.path.getsize(partition / KEYS_FILE) == 32
+        assert EmbeddingCache(str(tmp_path)).get_many("model", [content_hash("b")])[0].tolist() == [2.0]
+
+    def test_dimension_mismatch(self, tmp_path):
+        """Test that vectors of another dimension are rejected"""
+        cache = EmbeddingCache(str(tmp_path))
+        cache.put_many("model", [content_hash("a")], [[1.0, 2.0]])
+
+        with pytest.raises(ValueError, match="dimension"):
+            cache.put_many("model", [content_hash("b")], [[1.0]])
+
+    def test_invalid_dtype(self, tmp_path):
+        """Test that only float32 and float16 storage is supported"""
+        with pytest.raises(ValueError):
+            EmbeddingCache(str(tmp_path), dtype="int8")
@@ -0,0 +1,173 @@
+import asyncio
+import threading
+from typing import Iterator, List
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from src.vector_store.embeddings.micro_batching_embeddings import MicroBatchingEmbeddings
+
+
+class RecordingEmbeddings(Embeddings):
+    """Embeds a text as [len(text)] and records every call; the first call can be held open"""
+
+    def __init__(self) -> None:
+        self.document_calls: List[List[str]] = []
+        self.query_calls: List[str] = []
+        self.release = threading.Event()
+        self.release.set()
+        self.entered = threading.Event()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.entered.set()
+        self.release.wait(timeout=5)
+        self.document_calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        self.query_calls.append(text)
+        return [float(len(text))]
+
+
+@pytest.fixture
+def recording_embedding() -> RecordingEmbeddings:
+    return RecordingEmbeddings()
+
+
+@pytest.fixture
+def embeddings(recording_embedding) -> Iterator[MicroBatchingEmbeddings]:
+    embeddings = MicroBatchingEmbeddings(recording_embedding, max_batch_size=8, max_wait_seconds=0.01)
+    yield embeddings
+    embeddings.close()
+
+
+class TestMicroBatchingEmbeddings:
+    """Test cases for MicroBatchingEmbeddings"""
+
+    def test_single_call(self, embeddings, recording_embedding):
+        """Test that a lone call is embedded right away with one underlying call"""
+        assert embeddings.embed_documents(["a", "bb"]) == [[1.0], [2.0]]
+        assert embeddings.embed_query("ccc") == [3.0]
+
+        assert recording_embedding.document_calls == [["a", "bb"]]
+        assert recording_embedding.query_calls == ["ccc"]
+
+    def test_empty_texts(self, embeddings, recording_embedding):
+        """Test that no texts means no underlying call"""
+        assert embeddings.embed_documents([]) == []
+        assert recording_embedding.document_calls == []
+
+    def test_duplicate_texts_are_embedded_once(self, embeddings, recording_embedding):
+        """Test that a text repeated in a batch is embedded once and fanned back out"""
+        assert embeddings.embed_documents(["a", "bb", "a"]) == [[1.0], [2.0], [1.0]]
+        assert recording_embedding.document_calls == [["a", "bb"]]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_a_batch(self, embeddings, recording_embedding):
+        """Test that calls arriving while a flush is running go out together in the next flush"""
+        recording_embedding.release.clear()
+        first = asyncio.ensure_future(embeddings.aembed_documents(["first"]))
+        await asyncio.to_thread(recording_embedding.entered.wait, 5)
+
+        rest = asyncio.gather(
+            embeddings.aembed_query("q"),
+            embeddings.aembed_documents(["x", "yy"]),
+            embeddings.aembed_documents(["yy"]),
+        )
+        await asyncio.sleep(0.01)
+        recording_embedding.release.set()
+
+        assert await first == [[5.0]]
+        assert await rest == [[1.0], [[1.0], [2.0]], [[2.0]]]
+        # documents and queries are flushed separately, duplicates once
+        assert recording_embedding.document_calls == [["first"], ["x", "yy"]]
+        assert recording_embedding.query_calls == ["q"]
+        assert embeddings.stats()["embedded_texts"] == 4
+
+    def test_batch_size_is_bounded(self, recording_embedding):
+        """Test that pending requests beyond max_batch_size wait for the next flush"""
+        embeddings = MicroBatchingEmbeddings(recording_embedding, max_batch_size=2)
+        recording_embedding.release.clear()
+        threads = [threading.Thread(target=embeddings.embed_documents, args=([text],)) for text in "abcde"]
+        threads[0].start()
+        recording_embedding.entered.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        while embeddings._requests.qsize() < 4:
+            pass
+        recording_embedding.release.set()
+        for thread in threads:
+            thread.join(5)
+        embeddings.close()
+
+        assert [len(call) for call in recording_embedding.document_calls] == [1, 2, 2]
+
+    def test_errors_reach_every_caller(self, embeddings, recording_embedding):
+        """Test that a failing flush raises in the callers it served"""
+        recording_embedding.embed_documents = lambda texts: (_ for _ in ()).throw(RuntimeError("boom"))
+
+        with pytest.raises(RuntimeError, match="boom"):
+            embeddings.embed_documents(["a"])
+
+    def test_bad_results_reach_the_callers_and_keep_the_worker(self, embeddings, recording_embedding):
+        """Test that an embedding returning too few vectors fails its callers, not the worker"""
+        embed_documents = recording_embedding.embed_documents
+        recording_embedding.embed_documents = lambda texts: []
+
+        with pytest.raises(ValueError):
+            embeddings.embed_documents(["a"])
+
+        recording_embedding.embed_documents = embed_documents
+        assert embeddings.embed_documents(["bb"]) == [[2.0]]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_callers_do_not_stop_the_worker(self, embeddings, recording_embedding):
+        """Test that a caller cancelling mid-flush leaves the worker serving later calls"""
+        recording_embedding.release.clear()
+        cancelled = asyncio.ensure_future(embeddings.aembed_documents(["a"]))
+        await asyncio.to_thread(recording_embedding.entered.wait, 5)
+        cancelled.cancel()
+        recording_embedding.release.set()
+
+        assert await embeddings.aembed_documents(["bb"]) == [[2.0]]
+
+    def test_queries_are_batched_through_embed_queries(self, recording_embedding):
+        """Test that models able to embed several queries at once get the unique queries in one call"""
+        query_batches: List[List[str]] = []
+
+        def embed_queries(texts: List[str]) -> List[List[float]]:
+            query_batches.append(list(texts))
+            return [[float(len(text))] for text in texts]
+
+        recording_embedding.embed_queries = embed_queries
+        embeddings = MicroBatchingEmbeddings(recording_embedding)
+        recording_embedding.release.clear()
+        threads = [threading.Thread(target=embeddings.embed_documents, args=(["first"],))]
+        threads += [threading.Thread(target=embeddings.embed_query, args=(text,)) for text in ["a", "bb", "a"]]
+        threads[0].start()
+        recording_embedding.entered.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        while embeddings._requests.qsize() < 3:
+            pass
+        recording_embedding.release.set()
+        for thread in threads:
+            thread.join(5)
+        embeddings.close()
+
+        assert query_batches == [["a", "bb"]]
+        assert recording_embedding.query_calls == []
+
+    def test_queries_as_documents_for_symmetric_models(self, recording_embedding):
+        """Test that queries are batched through embed_documents when queries_as_documents is on"""
+        embeddings = MicroBatchingEmbeddings(recording_embedding, queries_as_documents=True)
+
+        assert embeddings.embed_query("abc") == [3.0]
+        assert recording_embedding.document_calls == [["abc"]]
+        assert recording_embedding.query_calls == []
+        embeddings.close()
+
+    def test_invalid_max_batch_size(self, recording_embedding):
+        """Test that a non-positive max_batch_size is rejected"""
+        with pytest.raises(ValueError):
+            MicroBatchingEmbeddings(recording_embedding, max_batch_size=0)
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from src.vector_store.indexes.blocked_search import blocked_search
+
+
+@pytest.fixture
+def vectors() -> np.ndarray:
+    return np.random.default_rng(0).standard_normal((1000, 8)).astype(np.float32)
+
+
+@pytest.fixture
+def queries() -> np.ndarray:
+    return np.random.default_rng(1).standard_normal((3, 8)).astype(np.float32)
+
+
+def _exact(vectors: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    return np.argsort(-(queries @ vectors.T), axis=1)[:, :k]
+
+
+class TestBlockedSearch:
+    """Test cases for blocked_search"""
+
+    @pytest.mark.parametrize("block_size", [1, 7, 128, 5000])
+    @pytest.mark.parametrize("threads", [1, 3])
+    def test_matches_exact_search(self, vectors, queries, block_size, threads):
+        """Test that any block size and thread count returns the exact top_k, best first"""
+        scores, rows = blocked_search(vectors, queries, top_k=10, block_size=block_size, threads=threads)
+
+        np.testing.assert_array_equal(rows, _exact(vectors, queries, 10))
+        np.testing.assert_allclose(scores, np.take_along_axis(queries @ vectors.T, rows, axis=1), rtol=1e-5)
+
+    def test_reads_npy_file_in_blocks(self, vectors, queries, tmp_path):
+        """Test that a .npy path is searched without loading it whole"""
+        path = tmp_path / "vectors.npy"
+        np.save(path, vectors)
+
+        _, rows = blocked_search(str(path), queries, top_k=5, block_size=100, threads=2)
+
+        np.testing.assert_array_equal(rows, _exact(vectors, queries, 5))
+
+    def test_single_query_vector(self, vectors, queries):
+        """Test that a 1-d query is treated as one query"""
+        _, rows = blocked_search(vectors, queries[0], top_k=3, block_size=64)
+
+        assert rows.shape == (1, 3)
+        np.testing.assert_array_equal(rows[0], _exact(vectors, queries[:1], 3)[0])
+
+    def test_deleted_rows_are_skipped(self, vectors, queries):
+        """Test that rows flagged as deleted never make the top_k"""
+        deleted = np.zeros(len(vectors), dtype=bool)
+        best = _exact(vectors, queries[:1], 1)[0, 0]
+        deleted[best] = True
+
+        _, rows = blocked_search(vectors, queries[0], top_k=5, block_size=64, deleted=deleted)
+
+        assert best not in rows[0]
+
+    def test_top_k_larger_than_rows(self, vectors, queries):
+        """Test that asking for more rows than exist returns every row"""
+        scores, rows = blocked_search(vectors[:4], queries, top_k=10, block_size=3)
+
+        assert rows.shape == (3, 4)
+
+    def test_invalid_block_size(self, vectors, queries):
+        """Test that a non-positive block size is rejected"""
+        with pytest.raises(ValueError):
+            blocked_search(vectors, queries, top_k=1, block_size=0)
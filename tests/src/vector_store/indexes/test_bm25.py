@@ -0,0 +1,74 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.vector_store.indexes.bm25 import BM25Index, tokenize
+
+DOCUMENTS = [
+    "Senior Python engineer, Django and PostgreSQL",
+    "Java engineer with Kubernetes experience",
+    "Frontend engineer, React and TypeScript",
+    "Platform engineer: Kubernetes, Terraform, visa sponsorship available",
+]
+
+
+@pytest.fixture
+def index() -> BM25Index:
+    index = BM25Index()
+    for row, document in enumerate(DOCUMENTS):
+        index.add(row, document)
+    return index
+
+
+class TestTokenize:
+    """Test cases for tokenize"""
+
+    def test_lower_cases_and_keeps_language_names(self):
+        """Test that tokens are lower-cased and C++ / C# survive"""
+        assert tokenize("C++ and C# Developer, Node.js") == ["c++", "and", "c#", "developer", "node", "js"]
+
+
+class TestBM25Index:
+    """Test cases for BM25Index"""
+
+    def test_exact_terms_rank_first(self, index):
+        """Test that documents containing rare query terms rank first"""
+        results = index.search("kubernetes visa sponsorship", top_k=3)
+
+        assert [row for row, _ in results] == [3, 1]
+        assert results[0][1] > results[1][1] > 0
+
+    def test_score_matches_bm25_formula(self, index):
+        """Test a single-term score against the Okapi BM25 formula"""
+        ((row, score),) = index.search("django", top_k=1)
+
+        lengths = [len(tokenize(document)) for document in DOCUMENTS]
+        idf = math.log(1 + (4 - 1 + 0.5) / (1 + 0.5))
+        norm = 1.2 * (1 - 0.75 + 0.75 * lengths[0] / np.mean(lengths))
+        assert row == 0
+        assert score == pytest.approx(idf * 2.2 / (1 + norm))
+
+    def test_unknown_terms_return_nothing(self, index):
+        """Test that a query without indexed terms finds nothing"""
+        assert index.search("rust", top_k=5) == []
+
+    def test_readding_a_row_replaces_its_document(self, index):
+        """Test that upserting a row drops its old terms"""
+        index.add(0, "Rust engineer")
+
+        assert index.search("django", top_k=5) == []
+        assert index.search("rust", top_k=5)[0][0] == 0
+        assert len(index) == 4
+
+    def test_remove(self, index):
+        """Test that removed rows are no longer found"""
+        index.remove(1)
+
+        assert [row for row, _ in index.search("kubernetes", top_k=5)] == [3]
+
+    def test_allowed_mask(self, index):
+        """Test that rows outside the allowed mask are never returned"""
+        allowed = np.array([True, True, False, False])
+
+        assert [row for row, _ in index.search("kubernetes", top_k=5, allowed=allowed)] == [1]
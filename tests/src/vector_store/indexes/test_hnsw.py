@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+
+from src.vector_store.indexes.hnsw import HNSWIndex
+
+
+@pytest.fixture
+def vectors() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((300, 16)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.fixture
+def index(vectors) -> HNSWIndex:
+    index = HNSWIndex(dimension=16, m=8, ef_construction=32, seed=0)
+    for vector in vectors:
+        index.add(vector)
+    return index
+
+
+def _exact_top_k(vectors: np.ndarray, query: np.ndarray, k: int) -> set:
+    return set(np.argsort(-(vectors @ query))[:k].tolist())
+
+
+class TestHNSWIndex:
+    """Test cases for HNSWIndex"""
+
+    def test_empty_index_returns_nothing(self):
+        """Test that searching an empty index returns no results"""
+        assert HNSWIndex(dimension=4).search(np.ones(4), k=3) == []
+
+    def test_finds_exact_match_first(self, index, vectors):
+        """Test that a stored vector is its own nearest neighbour"""
+        results = index.search(vectors[42], k=5)
+
+        assert results[0][0] == 42
+        assert results[0][1] == pytest.approx(1.0, abs=1e-5)
+        assert [score for _, score in results] == sorted((score for _, score in results), reverse=True)
+
+    def test_recall_against_exact_search(self, index, vectors):
+        """Test that recall@10 is high with a wide enough beam"""
+        rng = np.random.default_rng(1)
+        queries = rng.standard_normal((20, 16)).astype(np.float32)
+        queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+        recall = np.mean(
+            [
+                len({node for node, _ in index.search(query, k=10, ef_search=100)} & _exact_top_k(vectors, query, 10))
+                / 10
+                for query in queries
+            ]
+        )
+
+        assert recall >= 0.95
+
+    def test_allowed_mask_restricts_results(self, index, vectors):
+        """Test that only allowed nodes are returned, with recall close to exact filtered search"""
+        allowed = np.zeros(len(vectors), dtype=bool)
+        allowed[::5] = True
+        query = vectors[7]
+
+        results = index.search(query, k=10, ef_search=50, allowed=allowed)
+
+        assert all(allowed[node] for node, _ in results)
+        expected = {int(node) * 5 for node in _exact_top_k(vectors[::5], query, 10)}
+        assert len({node for node, _ in results} & expected) >= 9
+
+    def test_exact_search_scores_given_nodes(self, index, vectors):
+        """Test that exact_search ranks exactly the given nodes"""
+        nodes = np.arange(0, 300, 3)
+
+        results = index.exact_search(vectors[9], nodes, k=3)
+
+        assert results[0][0] == 9
+        assert {node for node, _ in results} == {int(nodes[i]) for i in _exact_top_k(vectors[nodes], vectors[9], 3)}
+
+    def test_deleted_nodes_are_not_returned(self, index, vectors):
+        """Test that soft-deleted nodes are skipped but still route searches"""
+        index.mark_deleted(42)
+
+        results = index.search(vectors[42], k=5)
+
+        assert 42 not in [node for node, _ in results]
+        assert len(results) == 5
+        assert len(index) == 299
+
+    def test_search_widens_beam_when_deletions_crowd_results(self, index, vectors):
+        """Test that k live results are returned even when most nodes are deleted"""
+        for node in range(290):
+            index.mark_deleted(node)
+
+        results = index.search(vectors[0], k=5, ef_search=5)
+
+        assert len(results) == 5
+        assert all(node >= 290 for node, _ in results)
+
+    def test_save_and_load(self, index, vectors, tmp_path):
+        """Test that a loaded index returns the same results"""
+        index.mark_deleted(7)
+        index.save(str(tmp_path))
+
+        loaded = HNSWIndex.load(str(tmp_path))
+
+        assert loaded.search(vectors[3], k=10) == index.search(vectors[3], k=10)
+        assert loaded.is_deleted(7)
+        assert len(loaded) == len(index)
+        assert loaded.add(vectors[0]) == 300
+
+    def test_rejects_wrong_dimension(self):
+        """Test that vectors of the wrong dimension are rejected"""
+        with pytest.raises(ValueError):
+            HNSWIndex(dimension=4).add(np.ones(3))
+
+    def test_invalid_parameters(self):
+        """Test that invalid graph parameters are rejected"""
+        with pytest.raises(ValueError):
+            HNSWIndex(dimension=4, m=1)
+        with pytest.raises(ValueError):
+            HNSWIndex(dimension=4, ef_search=0)
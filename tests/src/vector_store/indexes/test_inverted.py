@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from src.vector_store.filters import to_metadata_filter
+from src.vector_store.indexes.inverted import InvertedIndex
+
+JOBS = [
+    {"job_country": "DE", "job_city": "Berlin", "employer_name": "Acme"},
+    {"job_country": "DE", "job_city": "Munich", "employer_name": "Globex"},
+    {"job_country": "AT", "job_city": "Vienna", "employer_name": "Acme"},
+    {"job_country": None, "job_city": None, "employer_name": None},
+]
+
+
+@pytest.fixture
+def index() -> InvertedIndex:
+    index = InvertedIndex()
+    for row, fields in enumerate(JOBS):
+        index.add(row, fields)
+    return index
+
+
+class TestInvertedIndex:
+    """Test cases for InvertedIndex"""
+
+    def test_rows_match_filter(self, index):
+        """Test that values of a field are unioned and fields are intersected"""
+        assert index.rows(to_metadata_filter({"country": "de"})).tolist() == [0, 1]
+        assert index.rows(to_metadata_filter({"country": ["de", "at"], "employer": "acme"})).tolist() == [0, 2]
+        assert index.rows(to_metadata_filter({"country": "fr"})).tolist() == []
+
+    def test_rows_are_sorted_int64(self, index):
+        """Test that rows come back sorted, ready for fancy indexing"""
+        rows = index.rows(to_metadata_filter({"employer": "acme"}))
+
+        assert rows.dtype == np.int64
+        assert rows.tolist() == sorted(rows.tolist())
+
+    def test_remove(self, index):
+        """Test that removed rows no longer match"""
+        index.remove(0, JOBS[0])
+
+        assert index.rows(to_metadata_filter({"country": "de"})).tolist() == [1]
+        assert index.count("job_city", "berlin") == 0
+
+    def test_round_trip(self, index):
+        """Test that postings survive to_dict and from_dict"""
+        restored = InvertedIndex.from_dict(index.to_dict())
+
+        assert restored.rows(to_metadata_filter({"city": "vienna"})).tolist() == [2]
+
+    def test_estimate(self, index):
+        """Test that estimates are exact for one field and assume independence across fields"""
+        assert index.estimate(to_metadata_filter({"country": ["de", "at"]}), total=4) == 3
+        assert index.estimate(to_metadata_filter({"country": "de", "employer": "acme"}), total=4) == pytest.approx(1.0)
+        assert index.estimate(to_metadata_filter({"country": "fr"}), total=4) == 0
@@ -0,0 +1,49 @@
+import pytest
+
+from src.vector_store.indexes.planner import QueryPlanner, SearchStrategy
+
+
+@pytest.fixture
+def planner() -> QueryPlanner:
+    return QueryPlanner()
+
+
+class TestQueryPlanner:
+    """Test cases for QueryPlanner"""
+
+    def test_rare_filters_are_scanned_exactly(self, planner):
+        """Test that a filter matching few rows scores them exactly"""
+        plan = planner.plan(estimated_matches=200, total=1_000_000, top_k=10, ef_search=50, m=16)
+
+        assert plan.strategy is SearchStrategy.EXACT
+        assert plan.cost == 200
+
+    def test_broad_filters_walk_the_graph_with_over_fetch(self, planner):
+        """Test that a filter keeping most rows post-filters an over-fetched graph search"""
+        plan = planner.plan(estimated_matches=500_000, total=1_000_000, top_k=10, ef_search=50, m=16)
+
+        assert plan.strategy is SearchStrategy.ANN
+        assert plan.ef == 50 * planner.over_fetch / 0.5
+
+    def test_medium_filters_use_the_hybrid(self, planner):
+        """Test that in between, the graph is walked with the filter as an allow-list"""
+        plan = planner.plan(estimated_matches=100_000, total=1_000_000, top_k=10, ef_search=50, m=16)
+
+        assert plan.strategy is SearchStrategy.HYBRID
+        assert plan.ef == 50
+
+    def test_plan_is_the_cheapest_candidate(self, planner):
+        """Test that the chosen plan has the lowest estimated cost"""
+        plans = planner.plans(estimated_matches=30_000, total=200_000, top_k=10, ef_search=50, m=16)
+
+        assert {plan.strategy for plan in plans} == set(SearchStrategy)
+        assert planner.plan(30_000, 200_000, 10, 50, 16).cost == min(plan.cost for plan in plans)
+
+    def test_no_matches(self, planner):
+        """Test that a filter matching nothing is planned as a free exact scan"""
+        assert planner.plan(estimated_matches=0, total=1000, top_k=10, ef_search=50, m=16).cost == 0
+
+    def test_invalid_over_fetch(self):
+        """Test that over_fetch below 1 is rejected"""
+        with pytest.raises(ValueError):
+            QueryPlanner(over_fetch=0.5)
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from src.vector_store.indexes.quantization import ProductQuantizer, ScalarQuantizer
+
+
+@pytest.fixture
+def vectors() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((400, 32)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class TestScalarQuantizer:
+    """Test cases for ScalarQuantizer"""
+
+    def test_scores_approximate_inner_products(self, vectors):
+        """Test that scores on int8 codes are close to exact inner products"""
+        quantizer = ScalarQuantizer(32)
+        quantizer.fit(vectors)
+        codes = quantizer.encode(vectors)
+
+        assert codes.dtype == np.uint8
+        assert codes.shape == (400, 32)
+        np.testing.assert_allclose(quantizer.scores(codes, vectors[0]), vectors @ vectors[0], atol=0.02)
+
+    def test_values_outside_the_fitted_range_are_clipped(self, vectors):
+        """Test that encoding values beyond the fitted range does not wrap around"""
+        quantizer = ScalarQuantizer(32)
+        quantizer.fit(vectors)
+
+        codes = quantizer.encode(np.full((1, 32), 10.0, dtype=np.float32))
+
+        assert (codes == 255).all()
+
+    def test_bytes_per_vector(self):
+        """Test that int8 codes take one byte per dimension"""
+        assert ScalarQuantizer(1024).bytes_per_vector == 1024
+
+
+class TestProductQuantizer:
+    """Test cases for ProductQuantizer"""
+
+    def test_encode_shape(self, vectors):
+        """Test that each vector is encoded as one byte per subspace"""
+        quantizer = ProductQuantizer(32, subspaces=8, seed=0)
+        quantizer.fit(vectors)
+
+        codes = quantizer.encode(vectors)
+
+        assert codes.dtype == np.uint8
+        assert codes.shape == (400, 8)
+        assert quantizer.bytes_per_vector == 8
+
+    def test_scores_rank_nearest_neighbour_first(self, vectors):
+        """Test that asymmetric distance scores keep a stored vector near the top for itself"""
+        quantizer = ProductQuantizer(32, subspaces=16, seed=0)
+        quantizer.fit(vectors)
+        codes = quantizer.encode(vectors)
+
+        scores = quantizer.scores(codes, vectors[5])
+
+        assert 5 in np.argsort(-scores)[:5]
+        assert np.corrcoef(scores, vectors @ vectors[5])[0, 1] > 0.8
+
+    def test_fewer_vectors_than_centroids(self, vectors):
+        """Test that training on fewer than 256 vectors uses one centroid per vector"""
+        quantizer = ProductQuantizer(32, subspaces=4, seed=0)
+        quantizer.fit(vectors[:10])
+
+        assert quantizer.centroids.shape == (4, 10, 8)
+
+    def test_dimension_must_divide_into_subspaces(self):
+        """Test that the dimension must split evenly into subspaces"""
+        with pytest.raises(ValueError):
+            ProductQuantizer(30, subspaces=8)
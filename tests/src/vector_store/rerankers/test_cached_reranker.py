@@ -0,0 +1,96 @@
+from typing import List, Sequence
+
+import pytest
+
+from src.common.cache import LRUCache
+from src.vector_store.rerankers.cached_reranker import CachedReranker
+from src.vector_store.rerankers.interface import Reranker
+
+
+class CountingReranker(Reranker):
+    """Scores documents by length and records every batch it is asked to score"""
+
+    def __init__(self, batch_size: int = 100):
+        super().__init__(batch_size=batch_size)
+        self.batches: List[List[str]] = []
+
+    def score(self, query: str, documents: Sequence[str]) -> List[float]:
+        self.batches.append(list(documents))
+        return [float(len(document)) for document in documents]
+
+
+@pytest.fixture
+def rerank_score_cache() -> LRUCache[float]:
+    return LRUCache[float](max_size=64)
+
+
+class TestCachedReranker:
+    """Test cases for CachedReranker"""
+
+    def test_only_uncached_documents_are_scored(self, rerank_score_cache):
+        """Test that a repeated query only sends documents it has not scored before"""
+        inner = CountingReranker()
+        reranker = CachedReranker(inner, cache=rerank_score_cache)
+
+        reranker.rerank("python developer", ["a", "bb", "ccc"], top_n=3)
+        ranked = reranker.rerank("Python  Developer", ["bb", "dddd", "ccc"], top_n=3)
+
+        assert inner.batches == [["a", "bb", "ccc"], ["dddd"]]
+        assert ranked == [(1, 4.0), (2, 3.0), (0, 2.0)]
+
+    def test_cached_documents_skip_the_reranker(self, rerank_score_cache):
+        """Test that a fully cached candidate set makes no rerank call"""
+        inner = CountingReranker()
+        reranker = CachedReranker(inner, cache=rerank_score_cache)
+
+        first = reranker.rerank("python", ["a", "bb"], top_n=2)
+        second = reranker.rerank("python", ["a", "bb"], top_n=2)
+
+        assert first == second
+        assert len(inner.batches) == 1
+
+    def test_queries_are_cached_separately(self, rerank_score_cache):
+        """Test that scores of one query are never used for another"""
+        inner = CountingReranker()
+        reranker = CachedReranker(inner, cache=rerank_score_cache)
+
+        reranker.rerank("python", ["a"], top_n=1)
+        reranker.rerank("java", ["a"], top_n=1)
+
+        assert len(inner.batches) == 2
+
+    def test_truncated_documents_are_keyed_by_scored_content(self, rerank_score_cache):
+        """Test that a document truncated differently is scored again"""
+        inner = CountingReranker()
+        reranker = CachedReranker(inner, cache=rerank_score_cache)
+
+        reranker.rerank("python", ["abcdef"], top_n=1, max_document_chars=3)
+        reranker.rerank("python", ["abcdef"], top_n=1)
+
+        assert inner.batches == [["abc"], ["abcdef"]]
+
+    def test_misses_are_sent_in_the_wrapped_reranker_batches(self, rerank_score_cache):
+        """Test that uncached documents are batched by the wrapped reranker"""
+        inner = CountingReranker(batch_size=2)
+        reranker = CachedReranker(inner, cache=rerank_score_cache)
+        reranker.rerank("python", ["a", "b"], top_n=2)
+
+        reranker.rerank("python", ["a", "c", "d", "b", "e"], top_n=5)
+
+        assert inner.batches[1:] == [["c", "d"], ["e"]]
+
+    def test_duplicate_documents_are_scored_once(self, rerank_score_cache):
+        """Test that identical documents in one candidate set share one score"""
+        inner = CountingReranker()
+        reranker = CachedReranker(inner, cache=rerank_score_cache)
+
+        assert reranker.score("python", ["ab", "ab", "c"]) == [2.0, 2.0, 1.0]
+        assert inner.batches == [["ab", "c"]]
+
+    def test_cache_namespaces_are_isolated(self, rerank_score_cache):
+        """Test that wrappers for different models sharing one cache do not mix scores"""
+        inner = CountingReranker()
+        CachedReranker(inner, cache=rerank_score_cache, cache_namespace="a").rerank("python", ["a"], top_n=1)
+        CachedReranker(inner, cache=rerank_score_cache, cache_namespace="b").rerank("python", ["a"], top_n=1)
+
+        assert len(inner.batches) == 2
@@ -0,0 +1,91 @@
+from typing import List, Sequence
+
+import pytest
+
+from src.vector_store.rerankers.interface import Reranker
+from src.vector_store.rerankers.lexical_reranker import LexicalReranker
+
+
+class RecordingReranker(Reranker):
+    """Scores documents by length and records every batch it is asked to score"""
+
+    def __init__(self, batch_size: int):
+        super().__init__(batch_size=batch_size)
+        self.batches: List[List[str]] = []
+
+    def score(self, query: str, documents: Sequence[str]) -> List[float]:
+        self.batches.append(list(documents))
+        return [float(len(document)) for document in documents]
+
+
+class TestReranker:
+    """Test cases for the batching and ordering shared by every Reranker"""
+
+    def test_documents_are_scored_in_batches(self):
+        """Test that rerank input is split into batches of batch_size"""
+        reranker = RecordingReranker(batch_size=2)
+
+        reranker.rerank("query", ["a", "bbb", "cc", "dddd", "e"], top_n=5)
+
+        assert [len(batch) for batch in reranker.batches] == [2, 2, 1]
+
+    def test_results_are_best_first_and_cut_to_top_n(self):
+        """Test that positions come back by descending score, top_n at most"""
+        reranker = RecordingReranker(batch_size=2)
+
+        ranked = reranker.rerank("query", ["a", "bbb", "cc", "dddd"], top_n=2)
+
+        assert ranked == [(3, 4.0), (1, 3.0)]
+
+    def test_ties_keep_input_order(self):
+        """Test that equally scored documents keep their first-stage order"""
+        ranked = RecordingReranker(batch_size=10).rerank("query", ["ab", "cd", "ef"], top_n=3)
+
+        assert [position for position, _ in ranked] == [0, 1, 2]
+
+    def test_documents_are_truncated(self):
+        """Test that max_document_chars cuts documents before they are scored"""
+        reranker = RecordingReranker(batch_size=10)
+
+        ranked = reranker.rerank("query", ["abcdef", "abc"], top_n=2, max_document_chars=3)
+
+        assert reranker.batches == [["abc", "abc"]]
+        assert ranked == [(0, 3.0), (1, 3.0)]
+
+    def test_invalid_batch_size(self):
+        """Test that batch_size must be positive"""
+        with pytest.raises(ValueError):
+            RecordingReranker(batch_size=0)
+
+
+class TestLexicalReranker:
+    """Test cases for LexicalReranker"""
+
+    def test_documents_covering_more_query_terms_rank_higher(self):
+        """Test that covering every query term beats covering some of them"""
+        documents = ["Java developer in Berlin", "Senior Python developer, Django", "Python scripting"]
+
+        ranked = LexicalReranker().rerank("python django developer", documents, top_n=3)
+
+        assert [position for position, _ in ranked] == [1, 2, 0]
+
+    def test_scores_do_not_depend_on_the_batch(self):
+        """Test that a document scores the same alone and among other documents"""
+        reranker = LexicalReranker(batch_size=1)
+        documents = ["python developer", "python python python", "go developer"]
+
+        together = LexicalReranker().score("python developer", documents)
+        alone = [reranker.score("python developer", [document])[0] for document in documents]
+
+        assert together == alone
+
+    def test_scores_are_between_zero_and_one(self):
+        """Test that scores are bounded, with no overlap scoring zero"""
+        scores = LexicalReranker().score("python", ["python " * 1000, "java"])
+
+        assert 0 < scores[0] < 1
+        assert scores[1] == 0.0
+
+    def test_empty_query(self):
+        """Test that a query without terms scores every document zero"""
+        assert LexicalReranker().score("  ", ["python", "java"]) == [0.0, 0.0]
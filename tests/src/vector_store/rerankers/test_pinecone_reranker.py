@@ -0,0 +1,51 @@
+from unittest.mock import Mock
+
+from src.vector_store.rerankers.pinecone_reranker import PineconeReranker
+
+
+def rerank_result(scores):
+    """A Pinecone rerank response for documents with the given scores, best first"""
+    ranked = sorted(enumerate(scores), key=lambda item: -item[1])
+    return Mock(data=[Mock(index=index, score=score) for index, score in ranked])
+
+
+class TestPineconeReranker:
+    """Test cases for PineconeReranker"""
+
+    def test_scores_are_mapped_back_to_input_order(self):
+        """Test that Pinecone's best-first results are returned in document order"""
+        client = Mock()
+        client.inference.rerank.return_value = rerank_result([0.2, 0.9, 0.5])
+        reranker = PineconeReranker(client=client, model="bge-reranker-v2-m3")
+
+        scores = reranker.score("python", ["a", "b", "c"])
+
+        assert scores == [0.2, 0.9, 0.5]
+        client.inference.rerank.assert_called_once_with(
+            model="bge-reranker-v2-m3",
+            query="python",
+            documents=["a", "b", "c"],
+            top_n=3,
+            return_documents=False,
+            parameters={"truncate": "END"},
+        )
+
+    def test_large_candidate_sets_are_sent_in_batches(self):
+        """Test that each rerank call carries at most batch_size documents"""
+        client = Mock()
+        client.inference.rerank.side_effect = lambda documents, **kwargs: rerank_result(
+            [float(document) for document in documents]
+        )
+        reranker = PineconeReranker(client=client, batch_size=2)
+
+        ranked = reranker.rerank("python", ["1", "5", "3", "4", "2"], top_n=3)
+
+        assert [len(call[1]["documents"]) for call in client.inference.rerank.call_args_list] == [2, 2, 1]
+        assert ranked == [(1, 5.0), (3, 4.0), (2, 3.0)]
+
+    def test_no_documents(self):
+        """Test that an empty batch does not call Pinecone"""
+        client = Mock()
+
+        assert PineconeReranker(client=client).score("python", []) == []
+        client.inference.rerank.assert_not_called()
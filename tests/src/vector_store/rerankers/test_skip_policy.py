@@ -0,0 +1,88 @@
+import math
+
+import pytest
+
+from src.vector_store.rerankers.skip_policy import RerankAction, RerankDecision, RerankSkipPolicy
+
+
+class TestRerankSkipPolicy:
+    """Test cases for RerankSkipPolicy"""
+
+    def test_clear_winner_skips_the_rerank(self):
+        """Test that a large gap with a peaked distribution skips the rerank"""
+        decision = RerankSkipPolicy().decide([0.9, 0.5, 0.48, 0.47, 0.45], top_n=3)
+
+        assert decision.action == RerankAction.SKIP
+        assert decision.candidates == 0
+        assert decision.gap == pytest.approx(0.42)
+        assert decision.entropy < 0.5
+
+    def test_flat_distribution_reranks_every_candidate(self):
+        """Test that candidates with near-identical scores are fully reranked"""
+        decision = RerankSkipPolicy().decide([0.51, 0.50, 0.50, 0.49, 0.49, 0.48], top_n=2)
+
+        assert decision.action == RerankAction.RERANK
+        assert decision.candidates == 6
+        assert decision.entropy > 0.8
+
+    def test_moderate_confidence_shrinks_the_candidates(self):
+        """Test that a gap too small to skip reranks only the best shrink_ratio of the candidates"""
+        scores = [0.8, 0.72, 0.7, 0.69, 0.68, 0.67, 0.66, 0.65, 0.64, 0.63]
+
+        decision = RerankSkipPolicy(shrink_ratio=0.3).decide(scores, top_n=2)
+
+        assert decision.action == RerankAction.SHRINK
+        assert decision.candidates == 3
+
+    def test_shrink_keeps_at_least_top_n(self):
+        """Test that a shrunk candidate set never drops below top_n, and is a full rerank otherwise"""
+        scores = [0.8, 0.72, 0.7, 0.69]
+
+        assert RerankSkipPolicy(shrink_ratio=0.25).decide(scores, top_n=3).candidates == 3
+        assert RerankSkipPolicy(shrink_ratio=0.25).decide(scores, top_n=4).action == RerankAction.RERANK
+
+    def test_gap_is_measured_at_top_n(self):
+        """Test that the gap is top-1 minus the score at rank top_n"""
+        policy = RerankSkipPolicy()
+
+        assert policy.decide([1.0, 0.9, 0.5], top_n=1).gap == pytest.approx(0.1)
+        assert policy.decide([1.0, 0.9, 0.5], top_n=3).gap == pytest.approx(0.5)
+
+    def test_missing_scores_are_reranked(self):
+        """Test that candidates without first-stage scores are always reranked"""
+        assert RerankSkipPolicy().decide([None, None], top_n=1).action == RerankAction.RERANK
+
+    def test_single_candidate_is_not_reranked(self):
+        """Test that there is nothing to reorder with a single candidate"""
+        assert RerankSkipPolicy().decide([0.3], top_n=5).action == RerankAction.SKIP
+
+    def test_normalized_entropy(self):
+        """Test that entropy is 1 for equal scores and close to 0 for a single dominant score"""
+        policy = RerankSkipPolicy(temperature=0.05)
+
+        assert policy.normalized_entropy([0.5, 0.5, 0.5]) == pytest.approx(1.0)
+        assert policy.normalized_entropy([1.0, 0.0, 0.0]) < 1e-6
+        assert math.isclose(policy.normalized_entropy([0.7]), 0.0)
+
+    def test_stats_count_decisions_and_shadow_changes(self):
+        """Test that decisions and shadow comparisons are counted"""
+        policy = RerankSkipPolicy(shadow=True)
+        decision = policy.decide([0.9, 0.1], top_n=1)
+
+        assert policy.observe_shadow(decision, ["a"], ["b"]) is True
+        assert policy.observe_shadow(decision, ["a"], ["a"]) is False
+        stats = policy.stats()
+        assert stats["decisions"] == {"rerank": 0, "shrink": 0, "skip": 1}
+        assert (stats["shadow_searches"], stats["shadow_changes"], stats["shadow_change_rate"]) == (2, 1, 0.5)
+
+    @pytest.mark.parametrize("kwargs", [{"shrink_ratio": 0}, {"shrink_ratio": 1.5}, {"temperature": 0}])
+    def test_invalid_arguments(self, kwargs):
+        """Test that invalid ratios and temperatures are rejected"""
+        with pytest.raises(ValueError):
+            RerankSkipPolicy(**kwargs)
+
+    def test_describe(self):
+        """Test the log representation of a decision"""
+        decision = RerankDecision(RerankAction.SHRINK, 10, 0.1, 0.25)
+
+        assert decision.describe() == "shrink (candidates 10, gap 0.100, entropy 0.250)"
@@ -0,0 +1,113 @@
+from unittest.mock import Mock
+
+import pytest
+
+from src.vector_store.indexes.planner import QueryPlan, QueryPlanner, SearchStrategy
+from src.vector_store.interface import VectorStore
+from src.vector_store.stores.hnsw_store import HNSWStore
+from tests.factories.vector_store import TitleOnlyJobFactory
+
+TITLES = ["Python", "Java", "Rust", "Go", "Scala", "Kotlin"]
+
+
+@pytest.fixture
+def store(keyword_embedding) -> HNSWStore:
+    store = HNSWStore(embedding=keyword_embedding, m=4, ef_construction=16)
+    # even positions are in Germany, odd ones in Austria
+    store.add_job_details(
+        [
+            TitleOnlyJobFactory.build(job_id=str(position), job_title=title, job_country="AT" if position % 2 else "DE")
+            for position, title in enumerate(TITLES)
+        ]
+    )
+    return store
+
+
+class TestHNSWStore:
+    """Test cases for HNSWStore"""
+
+    def test_inherits_from_vector_store_interface(self, keyword_embedding):
+        """Test that HNSWStore implements the VectorStore interface"""
+        assert isinstance(HNSWStore(embedding=keyword_embedding), VectorStore)
+
+    def test_similarity_search(self, store, keyword_embedding):
+        """Test that the best match comes first with its score"""
+        results = store.similarity_search("rust", top_k=1)
+
+        assert [result.job_title for result in results] == ["Rust"]
+        assert results[0].score == pytest.approx(1.0)
+        keyword_embedding.embed_documents.assert_called_once()
+
+    def test_empty_store(self, keyword_embedding):
+        """Test that an empty store returns no results"""
+        assert HNSWStore(embedding=keyword_embedding).similarity_search("rust") == []
+
+    def test_readding_a_job_replaces_it(self, store):
+        """Test that re-adding a job id soft-deletes its previous version"""
+        store.add_job_details([TitleOnlyJobFactory.build(job_id="2", job_title="Kotlin", job_country="DE")])
+
+        assert len(store) == len(TITLES)
+        assert store.get_job_details("2").job_title == "Kotlin"
+        assert [result.job_id for result in store.similarity_search("rust", top_k=len(TITLES))].count("2") == 1
+
+    def test_delete_job_details(self, store):
+        """Test that deleted jobs are no longer returned"""
+        store.delete_job_details(["2"])
+
+        assert store.get_job_details("2") is None
+        assert "2" not in [result.job_id for result in store.similarity_search("rust", top_k=3)]
+
+    def test_save_and_load(self, store, keyword_embedding, tmp_path):
+        """Test that a saved store loads with the same jobs and results"""
+        store.delete_job_details(["0"])
+        store.save(str(tmp_path))
+
+        loaded = HNSWStore.load(str(tmp_path), embedding=keyword_embedding)
+
+        assert len(loaded) == len(store)
+        assert loaded.get_job_details("0") is None
+        assert loaded.get_job_details("3") == store.get_job_details("3")
+        assert loaded.similarity_search("go", top_k=2) == store.similarity_search("go", top_k=2)
+
+    def test_similarity_search_with_filters(self, store):
+        """Test that filtered searches only return matching live jobs"""
+        results = store.similarity_search("java", top_k=len(TITLES), filters={"country": "de"})
+
+        assert sorted(result.job_id for result in results) == ["0", "2", "4"]
+
+    def test_deleted_jobs_leave_filtered_results(self, store):
+        """Test that deleted jobs are not returned by filtered searches"""
+        store.delete_job_details(["0"])
+
+        assert "0" not in [result.job_id for result in store.similarity_search("python", filters={"country": "de"})]
+
+    def test_filters_survive_save_and_load(self, store, keyword_embedding, tmp_path):
+        """Test that a loaded store rebuilds its filter postings"""
+        store.save(str(tmp_path))
+        loaded = HNSWStore.load(str(tmp_path), embedding=keyword_embedding)
+
+        assert loaded.similarity_search("rust", top_k=1, filters={"country": "at"})[0].job_id == "1"
+
+    @pytest.mark.parametrize("strategy", list(SearchStrategy))
+    def test_every_plan_returns_the_filtered_results(self, store, strategy):
+        """Test that exact, ANN and hybrid plans agree on a small store"""
+        planner = Mock(spec=QueryPlanner)
+        planner.plan.return_value = QueryPlan(strategy, estimated_matches=3, cost=0, ef=len(TITLES))
+        store.planner = planner
+
+        results = store.similarity_search("scala", top_k=2, filters={"country": "de"})
+
+        assert results[0].job_id == "4"
+        assert len(results) == 2
+        assert all(int(result.job_id) % 2 == 0 for result in results)
+        planner.plan.assert_called_once()
+
+    def test_ann_plan_over_fetches_until_enough_hits_pass(self, store):
+        """Test that post-filtering widens the fetch when the filter keeps fewer hits than planned"""
+        planner = Mock(spec=QueryPlanner)
+        planner.plan.return_value = QueryPlan(SearchStrategy.ANN, estimated_matches=3, cost=0, ef=1)
+        store.planner = planner
+
+        results = store.similarity_search("kotlin", top_k=3, filters={"country": "de"})
+
+        assert sorted(result.job_id for result in results) == ["0", "2", "4"]
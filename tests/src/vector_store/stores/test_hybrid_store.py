@@ -0,0 +1,120 @@
+from unittest.mock import Mock
+
+import pytest
+
+from src.vector_store.interface import VectorStore
+from src.vector_store.stores.hybrid_store import HybridStore
+from src.vector_store.stores.memory_store import MemoryStore
+from tests.factories.vector_store import TitleOnlyJobFactory
+
+JOBS = [
+    TitleOnlyJobFactory.build(
+        job_id="1", job_title="Backend Engineer", job_description="Python and Django services", job_country="DE"
+    ),
+    TitleOnlyJobFactory.build(
+        job_id="2", job_title="Backend Engineer", job_description="Go services on Kubernetes", job_country="AT"
+    ),
+    TitleOnlyJobFactory.build(
+        job_id="3", job_title="Data Engineer", job_description="Spark pipelines", job_country="DE"
+    ),
+]
+
+
+@pytest.fixture
+def vector_store() -> Mock:
+    vector_store = Mock(spec=MemoryStore)
+    vector_store.namespace = "jobs"
+    vector_store.query_embedding = None
+    # the embedding ranks the data engineer first whatever the query
+    vector_store.similarity_search.return_value = [JOBS[2], JOBS[0], JOBS[1]]
+    vector_store.get_job_details.side_effect = {job.job_id: job for job in JOBS}.get
+    vector_store.get_job_details_many.side_effect = lambda job_ids: {
+        job.job_id: job for job in JOBS if job.job_id in job_ids
+    }
+    return vector_store
+
+
+@pytest.fixture
+def store(vector_store) -> HybridStore:
+    store = HybridStore(vector_store, candidates=10)
+    store.add_job_details(JOBS)
+    return store
+
+
+class TestHybridStore:
+    """Test cases for HybridStore"""
+
+    def test_inherits_from_vector_store_interface(self, store):
+        """Test that HybridStore implements the VectorStore interface"""
+        assert isinstance(store, VectorStore)
+        assert store.namespace == "jobs"
+
+    def test_upserts_reach_the_wrapped_store(self, store, vector_store):
+        """Test that jobs are upserted into the wrapped store as well as the keyword index"""
+        vector_store.add_job_details.assert_called_once_with(JOBS)
+        assert len(store.keyword_index) == 3
+
+    def test_exact_terms_are_fused_into_the_ranking(self, store, vector_store):
+        """Test that a keyword match outranks a job the embedding alone prefers"""
+        results = store.similarity_search("django", top_k=2)
+
+        assert [result.job_id for result in results] == ["1", "3"]
+        vector_store.similarity_search.assert_called_once_with("django", top_k=10)
+
+    def test_keyword_only_hits_are_read_back(self, store, vector_store):
+        """Test that jobs missing from the vector candidates are fetched in one batch"""
+        vector_store.similarity_search.return_value = [JOBS[2]]
+
+        results = store.similarity_search("kubernetes", top_k=2)
+
+        assert {result.job_id for result in results} == {"2", "3"}
+        vector_store.get_job_details_many.assert_called_once_with(["2"])
+        vector_store.get_job_details.assert_not_called()
+
+    def test_fused_scores_are_scaled_to_one(self, store, vector_store):
+        """Test that a job both rankings put first scores 1 and a job only one ranking finds at most 0.5"""
+        vector_store.similarity_search.return_value = [JOBS[1], JOBS[2]]
+
+        results = store.similarity_search("kubernetes", top_k=2)
+
+        assert [result.job_id for result in results] == ["2", "3"]
+        assert results[0].score == pytest.approx(1.0)
+        assert results[1].score <= 0.5
+
+    def test_filters_apply_to_both_rankings(self, store, vector_store):
+        """Test that filters reach the wrapped store and restrict keyword hits"""
+        vector_store.similarity_search.return_value = [JOBS[2], JOBS[0]]
+
+        results = store.similarity_search("kubernetes", top_k=5, filters={"country": "de"})
+
+        assert {result.job_id for result in results} == {"1", "3"}
+        vector_store.similarity_search.assert_called_once_with("kubernetes", top_k=10, filters={"country": "de"})
+        assert [job_id for job_id, _ in store.keyword_search("kubernetes", 5, {"country": "at"})] == ["2"]
+
+    def test_readding_a_job_updates_the_keyword_index(self, store):
+        """Test that upserting a job replaces its indexed text and metadata"""
+        store.add_job_details(
+            [
+                TitleOnlyJobFactory.build(
+                    job_id="1", job_title="Backend Engineer", job_description="Rust services", job_country="AT"
+                )
+            ]
+        )
+
+        assert store.keyword_search("django", 5) == []
+        assert [job_id for job_id, _ in store.keyword_search("rust", 5, {"country": "at"})] == ["1"]
+
+    def test_failed_upsert_still_indexes_keywords(self, store, vector_store):
+        """Test that jobs of a partially failed upsert are keyword-indexed and the error propagates"""
+        vector_store.add_job_details.side_effect = RuntimeError("partial failure")
+
+        with pytest.raises(RuntimeError):
+            store.add_job_details(
+                [
+                    TitleOnlyJobFactory.build(
+                        job_id="4", job_title="Frontend Engineer", job_description="Svelte apps", job_country="DE"
+                    )
+                ]
+            )
+
+        assert [job_id for job_id, _ in store.keyword_search("svelte", 5)] == ["4"]
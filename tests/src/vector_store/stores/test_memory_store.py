@@ -2,6 +2,7 @@ from unittest.mock import Mock, patch
 
 import pytest
 from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
 
 from src.vector_store.models import JobVectorStore
 from src.vector_store.stores.memory_store import MemoryStore
@@ -160,7 +161,7 @@ class TestMemoryStore:
 
             result = store.similarity_search(query)
 
-            mock_instance.similarity_search.assert_called_once_with(query)
+            mock_instance.similarity_search.assert_called_once_with(query, k=5)
             assert result == []
 
     def test_similarity_search_with_different_queries(self, mock_embedding):
@@ -288,7 +289,7 @@ class TestMemoryStore:
 
             # Verify both operations were called
             mock_instance.add_texts.assert_called_once()
-            mock_instance.similarity_search.assert_called_once_with("python developer")
+            mock_instance.similarity_search.assert_called_once_with("python developer", k=5)
             assert len(results) == 1
 
     def test_store_inherits_from_vector_store_interface(self, mock_embedding):
@@ -300,3 +301,40 @@ class TestMemoryStore:
         assert hasattr(store, "similarity_search")
         assert callable(store.add_job_details)
         assert callable(store.similarity_search)
+
+    def test_add_job_details_uses_job_id_as_document_id(self, mock_embedding, sample_job_vector_store):
+        """Test that documents are stored under the job id"""
+        with patch("src.vector_store.stores.memory_store.InMemoryVectorStore") as mock_vector_store_class:
+            mock_instance = Mock()
+            mock_vector_store_class.return_value = mock_instance
+
+            store = MemoryStore(embedding=mock_embedding)
+            store.add_job_details([sample_job_vector_store])
+
+            assert mock_instance.add_texts.call_args[1]["ids"] == [sample_job_vector_store.job_id]
+
+    def test_get_job_details(self, mock_embedding, sample_job_vector_store):
+        """Test that a stored job can be looked up by id"""
+        store = MemoryStore(embedding=mock_embedding)
+        store.add_job_details([sample_job_vector_store])
+
+        # the score belongs to a search hit and is not stored
+        expected = sample_job_vector_store.model_copy(update={"score": None})
+        assert store.get_job_details(sample_job_vector_store.job_id) == expected
+        assert store.get_job_details("missing") is None
+
+    def test_similarity_search_with_filters(self):
+        """Test that filtered searches only return jobs matching the filters"""
+        store = MemoryStore(embedding=DeterministicFakeEmbedding(size=8))
+        store.add_job_details(
+            [
+                JobVectorStoreFactory.build(job_id="1", job_country="DE", job_city="Berlin"),
+                JobVectorStoreFactory.build(job_id="2", job_country="DE", job_city="Munich"),
+                JobVectorStoreFactory.build(job_id="3", job_country="AT", job_city="Vienna"),
+            ]
+        )
+
+        results = store.similarity_search("python developer", top_k=5, filters={"country": "de", "city": "berlin"})
+
+        assert [result.job_id for result in results] == ["1"]
+        assert store.similarity_search("python developer", filters={"country": "fr"}) == []
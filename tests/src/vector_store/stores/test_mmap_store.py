@@ -0,0 +1,140 @@
+import os
+
+import pytest
+
+from src.vector_store.interface import VectorStore
+from src.vector_store.stores.mmap_store import MmapStore, ReadOnlyStoreError
+from tests.factories.vector_store import TitleOnlyJobFactory
+
+
+@pytest.fixture
+def writer(seeded_embedding, tmp_path):
+    store = MmapStore(seeded_embedding, path=str(tmp_path))
+    yield store
+    store.close()
+
+
+class TestMmapStore:
+    """Test cases for MmapStore"""
+
+    def test_inherits_from_vector_store_interface(self, writer):
+        """Test that MmapStore implements the VectorStore interface"""
+        assert isinstance(writer, VectorStore)
+        assert not writer.read_only
+
+    def test_empty_store(self, writer):
+        """Test that a new store has nothing to return"""
+        assert writer.similarity_search("#1") == []
+        assert writer.get_job_details("1") is None
+        assert len(writer) == 0
+
+    def test_search_across_segments(self, writer):
+        """Test that the best matches are merged across segments"""
+        writer.add_job_details(TitleOnlyJobFactory.numbered(4))
+        writer.add_job_details(TitleOnlyJobFactory.numbered(2, start=4))
+
+        results = writer.similarity_search("#5", top_k=3)
+
+        assert results[0].job_id == "5"
+        assert results[0].score == pytest.approx(1.0, abs=1e-5)
+        assert len(results) == 3
+        assert writer.get_job_details("2").job_title == "Job #2"
+
+    def test_readding_a_job_tombstones_the_old_version(self, writer):
+        """Test that only the newest version of a re-added job is returned"""
+        writer.add_job_details(TitleOnlyJobFactory.numbered(4))
+        writer.add_job_details(TitleOnlyJobFactory.numbered(1, start=1, title="Updated"))
+
+        results = writer.similarity_search("#1", top_k=10)
+
+        assert len(writer) == 4
+        assert [result.job_id for result in results].count("1") == 1
+        assert writer.get_job_details("1").job_title == "Updated #1"
+
+    def test_segments_are_merged(self, writer):
+        """Test that equally sized adjacent segments are merged"""
+        for start in range(0, 8, 2):
+            writer.add_job_details(TitleOnlyJobFactory.numbered(2, start=start))
+
+        assert len(writer._segments) == 1
+        assert len(writer) == 8
+
+    def test_unreferenced_files_are_removed(self, writer, tmp_path):
+        """Test that files of merged segments and stale tombstones are deleted"""
+        writer.add_job_details(TitleOnlyJobFactory.numbered(2))
+        writer.add_job_details(TitleOnlyJobFactory.numbered(2, start=2))
+        (tmp_path / "segment-99999999.vectors.npy").write_bytes(b"partial")
+
+        writer.add_job_details(TitleOnlyJobFactory.numbered(1))
+
+        segment_names = {filename.split(".")[0] for filename in os.listdir(tmp_path) if filename.startswith("segment")}
+        assert segment_names == {segment.name for segment in writer._segments}
+
+    def test_foreign_files_are_kept(self, writer, tmp_path):
+        """Test that files and directories the store did not write survive garbage collection"""
+        (tmp_path / "important.txt").write_text("keep me")
+        (tmp_path / "segment-backup").mkdir()
+
+        writer.add_job_details(TitleOnlyJobFactory.numbered(2))
+        writer.add_job_details(TitleOnlyJobFactory.numbered(2, start=2))
+
+        assert (tmp_path / "important.txt").read_text() == "keep me"
+        assert (tmp_path / "segment-backup").is_dir()
+
+    def test_second_writer_opens_read_only(self, writer, seeded_embedding, tmp_path):
+        """Test that only one process can hold the writer lock"""
+        reader = MmapStore(seeded_embedding, path=str(tmp_path))
+
+        assert reader.read_only
+        with pytest.raises(ReadOnlyStoreError):
+            reader.add_job_details(TitleOnlyJobFactory.numbered(1))
+
+    def test_reader_sees_published_segments(self, writer, seeded_embedding, tmp_path):
+        """Test that a reader maps segments published after it opened the store"""
+        reader = MmapStore(seeded_embedding, path=str(tmp_path), writer=False)
+        assert reader.similarity_search("#1") == []
+
+        writer.add_job_details(TitleOnlyJobFactory.numbered(3))
+
+        assert reader.similarity_search("#1", top_k=1)[0].job_id == "1"
+        assert len(reader) == 3
+
+    def test_store_survives_reopening(self, writer, seeded_embedding, tmp_path):
+        """Test that a reopened store serves the persisted jobs"""
+        writer.add_job_details(TitleOnlyJobFactory.numbered(3))
+        writer.close()
+
+        reopened = MmapStore(seeded_embedding, path=str(tmp_path))
+
+        assert not reopened.read_only
+        assert reopened.get_job_details("2").job_title == "Job #2"
+        reopened.add_job_details(TitleOnlyJobFactory.numbered(1, start=3))
+        assert len(reopened) == 4
+        reopened.close()
+
+    def test_dimension_mismatch(self, writer, seeded_embedding):
+        """Test that vectors of another dimension are rejected"""
+        writer.add_job_details(TitleOnlyJobFactory.numbered(1))
+        seeded_embedding.embed_documents.side_effect = lambda texts: [[1.0, 0.0] for _ in texts]
+
+        with pytest.raises(ValueError):
+            writer.add_job_details(TitleOnlyJobFactory.numbered(1, start=1))
+
+    def test_similarity_search_with_filters(self, writer):
+        """Test that filtered searches only read and return matching live jobs across segments"""
+        writer.add_job_details(TitleOnlyJobFactory.numbered(4))
+        writer.add_job_details(TitleOnlyJobFactory.numbered(3, start=4))
+
+        results = writer.similarity_search("#2", top_k=10, filters={"country": "de"})
+
+        assert results[0].job_id == "2"
+        assert sorted(result.job_id for result in results) == ["0", "2", "4", "6"]
+        assert writer.similarity_search("#2", filters={"country": "fr"}) == []
+
+    def test_filters_skip_tombstoned_versions(self, writer):
+        """Test that a job moved to another country is only found under the new one"""
+        writer.add_job_details(TitleOnlyJobFactory.numbered(4))
+        writer.add_job_details(TitleOnlyJobFactory.numbered(1, start=2, country="AT"))
+
+        assert "2" not in [result.job_id for result in writer.similarity_search("#2", filters={"country": "de"})]
+        assert writer.similarity_search("#2", top_k=1, filters={"country": "at"})[0].job_id == "2"
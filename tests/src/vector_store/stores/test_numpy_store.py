@@ -0,0 +1,157 @@
+from typing import List
+
+import numpy as np
+import pytest
+
+from src.common.cache import LRUCache
+from src.vector_store.interface import VectorStore
+from src.vector_store.stores.numpy_store import NumpyStore
+from tests.factories.vector_store import TitleOnlyJobFactory
+
+
+class TestNumpyStore:
+    """Test cases for NumpyStore"""
+
+    def test_inherits_from_vector_store_interface(self, keyword_embedding):
+        """Test that NumpyStore implements the VectorStore interface"""
+        assert isinstance(NumpyStore(embedding=keyword_embedding), VectorStore)
+
+    def test_add_job_details_embeds_in_one_batch(self, keyword_embedding):
+        """Test that a batch of jobs is embedded with a single embed_documents call"""
+        store = NumpyStore(embedding=keyword_embedding)
+        store.add_job_details(
+            [
+                TitleOnlyJobFactory.build(job_id="1", job_title="Python"),
+                TitleOnlyJobFactory.build(job_id="2", job_title="Java"),
+                TitleOnlyJobFactory.build(job_id="3", job_title="Rust"),
+            ]
+        )
+
+        keyword_embedding.embed_documents.assert_called_once()
+        assert len(store) == 3
+
+    def test_similarity_search_ranks_by_cosine_similarity(self, keyword_embedding):
+        """Test that results are the top_k most similar jobs, best first, with scores"""
+        store = NumpyStore(embedding=keyword_embedding)
+        store.add_job_details(
+            [
+                TitleOnlyJobFactory.build(job_id="1", job_title="Java"),
+                TitleOnlyJobFactory.build(job_id="2", job_title="Python"),
+                TitleOnlyJobFactory.build(job_id="3", job_title="Rust"),
+                TitleOnlyJobFactory.build(job_id="4", job_title="Python Backend"),
+            ]
+        )
+
+        results = store.similarity_search("python", top_k=2)
+
+        assert [result.job_id for result in results] == ["2", "4"]
+        assert results[0].score == pytest.approx(1.0)
+        assert results[1].score == pytest.approx(0.9 / np.linalg.norm([0.9, 0.1]))
+
+    def test_similarity_search_top_k_larger_than_store(self, keyword_embedding):
+        """Test that asking for more results than stored returns every job"""
+        store = NumpyStore(embedding=keyword_embedding)
+        store.add_job_details(
+            [
+                TitleOnlyJobFactory.build(job_id="1", job_title="Java"),
+                TitleOnlyJobFactory.build(job_id="2", job_title="Python"),
+            ]
+        )
+
+        assert [result.job_id for result in store.similarity_search("python", top_k=10)] == ["2", "1"]
+
+    def test_similarity_search_empty_store(self, keyword_embedding):
+        """Test that searching an empty store returns nothing"""
+        assert NumpyStore(embedding=keyword_embedding).similarity_search("python") == []
+
+    def test_readding_a_job_replaces_it(self, keyword_embedding):
+        """Test that re-adding a job id overwrites its row instead of duplicating it"""
+        store = NumpyStore(embedding=keyword_embedding)
+        store.add_job_details([TitleOnlyJobFactory.build(job_id="1", job_title="Java")])
+        store.add_job_details([TitleOnlyJobFactory.build(job_id="1", job_title="Python")])
+
+        assert len(store) == 1
+        results = store.similarity_search("python", top_k=1)
+        assert results[0].job_title == "Python"
+        assert results[0].score == pytest.approx(1.0)
+
+    def test_grows_past_initial_capacity(self, keyword_embedding):
+        """Test that the matrix grows and keeps earlier rows"""
+        store = NumpyStore(embedding=keyword_embedding, initial_capacity=1)
+        store.add_job_details([TitleOnlyJobFactory.build(job_id="1", job_title="Python")])
+        store.add_job_details(
+            [
+                TitleOnlyJobFactory.build(job_id="2", job_title="Java"),
+                TitleOnlyJobFactory.build(job_id="3", job_title="Rust"),
+            ]
+        )
+
+        assert len(store) == 3
+        assert store.similarity_search("python", top_k=1)[0].job_id == "1"
+        assert store.similarity_search("rust", top_k=1)[0].job_id == "3"
+
+    def test_get_job_details(self, keyword_embedding):
+        """Test lookup of a stored job by id"""
+        store = NumpyStore(embedding=keyword_embedding)
+        store.add_job_details([TitleOnlyJobFactory.build(job_id="1", job_title="Python")])
+
+        assert store.get_job_details("1").job_title == "Python"
+        assert store.get_job_details("missing") is None
+
+    def test_query_embedding_cache(self, keyword_embedding):
+        """Test that repeated queries are embedded once when a query embedding cache is given"""
+        store = NumpyStore(
+            embedding=keyword_embedding, query_embedding_cache=LRUCache[List[float]](), embedding_model="keywords"
+        )
+        store.add_job_details([TitleOnlyJobFactory.build(job_id="1", job_title="Python")])
+
+        store.similarity_search("python")
+        store.similarity_search("Python ")
+
+        keyword_embedding.embed_query.assert_called_once()
+
+    def test_query_embedding_cache_is_keyed_by_model(self, keyword_embedding):
+        """Test that two models of the same Embeddings class do not share cached query vectors"""
+        query_embedding_cache = LRUCache[List[float]]()
+        small = NumpyStore(
+            embedding=keyword_embedding, query_embedding_cache=query_embedding_cache, embedding_model="a"
+        )
+        large = NumpyStore(
+            embedding=keyword_embedding, query_embedding_cache=query_embedding_cache, embedding_model="b"
+        )
+
+        small.query_embedding.embed_query("python")
+        large.query_embedding.embed_query("python")
+
+        assert keyword_embedding.embed_query.call_count == 2
+
+    def test_query_embedding_cache_requires_a_model(self, keyword_embedding):
+        """Test that a query embedding cache without a model name is rejected"""
+        with pytest.raises(ValueError):
+            NumpyStore(embedding=keyword_embedding, query_embedding_cache=LRUCache[List[float]]())
+
+    def test_similarity_search_with_filters_scores_matching_jobs_only(self, keyword_embedding):
+        """Test that filtered searches only return jobs matching the filters, best first"""
+        store = NumpyStore(embedding=keyword_embedding)
+        store.add_job_details(
+            [
+                TitleOnlyJobFactory.build(job_id="1", job_title="Python", job_country="US"),
+                TitleOnlyJobFactory.build(job_id="2", job_title="Python Backend", job_country="DE"),
+                TitleOnlyJobFactory.build(job_id="3", job_title="Java", job_country="DE"),
+                TitleOnlyJobFactory.build(job_id="4", job_title="Rust"),
+            ]
+        )
+
+        results = store.similarity_search("python", top_k=5, filters={"country": "de"})
+
+        assert [result.job_id for result in results] == ["2", "3"]
+        assert store.similarity_search("python", filters={"country": "fr"}) == []
+
+    def test_readding_a_job_updates_filter_postings(self, keyword_embedding):
+        """Test that a job moved to another country is only found under the new one"""
+        store = NumpyStore(embedding=keyword_embedding)
+        store.add_job_details([TitleOnlyJobFactory.build(job_id="1", job_title="Python", job_country="US")])
+        store.add_job_details([TitleOnlyJobFactory.build(job_id="1", job_title="Python", job_country="DE")])
+
+        assert store.similarity_search("python", filters={"country": "us"}) == []
+        assert [result.job_id for result in store.similarity_search("python", filters={"country": "DE"})] == ["1"]
@@ -0,0 +1,217 @@
+from typing import Dict
+from unittest.mock import Mock
+
+import pytest
+
+from src.vector_store.interface import PartialUpsertError, VectorStore
+from src.vector_store.stores.memory_store import MemoryStore
+from src.vector_store.stores.numpy_store import NumpyStore
+from src.vector_store.stores.partitioned_store import PartitionedStore, partitions_in
+from tests.factories.vector_store import TitleOnlyJobFactory
+
+JOBS = [
+    TitleOnlyJobFactory.build(job_id="1", job_title="Python Developer", job_country="DE"),
+    TitleOnlyJobFactory.build(job_id="2", job_title="Java Developer", job_country="DE", job_city="Munich"),
+    TitleOnlyJobFactory.build(job_id="3", job_title="Python Backend Engineer", job_country="AT", job_city="Vienna"),
+    TitleOnlyJobFactory.build(job_id="4", job_title="Rust Engineer", job_country="US", job_city="Austin"),
+]
+
+
+@pytest.fixture
+def store(keyword_embedding) -> PartitionedStore:
+    store = PartitionedStore(lambda namespace: NumpyStore(embedding=keyword_embedding), namespace="jobs")
+    store.add_job_details(JOBS)
+    return store
+
+
+@pytest.fixture
+def mock_stores() -> Dict[str, Mock]:
+    """Mock partition stores by namespace, created on demand"""
+    return {}
+
+
+@pytest.fixture
+def mock_store(mock_stores) -> PartitionedStore:
+    def factory(namespace: str) -> Mock:
+        partition_store = Mock(spec=MemoryStore)
+        partition_store.similarity_search.return_value = []
+        partition_store.get_job_details.return_value = None
+        mock_stores[namespace] = partition_store
+        return partition_store
+
+    return PartitionedStore(factory, namespace="jobs", partition_field="country")
+
+
+class TestPartitionedStore:
+    """Test cases for PartitionedStore"""
+
+    def test_inherits_from_vector_store_interface(self, store):
+        """Test that PartitionedStore implements the VectorStore interface"""
+        assert isinstance(store, VectorStore)
+        assert store.namespace == "jobs"
+
+    def test_upserts_are_routed_by_partition_value(self, mock_store, mock_stores):
+        """Test that every job is written to the partition of its normalised country only"""
+        mock_store.add_job_details(
+            JOBS + [TitleOnlyJobFactory.build(job_id="5", job_title="Go Developer", job_country=None)]
+        )
+
+        assert mock_store.partitions == ["at", "de", "unknown", "us"]
+        mock_stores["jobs__de"].add_job_details.assert_called_once_with(JOBS[:2])
+        mock_stores["jobs__at"].add_job_details.assert_called_once_with([JOBS[2]])
+        assert [job.job_id for job in mock_stores["jobs__unknown"].add_job_details.call_args[0][0]] == ["5"]
+
+    def test_single_partition_search_scans_only_its_partition(self, mock_store, mock_stores):
+        """Test that a search filtered to one country reaches only that partition, without the country filter"""
+        mock_store.add_job_details(JOBS)
+
+        mock_store.similarity_search("python", top_k=3, filters={"country": "DE", "city": "Berlin"})
+
+        mock_stores["jobs__de"].similarity_search.assert_called_once_with("python", top_k=3, filters={"city": "Berlin"})
+        mock_stores["jobs__at"].similarity_search.assert_not_called()
+        mock_stores["jobs__us"].similarity_search.assert_not_called()
+
+    def test_multi_partition_search_is_merged_by_score(self, store):
+        """Test that a search over several countries merges the partitions' results by score"""
+        results = store.similarity_search("python", top_k=2, filters={"country": ["de", "at"]})
+
+        assert [result.job_id for result in results] == ["1", "3"]
+        assert results[0].score >= results[1].score
+
+    def test_unfiltered_search_fans_out_to_every_partition(self, store):
+        """Test that a search without a country filter covers all partitions"""
+        results = store.similarity_search("rust", top_k=1)
+
+        assert [result.job_id for result in results] == ["4"]
+
+    def test_other_filters_still_apply_within_partitions(self, store):
+        """Test that filters on other fields restrict the results of every partition"""
+        results = store.similarity_search("python", top_k=5, filters={"country": ["de", "at"], "city": "vienna"})
+
+        assert [result.job_id for result in results] == ["3"]
+
+    def test_reads_do_not_create_partitions(self, mock_store, mock_stores):
+        """Test that searches and lookups of values nothing was upserted into create no partitions"""
+        mock_store.add_job_details([JOBS[0]])
+
+        assert mock_store.similarity_search("python", filters={"country": ["fr", "xx"]}) == []
+        assert mock_store.get_job_details("missing") is None
+
+        assert mock_store.partitions == ["de"]
+        assert list(mock_stores) == ["jobs__de"]
+
+    def test_unpartitioned_store_is_searched_with_every_partition(self, keyword_embedding):
+        """Test that jobs written before partitioning stay searchable, filtered as usual"""
+        unpartitioned = NumpyStore(embedding=keyword_embedding)
+        unpartitioned.add_job_details(
+            [TitleOnlyJobFactory.build(job_id="legacy", job_title="Python Developer", job_country="AT")]
+        )
+        store = PartitionedStore(
+            lambda namespace: NumpyStore(embedding=keyword_embedding), namespace="jobs", unpartitioned=unpartitioned
+        )
+        store.add_job_details(JOBS)
+
+        assert {job.job_id for job in store.similarity_search("python", filters={"country": "at"})} == {"3", "legacy"}
+        assert {job.job_id for job in store.similarity_search("python", filters={"country": "de"})} == {"1", "2"}
+        assert store.get_job_details("legacy").job_id == "legacy"
+
+    def test_contradicting_partition_filters_match_nothing(self, mock_store, mock_stores):
+        """Test that a search whose country filters contradict each other searches no partition"""
+        mock_store.add_job_details(JOBS)
+
+        assert mock_store.similarity_search("python", filters={"country": "de", "job_country": "at"}) == []
+        assert all(not partition.similarity_search.called for partition in mock_stores.values())
+
+    def test_duplicates_keep_their_best_score(self):
+        """Test that a job found in several partitions is returned once, with its best score"""
+        job = TitleOnlyJobFactory.build(job_id="1", job_title="Python Developer")
+        merged = PartitionedStore._merge(
+            [
+                [job.model_copy(update={"score": 0.2})],
+                [
+                    job.model_copy(update={"score": 0.9}),
+                    TitleOnlyJobFactory.build(job_id="2", job_title="Java").model_copy(update={"score": None}),
+                ],
+            ],
+            5,
+        )
+
+        assert [(result.job_id, result.score) for result in merged] == [("1", 0.9), ("2", None)]
+
+    def test_get_job_details_uses_the_upsert_partition(self, mock_store, mock_stores):
+        """Test that a job upserted through the store is read from its own partition"""
+        mock_store.add_job_details(JOBS)
+        mock_stores["jobs__at"].get_job_details.return_value = JOBS[2]
+
+        assert mock_store.get_job_details("3") == JOBS[2]
+        mock_stores["jobs__de"].get_job_details.assert_not_called()
+
+    def test_get_job_details_searches_known_partitions(self, mock_stores):
+        """Test that a job of unknown partition is looked up in every known partition"""
+        partition_store = Mock(spec=MemoryStore)
+        partition_store.get_job_details.side_effect = lambda job_id: JOBS[3] if job_id == "4" else None
+        mock_store = PartitionedStore(lambda namespace: partition_store, namespace="jobs", partitions=["de", "us"])
+
+        assert mock_store.get_job_details("4") == JOBS[3]
+        assert mock_store.get_job_details("missing") is None
+
+    def test_get_job_details_many_batches_per_partition(self, store):
+        """Test that a batch lookup finds jobs across partitions"""
+        found = store.get_job_details_many(["1", "3", "4", "missing"])
+
+        assert sorted(found) == ["1", "3", "4"]
+
+    def test_job_partitions_are_bounded(self, mock_stores):
+        """Test that only the partitions of recent upserts are remembered, older jobs are looked up everywhere"""
+        partition_store = Mock(spec=MemoryStore)
+        partition_store.get_job_details.return_value = None
+        mock_store = PartitionedStore(lambda namespace: partition_store, namespace="jobs", job_partitions_size=2)
+        mock_store.add_job_details(JOBS)
+
+        assert len(mock_store._job_partitions) == 2
+        mock_store.get_job_details("1")
+        assert partition_store.get_job_details.call_count == len(mock_store.partitions)
+
+    def test_close_stops_searches_and_closes_partitions(self, mock_store, mock_stores):
+        """Test that closing the store closes every partition store and its search threads"""
+        mock_store.add_job_details(JOBS[:3])
+
+        mock_store.close()
+
+        assert all(partition_store.close.called for partition_store in mock_stores.values())
+        with pytest.raises(RuntimeError):
+            mock_store.get_job_details_many(["1", "3"])
+
+    def test_failing_partition_does_not_stop_the_others(self, mock_store, mock_stores):
+        """Test that every partition is written before the error of a failing one is raised"""
+        mock_store.add_job_details([JOBS[0]])
+        mock_stores["jobs__de"].add_job_details.side_effect = RuntimeError("partial failure")
+
+        with pytest.raises(PartialUpsertError) as error:
+            mock_store.add_job_details(JOBS)
+
+        assert sorted(error.value.failed_ids) == ["1", "2"]
+        assert error.value.upserted == 2
+        mock_stores["jobs__at"].add_job_details.assert_called_once_with([JOBS[2]])
+        mock_stores["jobs__us"].add_job_details.assert_called_once_with([JOBS[3]])
+
+    def test_cache_namespaces(self, mock_store):
+        """Test that upserts touch their partitions and the store namespace, and searches the ones they read"""
+        assert mock_store.upsert_namespaces(JOBS[:3]) == ["jobs", "jobs__at", "jobs__de"]
+        assert mock_store.search_namespaces({"country": ["DE", "at"]}) == ["jobs__at", "jobs__de"]
+        assert mock_store.search_namespaces({"city": "berlin"}) == ["jobs"]
+
+    def test_partition_field_must_be_filterable(self):
+        """Test that partitioning on a field searches cannot filter on is rejected"""
+        with pytest.raises(ValueError):
+            PartitionedStore(Mock(), namespace="jobs", partition_field="job_title")
+
+
+class TestPartitionsIn:
+    """Test cases for partitions_in"""
+
+    def test_partitions_are_read_from_namespaces(self):
+        """Test that only the namespaces of the store's partitions are picked up"""
+        namespaces = ["jobs", "jobs__de", "jobs__us", "jobs-dev", "other__de", "jobs__"]
+
+        assert partitions_in("jobs", namespaces) == ["de", "us"]
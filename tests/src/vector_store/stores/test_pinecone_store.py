@@ -1,13 +1,33 @@
+import json
 from typing import List
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
+import pytest
 from pinecone import Pinecone
 
+from config import settings
+from src.common.cache import LRUCache
+from src.vector_store.filters import FILTERABLE_FIELDS, filter_value, to_metadata_filter
 from src.vector_store.models import JobVectorStore
-from src.vector_store.stores.pinecone_store import PineconeStore
+from src.vector_store.stores.pinecone_store import (
+    PartialUpsertError,
+    PineconeStore,
+    chunk_records,
+    is_retryable,
+    to_pinecone_filter,
+)
+from tests.factories.vector_store import JobVectorStoreFactory
 from tests.fixtures.pinecone_search_result import pinecone_search_result
 
 
+class PineconeApiError(Exception):
+    """Stands in for the Pinecone client's API exceptions, which carry an HTTP status"""
+
+    def __init__(self, message: str, status: int):
+        super().__init__(message)
+        self.status = status
+
+
 class TestPineconeStore:
 
     def test_add_job_details(
@@ -34,10 +54,31 @@ class TestPineconeStore:
                     "id": sample_job_vector_stores[0].job_id,
                     "description": sample_job_vector_stores[0].get_combined_text_document(),
                     **sample_job_vector_stores[0].model_dump(exclude_none=True),
+                    **{
+                        f"{field}_normalized": filter_value(getattr(sample_job_vector_stores[0], field))
+                        for field in FILTERABLE_FIELDS
+                        if filter_value(getattr(sample_job_vector_stores[0], field)) is not None
+                    },
                 }
             ],
         )
 
+    def test_records_carry_normalized_filter_fields(
+        self,
+        mock_pinecone: Pinecone,
+    ) -> None:
+        mock_index = Mock()
+        mock_pinecone.return_value.Index.return_value = mock_index
+        job = JobVectorStoreFactory.build(employer_name="JPMorgan Chase", job_country="DE", job_state=None)
+
+        PineconeStore().add_job_details([job])
+
+        record = mock_index.upsert_records.call_args[0][1][0]
+        assert record["employer_name"] == "JPMorgan Chase"
+        assert record["employer_name_normalized"] == "jpmorgan chase"
+        assert record["job_country_normalized"] == "de"
+        assert "job_state_normalized" not in record
+
     def test_similarity_search(
         self,
         mock_pinecone: Pinecone,
@@ -67,3 +108,353 @@ class TestPineconeStore:
                 score=0.9997219443321228,
             )
         ]
+
+    def test_similarity_search_with_cached_query_embedding(
+        self,
+        mock_pinecone: Pinecone,
+    ) -> None:
+        mock_index = Mock()
+        mock_pinecone.return_value.Index.return_value = mock_index
+        mock_pinecone.return_value.inference.embed.return_value = [{"values": [0.1, 0.2]}]
+        mock_index.search.return_value = pinecone_search_result
+
+        with patch.object(settings, "PINECONE_EMBEDDING_MODEL", "llama-text-embed-v2"):
+            store = PineconeStore(query_embedding_cache=LRUCache[List[float]]())
+
+        store.similarity_search(query="software engineer")
+        store.similarity_search(query="Software  Engineer")
+
+        # the second query is served from the query embedding cache
+        mock_pinecone.return_value.inference.embed.assert_called_once()
+        assert mock_pinecone.return_value.inference.embed.call_args[1]["parameters"]["input_type"] == "query"
+        search_kwargs = mock_index.search.call_args[1]
+        assert search_kwargs["query"] == {"top_k": 5, "vector": {"values": [0.1, 0.2]}}
+        assert "rerank" not in search_kwargs
+
+    def test_close_stops_the_query_embedding_batcher(
+        self,
+        mock_pinecone: Pinecone,
+    ) -> None:
+        mock_index = Mock()
+        mock_pinecone.return_value.Index.return_value = mock_index
+        mock_pinecone.return_value.inference.embed.return_value = [{"values": [0.1, 0.2]}]
+        mock_index.search.return_value = pinecone_search_result
+
+        with patch.object(settings, "PINECONE_EMBEDDING_MODEL", "llama-text-embed-v2"):
+            store = PineconeStore(query_embedding_cache=LRUCache[List[float]]())
+        store.similarity_search(query="software engineer")
+
+        store.close()
+
+        assert store._query_batcher is not None and store._query_batcher._worker is None
+
+    def test_similarity_search_without_embedding_model_uses_integrated_inference(
+        self,
+        mock_pinecone: Pinecone,
+    ) -> None:
+        mock_index = Mock()
+        mock_pinecone.return_value.Index.return_value = mock_index
+        mock_index.search.return_value = pinecone_search_result
+
+        with patch.object(settings, "PINECONE_EMBEDDING_MODEL", ""):
+            store = PineconeStore(query_embedding_cache=LRUCache[List[float]]())
+
+        store.similarity_search(query="software engineer")
+
+        assert store.query_embedding is None
+        assert mock_index.search.call_args[1]["query"] == {"top_k": 5, "inputs": {"text": "software engineer"}}
+
+    def test_get_job_details_fetches_record_metadata(
+        self,
+        sample_job_vector_stores: List[JobVectorStore],
+        mock_pinecone: Pinecone,
+    ) -> None:
+        mock_index = Mock()
+        mock_pinecone.return_value.Index.return_value = mock_index
+        job = sample_job_vector_stores[0]
+        mock_index.fetch.return_value.vectors = {job.job_id: Mock(metadata=job.model_dump(exclude_none=True))}
+
+        store = PineconeStore()
+
+        assert store.get_job_details(job.job_id) == job.model_copy(update={"score": None})
+        mock_index.fetch.assert_called_once_with(ids=[job.job_id], namespace="jobs")
+
+    def test_get_job_details_many_is_one_fetch(
+        self,
+        sample_job_vector_stores: List[JobVectorStore],
+        mock_pinecone: Pinecone,
+    ) -> None:
+        mock_index = Mock()
+        mock_pinecone.return_value.Index.return_value = mock_index
+        jobs = sample_job_vector_stores[:2]
+        mock_index.fetch.return_value.vectors = {
+            job.job_id: Mock(metadata=job.model_dump(exclude_none=True)) for job in jobs
+        }
+
+        found = PineconeStore().get_job_details_many([job.job_id for job in jobs] + ["missing"])
+
+        assert sorted(found) == sorted(job.job_id for job in jobs)
+        mock_index.fetch.assert_called_once_with(ids=[jobs[0].job_id, jobs[1].job_id, "missing"], namespace="jobs")
+
+    def test_get_job_details_missing_record(
+        self,
+        mock_pinecone: Pinecone,
+    ) -> None:
+        mock_index = Mock()
+        mock_pinecone.return_value.Index.return_value = mock_index
+        mock_index.fetch.return_value.vectors = {}
+
+        store = PineconeStore()
+
+        assert store.get_job_details("missing") is None
+
+    def test_with_namespace_shares_the_index(
+        self,
+        mock_pinecone: Pinecone,
+    ) -> None:
+        mock_index = Mock()
+        mock_pinecone.return_value.Index.return_value = mock_index
+        mock_index.search.return_value = pinecone_search_result
+
+        store = PineconeStore()
+        partition = store.with_namespace("jobs__de")
+        partition.similarity_search(query="software engineer")
+
+        assert store.namespace == "jobs"
+        assert partition.index is store.index
+        assert mock_index.search.call_args[1]["namespace"] == "jobs__de"
+        mock_pinecone.return_value.Index.assert_called_once()
+
+    def test_list_namespaces(
+        self,
+        mock_pinecone: Pinecone,
+    ) -> None:
+        mock_index = Mock()
+        mock_pinecone.return_value.Index.return_value = mock_index
+        mock_index.describe_index_stats.return_value.namespaces = {"jobs__us": Mock(), "jobs": Mock()}
+
+        assert PineconeStore().list_namespaces() == ["jobs", "jobs__us"]
+
+    def test_similarity_search_pushes_filters_down(
+        self,
+        mock_pinecone: Pinecone,
+    ) -> None:
+        mock_index = Mock()
+        mock_pinecone.return_value.Index.return_value = mock_index
+        mock_index.search.return_value = pinecone_search_result
+
+        with patch.object(settings, "PINECONE_EMBEDDING_MODEL", ""):
+            store = PineconeStore(legacy_filter_fallback=False)
+
+        store.similarity_search(query="software engineer", top_k=20, filters={"country": "DE", "page": 2})
+
+        search_kwargs = mock_index.search.call_args[1]
+        assert search_kwargs["query"] == {
+            "top_k": 20,
+            "inputs": {"text": "software engineer"},
+            "filter": {"job_country_normalized": {"$eq": "de"}},
+        }
+
+    def test_similarity_search_falls_back_to_raw_fields(
+        self,
+        mock_pinecone: Pinecone,
+    ) -> None:
+        """Test that records written without normalised fields still match filters by default"""
+        mock_index = Mock()
+        mock_pinecone.return_value.Index.return_value = mock_index
+        mock_index.search.return_value = pinecone_search_result
+
+        with patch.object(settings, "PINECONE_EMBEDDING_MODEL", ""):
+            PineconeStore().similarity_search(query="software engineer", filters={"country": "de"})
+
+        assert mock_index.search.call_args[1]["query"]["filter"] == {
+            "$or": [{"job_country_normalized": {"$eq": "de"}}, {"job_country": {"$in": ["DE", "De", "de"]}}]
+        }
+
+    def test_backfill_normalized_fields(
+        self,
+        mock_pinecone: Pinecone,
+    ) -> None:
+        """Test that only records missing or disagreeing with their normalised fields are updated in place"""
+        mock_index = Mock()
+        mock_pinecone.return_value.Index.return_value = mock_index
+        legacy = Mock(metadata={"job_id": "1", "job_country": "DE", "job_city": "Berlin"})
+        current = Mock(metadata={"job_id": "2", "job_country": "AT", "job_country_normalized": "at"})
+        mock_index.list.return_value = iter([["1", "2"]])
+        mock_index.fetch.return_value.vectors = {"1": legacy, "2": current}
+
+        store = PineconeStore()
+
+        assert store.backfill_normalized_fields() == 1
+        mock_index.update.assert_called_once_with(
+            id="1",
+            set_metadata={"job_country_normalized": "de", "job_city_normalized": "berlin"},
+            namespace="jobs",
+        )
+
+    def test_similarity_search_requests_only_job_fields(
+        self,
+        mock_pinecone: Pinecone,
+    ) -> None:
+        mock_index = Mock()
+        mock_pinecone.return_value.Index.return_value = mock_index
+        mock_index.search.return_value = pinecone_search_result
+
+        store = PineconeStore()
+        store.similarity_search(query="software engineer")
+
+        fields = mock_index.search.call_args[1]["fields"]
+        assert "description" not in fields
+        assert set(fields) == set(JobVectorStore.model_fields) - {"score"}
+
+    def test_contradicting_filters_match_nothing(
+        self,
+        mock_pinecone: Pinecone,
+    ) -> None:
+        mock_index = Mock()
+        mock_pinecone.return_value.Index.return_value = mock_index
+
+        store = PineconeStore()
+
+        assert store.similarity_search(query="software engineer", filters={"country": "de", "job_country": "at"}) == []
+        mock_index.search.assert_not_called()
+
+
+class TestPineconeFilter:
+    """Test cases for translating structured filters to Pinecone metadata filters"""
+
+    def test_every_field_is_restricted(self):
+        """Test that fields are ANDed and alternatives of one field are ORed, on the normalised copies"""
+        pinecone_filter = to_pinecone_filter(
+            to_metadata_filter({"country": ["de", "at"], "employer": "JPMorgan Chase"})
+        )
+
+        assert pinecone_filter == {
+            "employer_name_normalized": {"$eq": "jpmorgan chase"},
+            "job_country_normalized": {"$in": ["at", "de"]},
+        }
+
+    def test_legacy_fields_match_case_variants(self):
+        """Test that every field also matches case variants of its raw values, fields ANDed"""
+        pinecone_filter = to_pinecone_filter(
+            to_metadata_filter({"country": ["de", "at"], "city": "new york"}), legacy_fields=True
+        )
+
+        assert pinecone_filter == {
+            "$and": [
+                {
+                    "$or": [
+                        {"job_city_normalized": {"$eq": "new york"}},
+                        {"job_city": {"$in": ["NEW YORK", "New York", "New york", "new york"]}},
+                    ]
+                },
+                {
+                    "$or": [
+                        {"job_country_normalized": {"$in": ["at", "de"]}},
+                        {"job_country": {"$in": ["AT", "At", "DE", "De", "at", "de"]}},
+                    ]
+                },
+            ]
+        }
+
+
+class TestPineconeStoreUpsert:
+    """Test cases for chunked, concurrent PineconeStore upserts"""
+
+    @staticmethod
+    def store(mock_pinecone: Pinecone, **kwargs) -> PineconeStore:
+        mock_pinecone.return_value.Index.return_value = Mock()
+        return PineconeStore(upsert_retry_backoff_seconds=0, **kwargs)
+
+    def test_single_record_is_one_call(self, mock_pinecone: Pinecone) -> None:
+        """Test that a one-record upsert is still a single upsert_records call"""
+        store = self.store(mock_pinecone)
+        job = JobVectorStoreFactory.build()
+
+        store.add_job_details([job])
+
+        store.index.upsert_records.assert_called_once_with("jobs", [store._to_record(job)])
+
+    def test_records_are_chunked_by_count(self, mock_pinecone: Pinecone) -> None:
+        """Test that every call carries at most upsert_batch_size records, and all records are sent"""
+        store = self.store(mock_pinecone, upsert_batch_size=96)
+        jobs = JobVectorStoreFactory.batch(200)
+
+        store.add_job_details(jobs)
+
+        calls = store.index.upsert_records.call_args_list
+        assert sorted(len(call[0][1]) for call in calls) == [8, 96, 96]
+        assert sorted(record["id"] for call in calls for record in call[0][1]) == sorted(job.job_id for job in jobs)
+
+    def test_failed_chunk_is_retried(self, mock_pinecone: Pinecone) -> None:
+        """Test that a transient failure is retried and the upsert succeeds"""
+        store = self.store(mock_pinecone, upsert_retries=2)
+        store.index.upsert_records.side_effect = [ConnectionError("reset"), None]
+
+        store.add_job_details(JobVectorStoreFactory.batch(2))
+
+        assert store.index.upsert_records.call_count == 2
+
+    def test_client_errors_are_not_retried(self, mock_pinecone: Pinecone) -> None:
+        """Test that a rejected request fails without retries"""
+        store = self.store(mock_pinecone, upsert_retries=2)
+        store.index.upsert_records.side_effect = PineconeApiError("bad request", status=400)
+
+        with pytest.raises(PartialUpsertError):
+            store.add_job_details(JobVectorStoreFactory.batch(2))
+
+        store.index.upsert_records.assert_called_once()
+
+    def test_programming_errors_are_not_retried(self, mock_pinecone: Pinecone) -> None:
+        """Test that errors without an HTTP status are only retried when they are transport errors"""
+        assert is_retryable(TimeoutError("timed out"))
+        assert is_retryable(PineconeApiError("throttled", status=429))
+        assert not is_retryable(ValueError("bad record"))
+        assert not is_retryable(TypeError("bad argument"))
+
+    def test_partial_failure_is_reported(self, mock_pinecone: Pinecone) -> None:
+        """Test that chunks failing after their retries are reported once the others are upserted"""
+        store = self.store(mock_pinecone, upsert_batch_size=2, upsert_retries=1, upsert_concurrency=1)
+        jobs = JobVectorStoreFactory.batch(5)
+        failing_ids = {jobs[2].job_id, jobs[3].job_id}
+
+        def upsert_records(namespace, records):
+            if {record["id"] for record in records} == failing_ids:
+                raise PineconeApiError("unavailable", status=503)
+
+        store.index.upsert_records.side_effect = upsert_records
+
+        with pytest.raises(PartialUpsertError) as error:
+            store.add_job_details(jobs)
+
+        assert sorted(error.value.failed_ids) == sorted(failing_ids)
+        assert error.value.upserted == 3
+        assert len(error.value.errors) == 1
+        # 3 chunks, the failing one tried twice
+        assert store.index.upsert_records.call_count == 4
+
+
+class TestChunkRecords:
+    """Test cases for chunk_records"""
+
+    def test_chunks_respect_the_byte_budget(self):
+        """Test that a chunk is closed before it would exceed max_bytes"""
+        records = [{"id": str(i), "description": "x" * 100} for i in range(10)]
+        record_bytes = len(json.dumps(records[0], separators=(",", ":")))
+
+        chunks = chunk_records(records, max_records=96, max_bytes=record_bytes * 3)
+
+        assert [len(chunk) for chunk in chunks] == [3, 3, 3, 1]
+        assert [record for chunk in chunks for record in chunk] == records
+
+    def test_oversized_record_gets_its_own_chunk(self):
+        """Test that a record bigger than max_bytes is still sent, alone"""
+        records = [{"id": "small"}, {"id": "big", "description": "x" * 1000}, {"id": "small2"}]
+
+        chunks = chunk_records(records, max_records=96, max_bytes=100)
+
+        assert [[record["id"] for record in chunk] for chunk in chunks] == [["small"], ["big"], ["small2"]]
+
+    def test_no_records(self):
+        """Test that nothing to upsert gives no chunks"""
+        assert chunk_records([], max_records=96, max_bytes=100) == []
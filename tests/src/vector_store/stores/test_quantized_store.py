@@ -0,0 +1,147 @@
+import json
+import os
+
+import pytest
+
+from src.vector_store.interface import VectorStore
+from src.vector_store.stores.quantized_store import QuantizedStore
+from tests.factories.vector_store import TitleOnlyJobFactory
+
+
+class TestQuantizedStore:
+    """Test cases for QuantizedStore"""
+
+    def test_inherits_from_vector_store_interface(self, seeded_embedding, tmp_path):
+        """Test that QuantizedStore implements the VectorStore interface"""
+        assert isinstance(QuantizedStore(seeded_embedding, path=str(tmp_path)), VectorStore)
+
+    def test_invalid_quantization(self, seeded_embedding, tmp_path):
+        """Test that unknown quantization schemes are rejected"""
+        with pytest.raises(ValueError):
+            QuantizedStore(seeded_embedding, path=str(tmp_path), quantization="fp8")
+
+    def test_vectors_without_header_are_not_overwritten(self, seeded_embedding, tmp_path):
+        """Test that a path holding vectors the store cannot match to jobs is refused instead of truncated"""
+        (tmp_path / "vectors.f32").write_bytes(b"\0" * 64)
+
+        with pytest.raises(ValueError):
+            QuantizedStore(seeded_embedding, path=str(tmp_path))
+        assert os.path.getsize(tmp_path / "vectors.f32") == 64
+
+    def test_reopened_store_appends(self, seeded_embedding, tmp_path):
+        """Test that a store reopened on its path finds the stored jobs and appends new ones"""
+        store = QuantizedStore(seeded_embedding, path=str(tmp_path), min_train_size=10)
+        store.add_job_details(TitleOnlyJobFactory.numbered(20))
+        store.add_job_details([TitleOnlyJobFactory.numbered(1, start=99)[0].model_copy(update={"job_id": "5"})])
+
+        reopened = QuantizedStore(seeded_embedding, path=str(tmp_path), min_train_size=10)
+        reopened.add_job_details(TitleOnlyJobFactory.numbered(5, start=20))
+
+        assert len(reopened) == 25
+        assert reopened.quantizer is not None
+        assert reopened.get_job_details("5").job_title == "Job #99"
+        assert reopened.similarity_search("#99", top_k=1)[0].job_id == "5"
+        assert reopened.similarity_search("#22", top_k=1, filters={"country": "de"})[0].job_id == "22"
+        assert (tmp_path / "vectors.f32").stat().st_size == 25 * reopened.dimension * 4
+
+    def test_reopen_drops_an_interrupted_upsert(self, seeded_embedding, tmp_path):
+        """Test that vectors and a partial job line of an interrupted upsert are dropped on reopen"""
+        store = QuantizedStore(seeded_embedding, path=str(tmp_path))
+        store.add_job_details(TitleOnlyJobFactory.numbered(3))
+        with open(tmp_path / "vectors.f32", "ab") as f:
+            f.write(b"\0" * store.dimension * 4)
+        with open(tmp_path / "jobs.jsonl", "a") as f:
+            f.write('{"job_id": "3"')
+
+        reopened = QuantizedStore(seeded_embedding, path=str(tmp_path))
+        reopened.add_job_details(TitleOnlyJobFactory.numbered(1, start=3))
+
+        assert len(reopened) == 4
+        assert reopened.similarity_search("#3", top_k=1)[0].job_id == "3"
+
+    def test_reopen_validates_the_header_dimension(self, seeded_embedding, tmp_path):
+        """Test that a header whose dimension does not fit the vectors file is rejected"""
+        QuantizedStore(seeded_embedding, path=str(tmp_path)).add_job_details(TitleOnlyJobFactory.numbered(2))
+        header = json.loads((tmp_path / "store.json").read_text())
+        (tmp_path / "store.json").write_text(json.dumps({**header, "dimension": header["dimension"] * 2}))
+
+        with pytest.raises(ValueError):
+            QuantizedStore(seeded_embedding, path=str(tmp_path))
+
+    def test_exact_search_before_training(self, seeded_embedding, tmp_path):
+        """Test that searches are exact until enough vectors are stored to train the quantizer"""
+        store = QuantizedStore(seeded_embedding, path=str(tmp_path), min_train_size=100)
+        store.add_job_details(TitleOnlyJobFactory.numbered(10))
+
+        results = store.similarity_search("#3", top_k=2)
+
+        assert store.quantizer is None
+        assert results[0].job_id == "3"
+        assert results[0].score == pytest.approx(1.0, abs=1e-5)
+
+    @pytest.mark.parametrize("quantization", ["int8", "pq"])
+    def test_rescored_search_after_training(self, seeded_embedding, tmp_path, quantization):
+        """Test that quantized search with re-scoring finds the exact best match and exact score"""
+        store = QuantizedStore(
+            seeded_embedding, path=str(tmp_path), quantization=quantization, pq_subspaces=4, min_train_size=50
+        )
+        store.add_job_details(TitleOnlyJobFactory.numbered(300))
+
+        results = store.similarity_search("#42", top_k=3)
+
+        assert store.quantizer is not None
+        assert results[0].job_id == "42"
+        assert results[0].score == pytest.approx(1.0, abs=1e-5)
+        assert store.memory_bytes == 300 * store.quantizer.bytes_per_vector
+
+    def test_full_vectors_live_on_disk(self, seeded_embedding, tmp_path):
+        """Test that full-precision vectors are written to the vectors file"""
+        store = QuantizedStore(seeded_embedding, path=str(tmp_path))
+        store.add_job_details(TitleOnlyJobFactory.numbered(5))
+
+        assert (tmp_path / "vectors.f32").stat().st_size == 5 * store.dimension * 4
+
+    def test_quantizer_retrains_when_store_doubles(self, seeded_embedding, tmp_path):
+        """Test that the quantizer is retrained once the store has doubled since the last training"""
+        store = QuantizedStore(seeded_embedding, path=str(tmp_path), min_train_size=20)
+        store.add_job_details(TitleOnlyJobFactory.numbered(20))
+        first = store.quantizer
+        store.add_job_details(TitleOnlyJobFactory.numbered(10, start=20))
+        assert store.quantizer is first
+
+        store.add_job_details(TitleOnlyJobFactory.numbered(10, start=30))
+
+        assert store.quantizer is not first
+        assert len(store._codes) == 40
+
+    def test_readding_a_job_overwrites_its_vector(self, seeded_embedding, tmp_path):
+        """Test that re-adding a job id replaces its vector and metadata in place"""
+        store = QuantizedStore(seeded_embedding, path=str(tmp_path), min_train_size=10)
+        store.add_job_details(TitleOnlyJobFactory.numbered(20))
+        replacement = TitleOnlyJobFactory.numbered(1, start=99)[0].model_copy(update={"job_id": "5"})
+
+        store.add_job_details([replacement])
+
+        assert len(store) == 20
+        assert store.get_job_details("5").job_title == "Job #99"
+        assert store.similarity_search("#99", top_k=1)[0].job_id == "5"
+
+    @pytest.mark.parametrize("min_train_size", [50, 1024])
+    def test_similarity_search_with_filters(self, seeded_embedding, tmp_path, min_train_size):
+        """Test that filtered searches, exact or quantized, only return matching jobs"""
+        store = QuantizedStore(seeded_embedding, path=str(tmp_path), min_train_size=min_train_size)
+        store.add_job_details(TitleOnlyJobFactory.numbered(300))
+
+        results = store.similarity_search("#42", top_k=5, filters={"country": "de"})
+        assert results[0].job_id == "42"
+        assert all(int(result.job_id) % 2 == 0 for result in results)
+        assert store.similarity_search("#42", top_k=5, filters={"country": "at"})[0].job_id != "42"
+
+    def test_readding_a_job_updates_filter_postings(self, seeded_embedding, tmp_path):
+        """Test that a re-added job is only found under its new country"""
+        store = QuantizedStore(seeded_embedding, path=str(tmp_path))
+        store.add_job_details(TitleOnlyJobFactory.numbered(4))
+        store.add_job_details([TitleOnlyJobFactory.numbered(1, start=1)[0].model_copy(update={"job_id": "2"})])
+
+        assert "2" not in [result.job_id for result in store.similarity_search("#1", filters={"country": "de"})]
+        assert store.similarity_search("#1", top_k=1, filters={"country": "at"})[0].job_id in {"1", "2"}
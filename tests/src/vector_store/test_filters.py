@@ -0,0 +1,44 @@
+from src.vector_store.filters import filter_key, matches, to_metadata_filter
+
+
+class TestToMetadataFilter:
+    """Test cases for to_metadata_filter"""
+
+    def test_empty_filters(self):
+        """Test that missing filters restrict nothing"""
+        assert to_metadata_filter(None) == {}
+        assert to_metadata_filter({}) == {}
+
+    def test_keys_map_to_job_fields(self):
+        """Test that search filter keys and job field names restrict the matching job fields"""
+        assert to_metadata_filter({"country": "DE", "employer": "ACME  Corp", "job_city": "Berlin"}) == {
+            "job_country": frozenset({"de"}),
+            "employer_name": frozenset({"acme corp"}),
+            "job_city": frozenset({"berlin"}),
+        }
+
+    def test_list_values_are_alternatives(self):
+        """Test that a list of values accepts any of them"""
+        assert to_metadata_filter({"country": ["DE", "at"]}) == {"job_country": frozenset({"de", "at"})}
+
+    def test_unknown_and_unset_keys_are_ignored(self):
+        """Test that vendor-only keys such as page, and unset values, do not restrict stored jobs"""
+        assert to_metadata_filter({"page": 2, "country": None, "state": ""}) == {}
+
+    def test_filter_key_is_order_independent(self):
+        """Test that equivalent filters share a cache key"""
+        assert filter_key(to_metadata_filter({"country": ["de", "at"], "city": "Berlin"})) == filter_key(
+            to_metadata_filter({"city": "berlin", "country": ["AT", "DE"]})
+        )
+
+
+class TestMatches:
+    """Test cases for matches"""
+
+    def test_every_field_must_match(self):
+        """Test that a job matches only when each filtered field holds an accepted value"""
+        metadata_filter = to_metadata_filter({"country": "de", "city": ["berlin", "munich"]})
+
+        assert matches({"job_country": "DE", "job_city": "Munich"}, metadata_filter)
+        assert not matches({"job_country": "DE", "job_city": "Hamburg"}, metadata_filter)
+        assert not matches({"job_country": "DE"}, metadata_filter)
@@ -0,0 +1,18 @@
+import pytest
+
+from src.vector_store.fusion import reciprocal_rank_fusion
+
+
+class TestReciprocalRankFusion:
+    """Test cases for reciprocal_rank_fusion"""
+
+    def test_ids_ranked_well_in_both_lists_win(self):
+        """Test that an id near the top of both rankings beats one at the top of a single ranking"""
+        fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "d"]], k=60)
+
+        assert [key for key, _ in fused] == ["b", "a", "d", "c"]
+        assert fused[0][1] == pytest.approx(1 / 62 + 1 / 61)
+
+    def test_empty_rankings(self):
+        """Test that fusing nothing returns nothing"""
+        assert reciprocal_rank_fusion([[], []]) == []
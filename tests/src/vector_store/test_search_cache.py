@@ -0,0 +1,80 @@
+from unittest.mock import patch
+
+from src.vector_store.search_cache import SimilaritySearchCache
+from tests.factories.vector_store import JobVectorStoreFactory
+
+
+class TestSimilaritySearchCache:
+    """Test cases for SimilaritySearchCache"""
+
+    def test_get_returns_stored_results(self):
+        """Test that results stored under a key are returned for the same key"""
+        cache = SimilaritySearchCache(max_size=4)
+        results = JobVectorStoreFactory.batch(2)
+        key = cache.key("jobs", "python developer", 5)
+
+        cache.set(key, results)
+
+        assert cache.get(cache.key("jobs", "python developer", 5)) == results
+
+    def test_key_depends_on_query_and_top_k(self):
+        """Test that different queries and top_k values do not share entries"""
+        cache = SimilaritySearchCache(max_size=4)
+        cache.set(cache.key("jobs", "python developer", 5), JobVectorStoreFactory.batch(1))
+
+        assert cache.get(cache.key("jobs", "python developer", 10)) is None
+        assert cache.get(cache.key("jobs", "java developer", 5)) is None
+        assert cache.get(cache.key("other", "python developer", 5)) is None
+
+    def test_bump_invalidates_namespace(self):
+        """Test that bumping a namespace generation invalidates its cached results"""
+        cache = SimilaritySearchCache(max_size=4)
+        cache.set(cache.key("jobs", "python developer"), JobVectorStoreFactory.batch(1))
+        cache.set(cache.key("other", "python developer"), JobVectorStoreFactory.batch(1))
+
+        assert cache.bump("jobs") == 1
+
+        assert cache.get(cache.key("jobs", "python developer")) is None
+        assert cache.get(cache.key("other", "python developer")) is not None
+
+    def test_key_over_several_namespaces(self):
+        """Test that a search reading several namespaces is invalidated by a bump of any of them"""
+        cache = SimilaritySearchCache(max_size=4)
+        cache.set(cache.key(["jobs__at", "jobs__de"], "python developer"), JobVectorStoreFactory.batch(1))
+
+        cache.bump("jobs__us")
+        assert cache.get(cache.key(["jobs__at", "jobs__de"], "python developer")) is not None
+
+        cache.bump("jobs__de")
+        assert cache.get(cache.key(["jobs__at", "jobs__de"], "python developer")) is None
+
+    def test_results_computed_before_bump_are_not_served(self):
+        """Test that a key built before an upsert cannot populate the new generation"""
+        cache = SimilaritySearchCache(max_size=4)
+        stale_key = cache.key("jobs", "python developer")
+        cache.bump("jobs")
+
+        cache.set(stale_key, JobVectorStoreFactory.batch(1))
+
+        assert cache.get(cache.key("jobs", "python developer")) is None
+
+    def test_entries_expire_after_ttl(self):
+        """Test that results are dropped after the TTL, as upserts of other processes do not bump generations"""
+        cache = SimilaritySearchCache(max_size=4, ttl_seconds=10)
+        key = cache.key("jobs", "python developer", 5)
+        with patch("src.common.cache.time.monotonic", return_value=100.0):
+            cache.set(key, JobVectorStoreFactory.batch(1))
+        with patch("src.common.cache.time.monotonic", return_value=105.0):
+            assert cache.get(key) is not None
+        with patch("src.common.cache.time.monotonic", return_value=111.0):
+            assert cache.get(key) is None
+
+    def test_get_returns_copy(self):
+        """Test that mutating returned results does not alter the cache"""
+        cache = SimilaritySearchCache(max_size=4)
+        key = cache.key("jobs", "python developer")
+        cache.set(key, JobVectorStoreFactory.batch(2))
+
+        cache.get(key).clear()  # type: ignore
+
+        assert len(cache.get(key)) == 2  # type: ignore
@@ -2,9 +2,24 @@ from unittest.mock import Mock
 
 import pytest
 
+from src.vector_store.interface import PartialUpsertError
 from src.vector_store.models import JobVectorStore
-from src.vector_store.service import VectorStoreService
+from src.vector_store.rerankers.interface import Reranker, RerankOptions
+from src.vector_store.rerankers.skip_policy import RerankSkipPolicy
+from src.vector_store.search_cache import SimilaritySearchCache
+from src.vector_store.service import DEFAULT_TOP_K, VectorStoreService
 from src.vector_store.stores.memory_store import MemoryStore
+from src.vector_store.stores.partitioned_store import PartitionedStore
+from tests.factories.vector_store import JobVectorStoreFactory
+
+
+def _namespaced_store(namespace: str) -> Mock:
+    """Mock store whose searches and upserts touch only its namespace"""
+    mock_store = Mock(spec=MemoryStore)
+    mock_store.namespace = namespace
+    mock_store.search_namespaces.return_value = [namespace]
+    mock_store.upsert_namespaces.return_value = [namespace]
+    return mock_store
 
 
 class TestVectorStoreService:
@@ -212,3 +227,320 @@ class TestVectorStoreServiceIntegration:
         for store in mock_stores:
             service = VectorStoreService(vector_store=store)
             assert service.vector_store is store  # Test exact instance reference
+
+
+class TestVectorStoreServiceSearchCache:
+    """Test cases for VectorStoreService with a similarity search cache"""
+
+    def test_repeated_search_is_served_from_cache(self, sample_job_vector_stores):
+        """Test that an identical search does not hit the vector store twice"""
+        mock_store = _namespaced_store("jobs")
+        mock_store.similarity_search.return_value = sample_job_vector_stores
+        service = VectorStoreService(vector_store=mock_store, search_cache=SimilaritySearchCache())
+
+        first = service.similarity_search("python developer")
+        second = service.similarity_search("python developer")
+
+        assert first == second == sample_job_vector_stores
+        mock_store.similarity_search.assert_called_once_with("python developer")
+
+    def test_top_k_is_part_of_cache_key(self, sample_job_vector_stores):
+        """Test that searches with different top_k are cached separately"""
+        mock_store = _namespaced_store("jobs")
+        mock_store.similarity_search.return_value = sample_job_vector_stores
+        service = VectorStoreService(vector_store=mock_store, search_cache=SimilaritySearchCache())
+
+        service.similarity_search("python developer", top_k=3)
+        service.similarity_search("python developer", top_k=10)
+
+        assert mock_store.similarity_search.call_count == 2
+        mock_store.similarity_search.assert_any_call("python developer", top_k=3)
+        mock_store.similarity_search.assert_any_call("python developer", top_k=10)
+
+    def test_add_job_details_invalidates_cache(self, sample_job_vector_stores):
+        """Test that upserting into the namespace invalidates cached results"""
+        mock_store = _namespaced_store("jobs")
+        mock_store.similarity_search.return_value = sample_job_vector_stores
+        search_cache = SimilaritySearchCache()
+        service = VectorStoreService(vector_store=mock_store, search_cache=search_cache)
+
+        service.similarity_search("python developer")
+        service.add_job_details(sample_job_vector_stores)
+        service.similarity_search("python developer")
+
+        assert mock_store.similarity_search.call_count == 2
+        assert search_cache.generation("jobs") == 1
+
+    def test_unchanged_upsert_keeps_cache(self, sample_job_vector_stores):
+        """Test that re-upserting identical jobs keeps cached results, while a changed job invalidates them"""
+        mock_store = _namespaced_store("jobs")
+        mock_store.similarity_search.return_value = sample_job_vector_stores
+        search_cache = SimilaritySearchCache()
+        service = VectorStoreService(vector_store=mock_store, search_cache=search_cache)
+
+        service.add_job_details(sample_job_vector_stores)
+        service.similarity_search("python developer")
+        service.add_job_details([job.model_copy() for job in sample_job_vector_stores])
+        service.similarity_search("python developer")
+
+        assert mock_store.similarity_search.call_count == 1
+        assert search_cache.generation("jobs") == 1
+
+        service.add_job_details([sample_job_vector_stores[0].model_copy(update={"job_title": "Changed"})])
+        service.similarity_search("python developer")
+
+        assert mock_store.similarity_search.call_count == 2
+        assert search_cache.generation("jobs") == 2
+
+    def test_failed_upsert_still_invalidates_cache(self, sample_job_vector_stores):
+        """Test that a failing upsert, which may have written some jobs, invalidates cached results"""
+        mock_store = _namespaced_store("jobs")
+        mock_store.add_job_details.side_effect = RuntimeError("partial failure")
+        search_cache = SimilaritySearchCache()
+        service = VectorStoreService(vector_store=mock_store, search_cache=search_cache)
+
+        with pytest.raises(RuntimeError):
+            service.add_job_details(sample_job_vector_stores)
+
+        assert search_cache.generation("jobs") == 1
+
+    def test_filters_are_passed_to_the_store(self, sample_job_vector_stores):
+        """Test that filters reach the store and are part of the cache key"""
+        mock_store = _namespaced_store("jobs")
+        mock_store.similarity_search.return_value = sample_job_vector_stores
+        service = VectorStoreService(vector_store=mock_store, search_cache=SimilaritySearchCache())
+
+        service.similarity_search("python developer", filters={"country": "de"})
+        service.similarity_search("python developer", filters={"country": "DE", "page": 2})
+        service.similarity_search("python developer", filters={"country": "at"})
+
+        assert mock_store.similarity_search.call_count == 2
+        mock_store.similarity_search.assert_any_call("python developer", filters={"country": "de"})
+        mock_store.similarity_search.assert_any_call("python developer", filters={"country": "at"})
+
+    def test_upserts_invalidate_only_the_partitions_they_touch(self, sample_job_vector_stores):
+        """Test that an upsert into one partition keeps the cached searches of other partitions"""
+        partition_store = Mock(spec=MemoryStore)
+        partition_store.similarity_search.return_value = sample_job_vector_stores
+        store = PartitionedStore(lambda namespace: partition_store, namespace="jobs", partitions=["at", "de"])
+        search_cache = SimilaritySearchCache()
+        service = VectorStoreService(vector_store=store, search_cache=search_cache)
+
+        service.similarity_search("python developer", filters={"country": "at"})
+        service.similarity_search("python developer")
+        service.add_job_details([JobVectorStoreFactory.build(job_country="DE")])
+        service.similarity_search("python developer", filters={"country": "at"})
+        service.similarity_search("python developer")
+
+        # the unfiltered search reads every partition and is searched again
+        assert partition_store.similarity_search.call_count == 1 + 2 + 2
+        assert search_cache.generation("jobs__de") == search_cache.generation("jobs") == 1
+        assert search_cache.generation("jobs__at") == 0
+
+
+class TestVectorStoreServiceStreaming:
+    """Test cases for VectorStoreService.add_job_details_stream"""
+
+    @pytest.mark.asyncio
+    async def test_stream_is_upserted_in_batches(self, sample_job_vector_stores):
+        """Test that a stream of jobs is upserted in chunks of batch_size"""
+        mock_store = Mock(spec=MemoryStore)
+        service = VectorStoreService(vector_store=mock_store)
+
+        async def jobs():
+            for job in sample_job_vector_stores:
+                yield job
+
+        upserted = await service.add_job_details_stream(jobs(), batch_size=2)
+
+        assert upserted == len(sample_job_vector_stores)
+        assert [len(call.args[0]) for call in mock_store.add_job_details.call_args_list] == [2, 2, 1]
+
+    @pytest.mark.asyncio
+    async def test_partial_failure_does_not_stop_the_stream(self, sample_job_vector_stores):
+        """Test that a batch failing in part is logged and the following batches are still upserted"""
+        mock_store = Mock(spec=MemoryStore)
+        failure = PartialUpsertError(failed_ids=[sample_job_vector_stores[0].job_id], upserted=1, errors=[OSError()])
+        mock_store.add_job_details.side_effect = [failure, None, None]
+        service = VectorStoreService(vector_store=mock_store)
+
+        async def jobs():
+            for job in sample_job_vector_stores:
+                yield job
+
+        upserted = await service.add_job_details_stream(jobs(), batch_size=2)
+
+        assert upserted == len(sample_job_vector_stores) - 1
+        assert mock_store.add_job_details.call_count == 3
+
+
+class TestVectorStoreServiceRerank:
+    """Test cases for the rerank stage of VectorStoreService"""
+
+    @pytest.fixture
+    def reranker(self) -> Mock:
+        # ranks candidates in reverse first-stage order
+        reranker = Mock(spec=Reranker)
+        reranker.rerank.side_effect = lambda query, documents, top_n, max_document_chars=None: [
+            (position, float(position)) for position in reversed(range(len(documents)))
+        ][:top_n]
+        return reranker
+
+    def test_reranker_picks_top_k_among_candidates(self, reranker, sample_job_vector_stores):
+        """Test that the store returns the candidates and the reranker orders and scores the results"""
+        mock_store = Mock(spec=MemoryStore)
+        mock_store.similarity_search.return_value = sample_job_vector_stores
+        service = VectorStoreService(
+            vector_store=mock_store, reranker=reranker, rerank_options=RerankOptions(candidates=5)
+        )
+
+        results = service.similarity_search("python developer", top_k=2)
+
+        mock_store.similarity_search.assert_called_once_with("python developer", top_k=5)
+        reranker.rerank.assert_called_once_with(
+            "python developer",
+            [job.get_combined_text_document() for job in sample_job_vector_stores],
+            2,
+            max_document_chars=None,
+        )
+        assert results == [
+            sample_job_vector_stores[4].model_copy(update={"score": 4.0}),
+            sample_job_vector_stores[3].model_copy(update={"score": 3.0}),
+        ]
+
+    def test_candidates_default_to_top_k(self, reranker, sample_job_vector_stores):
+        """Test that without a candidate count the reranker reorders exactly top_k results"""
+        mock_store = Mock(spec=MemoryStore)
+        mock_store.similarity_search.return_value = sample_job_vector_stores[:3]
+        service = VectorStoreService(vector_store=mock_store, reranker=reranker)
+
+        service.similarity_search("python developer", top_k=3)
+        service.similarity_search("java developer")
+
+        mock_store.similarity_search.assert_any_call("python developer", top_k=3)
+        mock_store.similarity_search.assert_any_call("java developer", top_k=DEFAULT_TOP_K)
+
+    def test_request_options_override_defaults(self, reranker, sample_job_vector_stores):
+        """Test that per-request options replace the service defaults"""
+        mock_store = Mock(spec=MemoryStore)
+        mock_store.similarity_search.return_value = sample_job_vector_stores
+        service = VectorStoreService(
+            vector_store=mock_store, reranker=reranker, rerank_options=RerankOptions(candidates=50)
+        )
+
+        service.similarity_search(
+            "python developer", top_k=2, rerank=RerankOptions(candidates=10, max_document_chars=200)
+        )
+
+        mock_store.similarity_search.assert_called_once_with("python developer", top_k=10)
+        assert reranker.rerank.call_args[1] == {"max_document_chars": 200}
+
+    def test_disabled_rerank_returns_first_stage_results(self, reranker, sample_job_vector_stores):
+        """Test that a search can skip the rerank stage"""
+        mock_store = Mock(spec=MemoryStore)
+        mock_store.similarity_search.return_value = sample_job_vector_stores
+        service = VectorStoreService(vector_store=mock_store, reranker=reranker)
+
+        results = service.similarity_search("python developer", top_k=5, rerank=RerankOptions(enabled=False))
+
+        assert results == sample_job_vector_stores
+        reranker.rerank.assert_not_called()
+
+    def test_rerank_options_are_part_of_cache_key(self, reranker, sample_job_vector_stores):
+        """Test that reranked and first-stage results are cached separately"""
+        mock_store = _namespaced_store("jobs")
+        mock_store.similarity_search.return_value = sample_job_vector_stores
+        service = VectorStoreService(vector_store=mock_store, search_cache=SimilaritySearchCache(), reranker=reranker)
+
+        service.similarity_search("python developer", rerank=RerankOptions(enabled=False))
+        service.similarity_search("python developer")
+        service.similarity_search("python developer", rerank=RerankOptions())
+
+        assert mock_store.similarity_search.call_count == 2
+        reranker.rerank.assert_called_once()
+
+    def test_no_candidates(self, reranker):
+        """Test that the reranker is not called when the store finds nothing"""
+        mock_store = Mock(spec=MemoryStore)
+        mock_store.similarity_search.return_value = []
+        service = VectorStoreService(vector_store=mock_store, reranker=reranker)
+
+        assert service.similarity_search("python developer") == []
+        reranker.rerank.assert_not_called()
+
+
+class TestVectorStoreServiceRerankPolicy:
+    """Test cases for VectorStoreService with an adaptive rerank skip policy"""
+
+    @pytest.fixture
+    def reranker(self) -> Mock:
+        # ranks candidates in reverse first-stage order
+        reranker = Mock(spec=Reranker)
+        reranker.rerank.side_effect = lambda query, documents, top_n, max_document_chars=None: [
+            (position, float(position)) for position in reversed(range(len(documents)))
+        ][:top_n]
+        return reranker
+
+    @staticmethod
+    def scored_jobs(scores):
+        return [JobVectorStoreFactory.build(score=score) for score in scores]
+
+    def test_confident_search_skips_the_rerank(self, reranker):
+        """Test that first-stage results are returned as they are when the policy skips"""
+        jobs = self.scored_jobs([0.9, 0.4, 0.35, 0.3])
+        mock_store = Mock(spec=MemoryStore)
+        mock_store.similarity_search.return_value = jobs
+        service = VectorStoreService(vector_store=mock_store, reranker=reranker, rerank_policy=RerankSkipPolicy())
+
+        results = service.similarity_search("python developer", top_k=2)
+
+        assert results == jobs[:2]
+        reranker.rerank.assert_not_called()
+
+    def test_shrink_reranks_the_best_candidates(self, reranker):
+        """Test that a shrunk decision only sends the best candidates to the reranker"""
+        jobs = self.scored_jobs([0.8, 0.72, 0.7, 0.69, 0.68, 0.67])
+        mock_store = Mock(spec=MemoryStore)
+        mock_store.similarity_search.return_value = jobs
+        service = VectorStoreService(
+            vector_store=mock_store, reranker=reranker, rerank_policy=RerankSkipPolicy(shrink_ratio=0.5)
+        )
+
+        results = service.similarity_search("python developer", top_k=2)
+
+        assert len(reranker.rerank.call_args[0][1]) == 3
+        assert [job.job_id for job in results] == [jobs[2].job_id, jobs[1].job_id]
+
+    def test_shadow_mode_reranks_and_records_changes(self, reranker):
+        """Test that shadow mode returns the full rerank and counts the skips that would change it"""
+        jobs = self.scored_jobs([0.9, 0.4, 0.35, 0.3])
+        mock_store = Mock(spec=MemoryStore)
+        mock_store.similarity_search.return_value = jobs
+        policy = RerankSkipPolicy(shadow=True)
+        service = VectorStoreService(vector_store=mock_store, reranker=reranker, rerank_policy=policy)
+
+        results = service.similarity_search("python developer", top_k=2)
+
+        assert [job.job_id for job in results] == [jobs[3].job_id, jobs[2].job_id]
+        assert len(reranker.rerank.call_args[0][1]) == 4
+        stats = policy.stats()
+        assert stats["decisions"]["skip"] == 1
+        assert (stats["shadow_searches"], stats["shadow_changes"]) == (1, 1)
+
+    def test_shadow_mode_compares_shrunk_order(self, reranker):
+        """Test that a shrink which keeps the reranked top results is recorded as unchanged"""
+        jobs = self.scored_jobs([0.8, 0.72, 0.7, 0.69, 0.68, 0.67])
+        # the reranker prefers the first-stage order, so the shrunk candidates hold the top results
+        reranker.rerank.side_effect = lambda query, documents, top_n, max_document_chars=None: [
+            (position, -float(position)) for position in range(len(documents))
+        ][:top_n]
+        mock_store = Mock(spec=MemoryStore)
+        mock_store.similarity_search.return_value = jobs
+        policy = RerankSkipPolicy(shadow=True, shrink_ratio=0.5)
+        service = VectorStoreService(vector_store=mock_store, reranker=reranker, rerank_policy=policy)
+
+        results = service.similarity_search("python developer", top_k=2)
+
+        assert [job.job_id for job in results] == [jobs[0].job_id, jobs[1].job_id]
+        assert policy.stats()["decisions"]["shrink"] == 1
+        assert (policy.stats()["shadow_searches"], policy.stats()["shadow_changes"]) == (1, 0)
@@ -119,3 +119,16 @@ class TestVectorTransformerService:
         assert isinstance(metadata, dict)
         assert metadata["job_id"] == job_details.job_id
         assert metadata["job_title"] == job_details.title
+
+    @pytest.mark.asyncio
+    async def test_transform_stream(self, transformer):
+        """Test that the streaming transform matches the list transform"""
+        job_details = JobDetailsFactory.batch(3)
+
+        async def jobs():
+            for job_detail in job_details:
+                yield job_detail
+
+        result = [job async for job in transformer.transform_stream(jobs())]
+
+        assert result == transformer.transform(job_details)